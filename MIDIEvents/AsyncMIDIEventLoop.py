@@ -0,0 +1,134 @@
+import asyncio
+import inspect
+import logging
+
+import MIDIEvents
+from MIDIEvents import MIDIEventLoop
+from MIDIEvents.Instrumentation import TimedHandler
+from MIDIEvents.MIDIEventLoop import InlineHandler
+
+logger = logging.getLogger("MIDIEvents")
+
+_STOP = object()  # Put in the queue to end run()
+
+
+class AsyncMIDIEventLoop(MIDIEventLoop):
+    """
+    :py:class:`MIDIEventLoop` for asyncio.  Messages are put in an ``asyncio.Queue`` and matched on the event loop.
+    ``async def`` handlers are scheduled as tasks, other handlers still go to :py:attr:`executor`.
+    """
+
+    def __init__(self, port="default", check_chords=True, check_sequences=True, check_chord_progressions=True, executor=None,
+                 max_concurrent_handlers=None, poll_interval=0.001, instrument=False, batch=False, batch_window=0.002,
+                 chord_window=None, inline_budget=0.0005, history=4096, unified=False):
+        super().__init__(port, check_chords, check_sequences, check_chord_progressions, executor, instrument=instrument,
+                         batch=batch, batch_window=batch_window, chord_window=chord_window, inline_budget=inline_budget,
+                         history=history, unified=unified)
+        if MIDIEvents.callbacks_supported():
+            self.port.callback = None  # Messages wait in the port until run() has an event loop to send them to
+        self.poll_interval = poll_interval
+        self.running_handler_tasks = set()
+        self._running = False
+        self._event_loop = None
+        self._queue = None
+        self._semaphore = None
+        self._max_concurrent_handlers = max_concurrent_handlers
+
+    def start(self, blocking=False):
+        """
+        Schedule :py:meth:`run` as a task on the running event loop, and return the task.  ``blocking`` is only there
+        to match :py:meth:`MIDIEventLoop.start`, since blocking would stop the event loop, so ``await`` :py:meth:`run`
+        instead.
+        """
+        if blocking:
+            raise ValueError("AsyncMIDIEventLoop can't block in start(), await run() instead")
+        return asyncio.get_running_loop().create_task(self.run())
+
+    def stop(self):
+        """Make :py:meth:`run` return.  Safe to call from any thread."""
+        if getattr(self, "_running", False):
+            self._event_loop.call_soon_threadsafe(self._queue.put_nowait, _STOP)
+
+    async def run(self):
+        """Receive and match messages until :py:meth:`stop` is called, then wait for any handlers still running"""
+        if self._running:
+            raise RuntimeError("AsyncMIDIEventLoop is already running")
+        self._event_loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        if self._max_concurrent_handlers is not None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent_handlers)
+        self._running = True
+        reader = None
+        if MIDIEvents.callbacks_supported():
+            self.port.callback = self._enqueue_threadsafe
+        else:
+            reader = self._event_loop.create_task(self._poll())
+        logger.info("AsyncMIDIEventLoop started")
+        try:
+            while True:
+                msg = await self._queue.get()
+                if msg is _STOP:
+                    break
+                if not self.batch:
+                    self._callback(msg)
+                    continue
+                if self.batch_window:
+                    await asyncio.sleep(self.batch_window)
+                msgs = [msg]
+                while not self._queue.empty():
+                    msg = self._queue.get_nowait()
+                    if msg is _STOP:
+                        break
+                    msgs.append(msg)
+                self._callback_batch(msgs)
+                if msg is _STOP:
+                    break
+        finally:
+            self._running = False
+            if reader is not None:
+                reader.cancel()
+            elif MIDIEvents.callbacks_supported():
+                self.port.callback = None
+            if self.running_handler_tasks:
+                await asyncio.gather(*self.running_handler_tasks, return_exceptions=True)
+            logger.info("AsyncMIDIEventLoop stopped")
+
+    def _enqueue_threadsafe(self, msg):
+        self._event_loop.call_soon_threadsafe(self._queue.put_nowait, msg)
+
+    async def _poll(self):
+        """For backends without callbacks, move pending messages into the queue without blocking the event loop"""
+        while True:
+            received = False
+            for msg in self.port.iter_pending():
+                self._queue.put_nowait(msg)
+                received = True
+            await asyncio.sleep(0 if received else self.poll_interval)
+
+    def _start_timer(self, delay, func):
+        """Chord windows close on the event loop, not on a timer thread"""
+        def fire():
+            func(handle)
+        handle = self._event_loop.call_later(delay, fire)
+        return handle
+
+    def _execute_handler(self, func):
+        target = func
+        while isinstance(target, (TimedHandler, InlineHandler)):
+            target = target.func
+        if inspect.iscoroutinefunction(target):
+            task = self._event_loop.create_task(self._run_coroutine_handler(func))
+            self.running_handler_tasks.add(task)
+            task.add_done_callback(self.running_handler_tasks.discard)
+        else:
+            super()._execute_handler(func)
+
+    async def _run_coroutine_handler(self, func):
+        try:
+            if self._semaphore is None:
+                await func()
+            else:
+                async with self._semaphore:
+                    await func()
+        except Exception:
+            logger.exception(f"Handler {func} raised an exception")
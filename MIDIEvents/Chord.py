@@ -1,49 +1,163 @@
-import collections
-import json
+import functools
 import logging
-import os
 
 from MIDIEvents import Note, NoteList
+from MIDIEvents.ChordVocabulary import ChordVocabulary, _VocabularyAttribute
 
 logger = logging.getLogger("MIDIEvents")
 
 
 class Chord(NoteList):
-    with open(os.path.join(os.path.split(__file__)[0], "chords.json"), "r") as f:
-        chords = json.load(f)["chords"]
+    chords = _VocabularyAttribute("chords")  # Loaded from chords.json on first use
 
     def __init__(self, *args):
         super().__init__(args)
 
     def __eq__(self, other):
-        if isinstance(other, self.__class__) or issubclass(self.__class__, other.__class__):
-            if len(self.notes) != len(other.notes):
-                return False
-            return collections.Counter(self.notes) == collections.Counter(other.notes)
+        if isinstance(other, Chord):
+            return self._key == other._key
+        if issubclass(self.__class__, other.__class__):
+            return self.notes == other.notes
         return False
 
     __hash__ = NoteList.__hash__
 
-    def identify(self):
+    @property
+    def notes(self):
+        if self._notes is None:  # Only built from the mask when somebody asks for them
+            self._notes = self._notes_from_mask(self._mask, self._multiplicity)
+        return self._notes
+
+    @notes.setter
+    def notes(self, notes):
+        self._check_not_frozen()
+        notes = tuple(sorted(notes))
+        mask, multiplicity = self._mask_from_midi_list(note.midi for note in notes)
+        self._set_mask(mask, multiplicity, notes)
+
+    @property
+    def mask(self):
+        """Integer with bit n set for each MIDI note n in the chord"""
+        return self._mask
+
+    @property
+    def multiplicity(self):
+        """Dictionary of MIDI note to count, only for notes that appear more than once"""
+        return dict(self._multiplicity)
+
+    @property
+    def pitch_class_set(self):
+        """12 bit integer with bit n set when pitch class n is in the chord, in any octave"""
+        mask = self._mask
+        pitch_class_set = 0
+        while mask:
+            pitch_class_set |= mask & 0xFFF
+            mask >>= 12
+        return pitch_class_set
+
+    def issubset(self, other):
+        if self._mask & ~other._mask:
+            return False
+        if self._multiplicity:
+            other_counts = dict(other._multiplicity)
+            return all(other_counts.get(midi, 1) >= count for midi, count in self._multiplicity)
+        return True
+
+    def identify(self, invariant=False):
         if len(self.notes) == 0:
             return
+        if invariant:
+            return [Note.pitch_class_map[root] + " " + name for root, name in self._get_pitch_class_table()[self.pitch_class_set]]
         base = str(self.notes[0])
-        my_semitones = self._get_semitones()
-        out = []
-        for chord in self.chords:
-            for chord_semitones in chord["semitones"]:
-                if my_semitones == chord_semitones:
-                    out.append(base + " " + chord["name"])
+        out = [base + " " + name for name in self._get_interval_index().get(self._get_intervals(), ())]
         logger.debug("identify found {} chords".format(len(out)))
         return out
 
+    @classmethod
+    def identify_many(cls, chords, invariant=False):
+        """Like identify, but for an iterable of Chords.  Repeated chords are only looked up once."""
+        seen = {}
+        out = []
+        for chord in chords:
+            key = chord._key
+            if key not in seen:
+                seen[key] = chord.identify(invariant)
+            result = seen[key]
+            out.append(result if result is None else list(result))
+        return out
+
     def _get_semitones(self):
-        semitones = []
-        for note in self.notes:
-            semitones.append(note.midi - self.notes[0].midi)
-        return semitones
+        return list(self._get_intervals())
+
+    def _get_intervals(self):
+        base = self.notes[0].midi
+        return tuple(note.midi - base for note in self.notes)
 
     @classmethod
+    def _get_interval_index(cls):
+        """Dictionary of semitone tuples to the names of every chord with those semitones, in chords.json order"""
+        return ChordVocabulary.load().interval_index
+
+    @classmethod
+    def _get_pitch_class_table(cls):
+        """
+        List of 4096 tuples, indexed by pitch class set.  Each tuple holds (root pitch class, chord name) for every
+        transposition of every chord in chords.json with exactly that set of pitch classes.
+        """
+        return ChordVocabulary.load().pitch_class_table
+
+    def _set_mask(self, mask, multiplicity, notes=None):
+        self._mask = mask
+        self._multiplicity = multiplicity
+        self._notes = notes
+        self._key = (mask, multiplicity) if multiplicity else mask
+        self._hash = hash(self._key)
+
+    _pitch_class_set_from_semitones = staticmethod(ChordVocabulary.pitch_class_set_from_semitones)
+
+    @staticmethod
+    def _mask_from_midi_list(midi_list):
+        mask = 0
+        multiplicity = {}
+        for midi in midi_list:
+            if midi < 0:
+                raise ValueError("Chords only support MIDI notes of 0 or higher")
+            bit = 1 << midi
+            if mask & bit:  # Doubled note
+                multiplicity[midi] = multiplicity.get(midi, 1) + 1
+            mask |= bit
+        return mask, tuple(sorted(multiplicity.items()))
+
+    @staticmethod
+    def _notes_from_mask(mask, multiplicity=()):
+        counts = dict(multiplicity)
+        notes = []
+        while mask:
+            low_bit = mask & -mask
+            midi = low_bit.bit_length() - 1
+            notes.extend([Note(midi)] * counts.get(midi, 1))
+            mask ^= low_bit
+        return tuple(notes)
+
+    @classmethod
+    def from_mask(cls, mask, multiplicity=None):
+        if mask < 0:
+            raise ValueError("Chord masks can't be negative")
+        if multiplicity:
+            multiplicity = dict(multiplicity)
+            if any(not mask >> midi & 1 for midi in multiplicity):
+                raise ValueError("Multiplicity has notes that aren't in the mask")
+            multiplicity = tuple(sorted(item for item in multiplicity.items() if item[1] > 1))  # Same key as no entry
+        chord = cls.__new__(cls)
+        chord._set_mask(mask, multiplicity or ())
+        return chord
+
+    @classmethod
+    def from_midi_list(cls, midi_list):
+        return cls.from_mask(*cls._mask_from_midi_list(midi_list))
+
+    @classmethod
+    @functools.lru_cache(maxsize=4096)
     def from_ident(cls, ident_chord_name):
         base_note, *chord_name = ident_chord_name.split(" ")
         assert chord_name, "No chord name detected, make sure there's a space in ident_chord_name."
@@ -58,7 +172,7 @@ class Chord(NoteList):
 
     @classmethod
     def _get_semitones_from_chord_name(cls, chord_name):
-        for chord in cls.chords:
-            if chord_name == chord["name"]:
-                return chord["semitones"][0]
-        raise ValueError("Chord not found, see https://en.wikipedia.org/wiki/List_of_chords")
+        semitones = ChordVocabulary.load().semitones_by_name.get(chord_name)
+        if semitones is None:
+            raise ValueError("Chord not found, see https://en.wikipedia.org/wiki/List_of_chords")
+        return semitones
@@ -9,7 +9,7 @@ class ChordProgression:
 
     def check_deque(self, d: deque):
         """
-        It's important to note that every note processed created a new chord.  So the recent_chords deque that this gets
+        It's important to note that every note processed created a new chord.  So a deque of recent chords that this gets
         compared with will have something similar to  [(C4), (C4, E4), (C4, E4, G4)] when a C4 Major chord is played.
         There's 1 Chord object for each note, culminating in a C4 Major chord.  For that reason, the comparison uses
         an ordered non sequential search method.
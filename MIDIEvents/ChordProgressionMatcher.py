@@ -0,0 +1,114 @@
+import logging
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class _Node:
+    __slots__ = ("parent", "chord_key", "children", "keys", "last_match")
+
+    def __init__(self, parent, chord_key):
+        self.parent = parent
+        self.chord_key = chord_key
+        self.children = dict()  # Chord key to _Node
+        self.keys = list()  # Keys of the progressions ending at this node
+        self.last_match = 0  # Position of the last chord that completed a progression here
+
+
+class ChordProgressionMatcher:
+    """
+    Trie of chord progressions with a set of active partial matches.  Chords in a progression have to be played in order,
+    but anything can be played between them, as long as the whole progression fits in the last ``maxlen`` chords.
+    Every chord only advances the partial matches that are currently active, so the cost doesn't grow with the number of
+    progressions.
+
+    Chords are identified by their ``_key``, which for held notes is the mask from :py:attr:`MIDIEventLoop.down_mask`.
+    PitchClassChords are identified by ``("pitch_class", pitch_class_set)``, see :py:meth:`chord_key`.
+    """
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self.root = _Node(None, None)
+        self.position = 0  # Number of chords seen
+        self.active = dict()  # _Node to the position of the most recent first chord that reaches it
+        self._nodes_by_key = dict()
+        self._pitch_classes = False  # Whether any progression has a PitchClassChord, which costs a second lookup
+
+    def __len__(self):
+        return len(self._nodes_by_key)
+
+    def __contains__(self, key):
+        return key in self._nodes_by_key
+
+    @staticmethod
+    def chord_key(chord):
+        """The key :py:meth:`add` takes for a :py:class:`Chord` or :py:class:`PitchClassChord`"""
+        if hasattr(chord, "_key"):
+            return chord._key
+        if hasattr(chord, "pitch_class_set"):
+            return ("pitch_class", chord.pitch_class_set)
+        raise TypeError(f"Expected a Chord or PitchClassChord in a ChordProgression, not {chord!r}")
+
+    def add(self, key, chord_keys):
+        chord_keys = tuple(chord_keys)
+        if key in self._nodes_by_key:
+            raise KeyError(f"{key} has already been added")
+        if not chord_keys:  # Never completed by any chord
+            return
+        node = self.root
+        for chord_key in chord_keys:
+            if type(chord_key) is tuple and chord_key[0] == "pitch_class":
+                self._pitch_classes = True
+            child = node.children.get(chord_key)
+            if child is None:
+                child = node.children[chord_key] = _Node(node, chord_key)
+            node = child
+        node.keys.append(key)
+        self._nodes_by_key[key] = node
+
+    def remove(self, key):
+        node = self._nodes_by_key.pop(key, None)
+        if node is None:
+            return
+        node.keys.remove(key)
+        while node is not self.root and not node.keys and not node.children:  # Prune branches nothing ends on
+            del node.parent.children[node.chord_key]
+            self.active.pop(node, None)
+            node = node.parent
+
+    def clear(self):
+        self.root = _Node(None, None)
+        self.active = dict()
+        self._nodes_by_key = dict()
+        self._pitch_classes = False
+
+    def advance(self, chord_key, pitch_class_set=None):
+        """
+        Add the next chord and return a tuple of the keys of every progression it completes.  With the
+        ``pitch_class_set`` of the chord, progressions with PitchClassChords can match it too.
+        """
+        self.position += 1
+        position = self.position
+        oldest = position - self.maxlen  # Partial matches that started this long ago can't fit any more
+        active = {node: start for node, start in self.active.items() if start > oldest}
+        chord_keys = (chord_key,)
+        if self._pitch_classes and pitch_class_set is not None:
+            chord_keys += (("pitch_class", pitch_class_set),)
+        reached = []
+        for chord_key in chord_keys:
+            child = self.root.children.get(chord_key)
+            if child is not None:
+                reached.append((child, position))
+            for node, start in self.active.items():
+                if start > oldest:
+                    child = node.children.get(chord_key)
+                    if child is not None:
+                        reached.append((child, start))
+        completed = ()
+        for child, start in reached:
+            if child.children and active.get(child, oldest) < start:  # Leaves can't go any further
+                active[child] = start
+            if child.keys and start > child.last_match:  # Completions can't share chords with the previous one
+                child.last_match = position
+                completed += tuple(child.keys)
+        self.active = active
+        return completed
@@ -0,0 +1,107 @@
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+
+from MIDIEvents.__version__ import __version__
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class ChordVocabulary:
+    """
+    The chords from chords.json along with the indexes built from them.  Loaded on first use with :py:meth:`load`, which
+    reuses a pickled copy from a previous run when chords.json hasn't changed.
+    """
+    source_path = os.path.join(os.path.split(__file__)[0], "chords.json")
+    # Keyed by Python version too, since older Pythons can't read newer pickle protocols
+    cache_path = os.path.join(os.path.split(__file__)[0], "__pycache__",
+                              f"chords.{__version__}.py{sys.version_info[0]}{sys.version_info[1]}.pickle")
+    cache_format = 1  # Bump when the pickled attributes change
+    _loaded = None
+    _lock = threading.Lock()
+
+    def __init__(self, chords):
+        self.chords = chords
+        self.semitones_by_name = {}
+        self.interval_index = {}
+        table = [[] for _ in range(4096)]
+        for chord in chords:
+            self.semitones_by_name.setdefault(chord["name"], chord["semitones"][0])
+            for semitones in chord["semitones"]:
+                self.interval_index.setdefault(tuple(semitones), []).append(chord["name"])
+                for root in range(12):
+                    entry = (root, chord["name"])
+                    pitch_class_set = self.pitch_class_set_from_semitones(semitones, root)
+                    if entry not in table[pitch_class_set]:
+                        table[pitch_class_set].append(entry)
+        self.pitch_class_table = [tuple(entries) for entries in table]
+
+    @staticmethod
+    def pitch_class_set_from_semitones(semitones, root=0):
+        pitch_class_set = 0
+        for semitone in semitones:
+            pitch_class_set |= 1 << ((root + semitone) % 12)
+        return pitch_class_set
+
+    @classmethod
+    def load(cls):
+        if cls._loaded is None:
+            with cls._lock:
+                if cls._loaded is None:
+                    ChordVocabulary._loaded = cls._load_cache() or cls._load_source()
+        return cls._loaded
+
+    @classmethod
+    def clear(cls):
+        """Forget the loaded vocabulary, the next call to load will read it again"""
+        ChordVocabulary._loaded = None
+
+    @classmethod
+    def _source_stamp(cls):
+        stat = os.stat(cls.source_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    @classmethod
+    def _load_cache(cls):
+        try:
+            with open(cls.cache_path, "rb") as f:
+                cached = pickle.load(f)
+        except Exception:  # Unreadable for any reason, e.g. a protocol or module this Python doesn't have, is stale
+            logger.debug(f"Couldn't read chord vocabulary cache {cls.cache_path}", exc_info=True)
+            return None
+        if not isinstance(cached, dict) or cached.get("format") != cls.cache_format or cached.get("source") != cls._source_stamp():
+            logger.debug("Chord vocabulary cache is stale")
+            return None
+        vocabulary = cls.__new__(cls)
+        vocabulary.__dict__.update(cached["vocabulary"])
+        logger.debug(f"Loaded chord vocabulary from {cls.cache_path}")
+        return vocabulary
+
+    @classmethod
+    def _load_source(cls):
+        with open(cls.source_path, "r") as f:
+            vocabulary = cls(json.load(f)["chords"])
+        logger.debug(f"Loaded chord vocabulary from {cls.source_path}")
+        cached = {"format": cls.cache_format, "source": cls._source_stamp(), "vocabulary": vocabulary.__dict__}
+        tmp_path = f"{cls.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cls.cache_path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cls.cache_path)
+        except OSError:  # Read only install, just skip the cache
+            logger.debug(f"Couldn't write chord vocabulary cache to {cls.cache_path}")
+        return vocabulary
+
+
+class _VocabularyAttribute:
+    """Class attribute that reads ``name`` from the loaded :py:class:`ChordVocabulary` on first access"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, owner):
+        return getattr(ChordVocabulary.load(), self.name)
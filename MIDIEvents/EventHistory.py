@@ -0,0 +1,103 @@
+from array import array
+from bisect import bisect_left
+from collections import namedtuple
+
+Event = namedtuple("Event", ["time", "note", "velocity", "channel", "held_mask"])
+
+
+class HistoryWindow(namedtuple("HistoryWindow", ["time", "note", "velocity", "channel", "held_low", "held_high"])):
+    """
+    The latest events of an :py:class:`EventHistory` as one ``memoryview`` per field, oldest first.  The views share
+    memory with the history, so they're only good until it records over them.  ``tolist()`` one to keep it.
+    """
+    __slots__ = ()
+
+    @property
+    def size(self):
+        return len(self.time)
+
+    def held_mask(self, i):
+        """Mask of the notes held after event ``i``, the same as :py:attr:`MIDIEventLoop.down_mask` was then"""
+        return self.held_low[i] | self.held_high[i] << 64
+
+
+class EventHistory:
+    """
+    The last ``capacity`` note events, kept in preallocated ``array``\\ s of 27 bytes per event.  Events are appended
+    to arrays twice as long as ``capacity``, and once they're full the latest ``capacity`` events are moved back to the
+    start in one go, so the latest events are always one contiguous slice and :py:meth:`window` never copies.
+    """
+    typecodes = (("time", "d"), ("note", "B"), ("velocity", "B"), ("channel", "B"), ("held_low", "Q"),
+                 ("held_high", "Q"))
+
+    def __init__(self, capacity=4096):
+        if capacity < 1:
+            raise ValueError("capacity has to be at least 1")
+        self.capacity = capacity
+        self.total = 0  # Events ever recorded
+        self._end = 0  # Slot the next event goes in
+        self._arrays = tuple(array(typecode, bytes(2 * capacity * array(typecode).itemsize))
+                             for _, typecode in self.typecodes)
+        self._views = [memoryview(a) for a in self._arrays]
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def __iter__(self):
+        return iter(self.events())
+
+    def record(self, time, note, velocity, channel, held_mask):
+        i = self._end
+        if i == 2 * self.capacity:
+            self._compact()
+            i = self.capacity
+        times, notes, velocities, channels, held_low, held_high = self._arrays
+        times[i] = time
+        notes[i] = note
+        velocities[i] = velocity
+        channels[i] = channel
+        held_low[i] = held_mask & 0xFFFFFFFFFFFFFFFF
+        held_high[i] = held_mask >> 64
+        self._end = i + 1
+        self.total += 1
+
+    def _compact(self):
+        """Move the latest ``capacity`` events to the start, making room for as many again after them"""
+        capacity = self.capacity
+        for a in self._arrays:
+            a[:capacity] = a[capacity:]
+
+    def window(self, last=None, since=None):
+        """
+        :py:class:`HistoryWindow` of the latest ``last`` events, or every one kept, narrowed to those at or after time
+        ``since``
+        """
+        n = len(self)
+        if last is not None:
+            n = min(max(last, 0), n)
+        end = self._end
+        start = end - n
+        if since is not None:
+            start += bisect_left(self._views[0][start:end], since)
+        return HistoryWindow(*(view[start:end] for view in self._views))
+
+    def events(self, last=None, since=None):
+        """:py:meth:`window` copied into a list of ``Event`` tuples, for dumping"""
+        window = self.window(last, since)
+        return [Event(*fields[:4], window.held_mask(i)) for i, fields in enumerate(zip(*window))]
+
+    def key_downs(self, last):
+        """The notes of up to the latest ``last`` key downs, oldest first"""
+        window = self.window()
+        notes = []
+        for i in range(window.size - 1, -1, -1):
+            if len(notes) == last:
+                break
+            if window.velocity[i]:
+                notes.append(window.note[i])
+        notes.reverse()
+        return notes
+
+    def clear(self):
+        self.total = 0
+        self._end = 0
@@ -0,0 +1,26 @@
+import logging
+
+from MIDIEvents import Sequence
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class FuzzySequence(Sequence):
+    """A :py:class:`Sequence` that still matches with up to ``max_errors`` wrong, extra or missing notes"""
+
+    def __init__(self, *args, max_errors=1):
+        super().__init__(*args)
+        if not 0 <= max_errors < len(self.notes):  # With as many errors as notes, anything would match
+            raise ValueError(f"max_errors has to be at least 0 and less than the {len(self.notes)} notes")
+        self.max_errors = max_errors
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({', '.join(str(x) for x in self.notes)}, max_errors={self.max_errors})"
+
+    def __eq__(self, other):
+        if not isinstance(other, FuzzySequence):
+            return False
+        return self.notes == other.notes and self.max_errors == other.max_errors
+
+    def __hash__(self):
+        return hash((self._hash, self.max_errors))
@@ -0,0 +1,144 @@
+import logging
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class FuzzySequenceMatcher:
+    """
+    Wu-Manber bit-parallel approximate matching over MIDI note numbers, for every pattern at once.  Each pattern of
+    ``m`` notes gets a field of ``m + 1`` bits in one ``int`` per number of errors ``d``, with bit ``i`` set while the
+    first ``i`` notes of the pattern match the end of what was played with ``d`` substitutions, insertions or deletions
+    at most.  A note updates every field of a row with a handful of ``int`` operations.  Those ``int`` are as wide as
+    all the patterns together, so the cost per note still grows with the number of notes registered, but a machine
+    word of bits at a time instead of a step per pattern.
+
+    A pattern matches when the latest note is its last one, or stands in for it or follows it as an error.  The
+    notes at the end of a pattern can't be missing, or it would match before they were played.  A pattern is reported
+    once, when it starts matching, and not again until it has stopped.
+    """
+
+    def __init__(self):
+        self._patterns = dict()  # Key to (notes, max_errors, offset of its field), in the order they were added
+        self._build()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def __contains__(self, key):
+        return key in self._patterns
+
+    def add(self, key, notes, max_errors, recent_notes=()):
+        """
+        Add a pattern.  ``key`` is returned by :py:meth:`advance` when ``notes`` has just been played with at most
+        ``max_errors`` errors.  Passing the recently played notes keeps the current state correct.
+        """
+        notes = tuple(notes)
+        if key in self._patterns:
+            raise KeyError(f"{key} has already been added")
+        if not 0 <= max_errors < len(notes):
+            raise ValueError("max_errors has to be at least 0 and less than the number of notes")
+        # Match the new pattern alone to get the state of its field, then put that after every other field
+        alone = FuzzySequenceMatcher()
+        alone._patterns[key] = (notes, max_errors, 0)
+        alone._build(recent_notes)
+        offset = self._width
+        self._patterns[key] = (notes, max_errors, offset)
+        self._width += len(notes) + 1
+        self._full = (1 << self._width) - 1
+        self._starts |= alone._starts << offset
+        for note, bits in alone._note_masks.items():
+            self._note_masks[note] = self._note_masks.get(note, 0) | bits << offset
+        while len(self._rows) <= max_errors:  # The other fields never read the rows past their own max_errors
+            self._rows.append(self._rows[-1])
+            self._finals.append(0)
+        for d in range(len(self._rows)):
+            self._rows[d] |= alone._rows[min(d, max_errors)] << offset
+        final = 1 << (offset + len(notes))
+        self._finals[max_errors] |= final
+        self._keys_by_final[final] = key
+        self._matched |= alone._matched << offset
+
+    def remove(self, key, recent_notes=()):
+        pattern = self._patterns.pop(key, None)
+        if pattern is None:
+            return
+        notes, max_errors, offset = pattern
+        width = len(notes) + 1
+        self._unused += width
+        if self._unused * 2 > self._width:  # Mostly gaps, so lay out the fields again
+            self._build(recent_notes)
+            return
+        keep = ~(((1 << width) - 1) << offset)
+        self._starts &= keep
+        for note in set(notes):
+            bits = self._note_masks[note] & keep
+            if bits:
+                self._note_masks[note] = bits
+            else:
+                del self._note_masks[note]
+        for d in range(len(self._rows)):
+            self._rows[d] &= keep
+        self._finals[max_errors] &= keep
+        del self._keys_by_final[1 << (offset + len(notes))]
+        self._matched &= keep
+
+    def clear(self):
+        self._patterns.clear()
+        self._build()
+
+    def advance(self, note):
+        """Keys of the patterns that started matching on ``note``"""
+        match_mask = self._note_masks.get(note, 0)
+        starts = self._starts
+        full = self._full
+        rows = self._rows
+        old_prev = rows[0]  # Row d - 1 before this note
+        new_prev = rows[0] = ((old_prev << 1) & match_mask) | starts
+        matched = new_prev & self._finals[0]
+        for d in range(1, len(rows)):
+            old = rows[d]
+            # Note matches, insertion, substitution.  These use up the note, unlike a deletion.
+            played = ((old << 1) & match_mask) | old_prev | ((old_prev << 1) & full)
+            new = played | ((new_prev << 1) & full) | starts  # Deletion
+            rows[d] = new
+            matched |= played & self._finals[d]
+            old_prev = old
+            new_prev = new
+        started = matched & ~self._matched
+        self._matched = matched
+        if not started:
+            return ()
+        keys = []
+        while started:
+            low_bit = started & -started
+            keys.append(self._keys_by_final[low_bit])
+            started ^= low_bit
+        return tuple(keys)
+
+    def _build(self, recent_notes=()):
+        """Lay out the fields of every pattern, then replay ``recent_notes`` to get back to the current state"""
+        self._starts = 0  # Bit 0 of every field, the empty prefix always matches
+        self._note_masks = dict()  # MIDI note to the bits of the pattern notes it matches
+        self._keys_by_final = dict()  # Last bit of a field to its key
+        max_errors = max((errors for _, errors, _ in self._patterns.values()), default=0)
+        self._finals = [0] * (max_errors + 1)  # Per row, the last bit of the fields that match with that many errors
+        initial = [0] * (max_errors + 1)
+        offset = 0
+        for key, (notes, errors, _) in self._patterns.items():
+            self._patterns[key] = (notes, errors, offset)
+            self._starts |= 1 << offset
+            for i, note in enumerate(notes):
+                self._note_masks[note] = self._note_masks.get(note, 0) | 1 << (offset + i + 1)
+            final = 1 << (offset + len(notes))
+            self._finals[errors] |= final
+            self._keys_by_final[final] = key
+            for d in range(max_errors + 1):  # Up to d notes can be matched by deleting them
+                initial[d] |= ((1 << (min(d, len(notes)) + 1)) - 1) << offset
+            offset += len(notes) + 1
+        self._width = offset
+        self._unused = 0  # Bits of the fields removed since the last layout
+        self._full = (1 << offset) - 1
+        self._rows = initial
+        self._matched = 0
+        for note in recent_notes:
+            self.advance(note)
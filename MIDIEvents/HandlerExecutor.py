@@ -0,0 +1,126 @@
+import logging
+import queue
+import threading
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class HandlerExecutor:
+    """
+    Fixed size pool of daemon threads that run handlers from a bounded queue.  When the queue is full, ``overflow``
+    decides what happens to a new handler:
+
+    * ``"drop"`` throws the new handler away.  This is the default, so receiving MIDI is never held up.
+    * ``"block"`` waits for space, so no handler is lost but the thread receiving MIDI is held up.  A handler submitted
+      from one of the workers, e.g. by sending to a port with a callback, is dropped instead, since waiting there could
+      deadlock when every worker does the same.
+    * ``"coalesce"`` never queues a handler that's already waiting to run, and drops the new handler if the queue is full.
+    """
+    overflow_policies = ("drop", "block", "coalesce")
+
+    def __init__(self, max_workers=4, max_queue=64, overflow="drop"):
+        if max_workers < 1:
+            raise ValueError("max_workers has to be at least 1")
+        if overflow not in self.overflow_policies:
+            raise ValueError(f"overflow has to be one of {self.overflow_policies}")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.threads = list()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._pending = set()  # Handlers waiting in the queue, for "coalesce"
+        self._shutdown = False
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.coalesced = 0
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        return {
+            "workers": len(self.threads),
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+        }
+
+    def submit(self, func):
+        """Queue ``func`` to be called with no arguments.  Returns ``False`` if it was dropped or coalesced."""
+        if self._shutdown:
+            raise RuntimeError("Can't submit handlers after shutdown")
+        if len(self.threads) < self.max_workers:
+            self._start_workers()
+        with self._lock:
+            self.submitted += 1
+            if self.overflow == "coalesce":
+                if func in self._pending:
+                    self.coalesced += 1
+                    return False
+                self._pending.add(func)
+        # Only block threads that aren't workers, or a full queue could never drain
+        block = self.overflow == "block" and threading.current_thread() not in self.threads
+        try:
+            self._queue.put(func, block=block)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+                self._pending.discard(func)
+            logger.warning(f"Handler queue is full, dropped {func}")
+            return False
+        return True
+
+    def shutdown(self, wait=True):
+        """
+        Stop the workers once they've run everything already queued.  Without ``wait`` it never blocks, and if the
+        queue is full the workers stop when they find it empty instead.
+        """
+        self._shutdown = True
+        for thread in self.threads:
+            try:
+                self._queue.put(None, block=wait)
+            except queue.Full:
+                break
+        if wait:
+            for thread in self.threads:
+                if thread is not threading.current_thread():
+                    thread.join()
+
+    def _start_workers(self):
+        with self._lock:
+            while len(self.threads) < self.max_workers:
+                t = threading.Thread(target=self._work, name=f"MIDIEvents handler {len(self.threads)}")
+                t.daemon = True
+                t.start()
+                self.threads.append(t)
+
+    def _work(self):
+        while True:
+            if self._shutdown:  # The None might not have fit in the queue
+                try:
+                    func = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+            else:
+                func = self._queue.get()
+            if func is None:  # Shutdown
+                return
+            if self.overflow == "coalesce":
+                with self._lock:
+                    self._pending.discard(func)
+            try:
+                func()
+            except Exception:
+                with self._lock:
+                    self.failed += 1
+                logger.exception(f"Handler {func} raised an exception")
+            else:
+                with self._lock:
+                    self.completed += 1
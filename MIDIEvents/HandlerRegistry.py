@@ -0,0 +1,109 @@
+from types import MappingProxyType
+
+from MIDIEvents import Chord, PitchClassChord, Sequence, ChordProgression, Pattern
+
+
+class HandlerRegistry:
+    """
+    Immutable snapshot of the handlers of a :py:class:`MIDIEventLoop`, with one read only mapping of keys to a tuple of
+    handlers per type of key.  Changing it returns a new snapshot that shares the mappings of the types it didn't touch,
+    so the loop can swap it in with one assignment while the thread receiving MIDI keeps reading the old one.
+    """
+    __slots__ = ("chords", "pitch_class_chords", "sequences", "chord_progressions", "patterns",
+                 "chords_by_mask", "pitch_class_chords_by_set", "_dicts")
+    kinds = ((Chord, "chords"), (PitchClassChord, "pitch_class_chords"), (Sequence, "sequences"),
+             (ChordProgression, "chord_progressions"), (Pattern, "patterns"))
+    # Lookups from the held notes to the key that could match them
+    indexes = (("chords", "chords_by_mask", lambda chord: chord._key),
+               ("pitch_class_chords", "pitch_class_chords_by_set", lambda chord: chord.pitch_class_set))
+
+    def __init__(self, _dicts=None):
+        if _dicts is None:
+            _dicts = {name: dict() for _, name in self.kinds}
+            _dicts.update((index, dict()) for _, index, _ in self.indexes)
+        object.__setattr__(self, "_dicts", _dicts)  # The dicts behind the mappings, copied with their hashes
+        for name, value in _dicts.items():
+            object.__setattr__(self, name, MappingProxyType(value))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("HandlerRegistry is immutable")
+
+    def __len__(self):
+        return (len(self.chords) + len(self.pitch_class_chords) + len(self.sequences) + len(self.chord_progressions) +
+                len(self.patterns))
+
+    def __contains__(self, notes_obj):
+        kind = self._kind(notes_obj)
+        return kind is not None and notes_obj in self._dicts[kind]
+
+    def __getitem__(self, notes_obj):
+        kind = self._kind(notes_obj)
+        if kind is None:
+            raise KeyError(notes_obj)
+        return self._dicts[kind][notes_obj]
+
+    def merged(self):
+        """Every key and its handlers in one ``dict``"""
+        merged = dict()
+        for _, kind in self.kinds:
+            merged.update(self._dicts[kind])
+        return merged
+
+    def with_handler(self, notes_obj, func):
+        kind = self._kind(notes_obj)
+        handlers = self._dicts[kind].copy()
+        funcs = handlers.get(notes_obj)
+        handlers[notes_obj] = (func,) if funcs is None else funcs + (func,)
+        changed = {kind: handlers}
+        if funcs is None:
+            changed.update(self._index_change(kind, notes_obj, True))
+        return self._replace(changed)
+
+    def without(self, notes_obj):
+        """Raises ``KeyError`` if ``notes_obj`` has no handlers"""
+        kind = self._kind(notes_obj)
+        handlers = self._dicts[kind].copy()
+        del handlers[notes_obj]
+        changed = {kind: handlers}
+        changed.update(self._index_change(kind, notes_obj, False))
+        return self._replace(changed)
+
+    def without_type(self, cls):
+        """Drop every key that's an instance of ``cls``"""
+        changed = dict()
+        for _, kind in self.kinds:
+            handlers = self._dicts[kind]
+            kept = {key: funcs for key, funcs in handlers.items() if not isinstance(key, cls)}
+            if len(kept) != len(handlers):
+                changed[kind] = kept
+        for kind, index, key_of in self.indexes:
+            if kind in changed:
+                changed[index] = {key_of(notes_obj): notes_obj for notes_obj in changed[kind]}
+        if not changed:
+            return self
+        return self._replace(changed)
+
+    def _index_change(self, kind, notes_obj, add):
+        """Copy of the index of ``kind`` with one key added or removed"""
+        for index_kind, index, key_of in self.indexes:
+            if index_kind == kind:
+                keys = self._dicts[index].copy()
+                if add:
+                    keys[key_of(notes_obj)] = notes_obj
+                else:
+                    del keys[key_of(notes_obj)]
+                return {index: keys}
+        return {}
+
+    def _replace(self, changed):
+        """New snapshot with the dicts in ``changed``, sharing the rest"""
+        dicts = self._dicts.copy()
+        dicts.update(changed)
+        return HandlerRegistry(dicts)
+
+    @classmethod
+    def _kind(cls, notes_obj):
+        for type_, kind in cls.kinds:
+            if isinstance(notes_obj, type_):
+                return kind
+        return None
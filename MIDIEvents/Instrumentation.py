@@ -0,0 +1,58 @@
+import time
+
+from MIDIEvents.LatencyHistogram import LatencyHistogram
+
+
+class Instrumentation:
+    """
+    One :py:class:`LatencyHistogram` per stage of handling a MIDI message in :py:class:`MIDIEventLoop`.  Every stage is
+    a duration in ns measured with ``time.perf_counter_ns()``, starting from when the message reached ``_callback``.
+    """
+    stages = (
+        "state",  # Updating the held notes
+        "progressions",  # Advancing the ChordProgression matcher
+        "sequences",  # Advancing the Sequence automaton
+        "chords",  # Looking up Chords and PitchClassChords
+        "dispatch",  # Handing matched handlers to the executor
+        "handler_start",  # From receiving the message to a handler starting to run
+        "total",  # From receiving the message to _callback returning
+    )
+
+    def __init__(self, significant_bits=7):
+        self.histograms = {stage: LatencyHistogram(significant_bits) for stage in self.stages}
+
+    def record(self, stage, value):
+        self.histograms[stage].record(value)
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def stats(self):
+        """``dict`` of each stage mapped to :py:meth:`LatencyHistogram.summary`"""
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+
+class TimedHandler:
+    """Handler wrapper that records ``handler_start`` when it's called.  Equal to the handler it wraps, for coalescing."""
+    __slots__ = ("func", "received", "instrumentation")
+
+    def __init__(self, func, received, instrumentation):
+        self.func = func
+        self.received = received
+        self.instrumentation = instrumentation
+
+    def __call__(self):
+        self.instrumentation.record("handler_start", time.perf_counter_ns() - self.received)
+        return self.func()
+
+    def __eq__(self, other):
+        if isinstance(other, TimedHandler):
+            return self.func == other.func
+        return self.func == other
+
+    def __hash__(self):
+        return hash(self.func)
+
+    def __repr__(self):
+        return repr(self.func)
@@ -0,0 +1,45 @@
+import logging
+
+from MIDIEvents import Note, Sequence
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class IntervalSequence(Sequence):
+    """
+    A :py:class:`Sequence` matched by the intervals between its notes, so it matches in any key.  With
+    ``pitch_class=True`` the intervals are taken mod 12, so any note can also be played in another octave.
+    """
+
+    def __init__(self, *args, pitch_class=False):
+        super().__init__(*args)
+        if len(self.notes) < 2:
+            raise ValueError("IntervalSequences need at least 2 notes")
+        self.pitch_class = pitch_class
+        midi = self.midi
+        intervals = tuple(b - a for a, b in zip(midi, midi[1:]))
+        self._intervals = tuple(interval % 12 for interval in intervals) if pitch_class else intervals
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({', '.join(str(x) for x in self.notes)}, pitch_class={self.pitch_class})"
+
+    def __eq__(self, other):
+        if not isinstance(other, IntervalSequence):
+            return False
+        return self._intervals == other._intervals and self.pitch_class == other.pitch_class
+
+    def __hash__(self):
+        return hash((self._intervals, self.pitch_class))
+
+    @property
+    def intervals(self):
+        """Tuple of semitones from each note to the next, mod 12 with ``pitch_class``"""
+        return self._intervals
+
+    @classmethod
+    def from_intervals(cls, intervals, pitch_class=False):
+        """Starting from middle C, e.g. ``IntervalSequence.from_intervals([4, 3])`` for any major arpeggio"""
+        midi = [60]
+        for interval in intervals:
+            midi.append(midi[-1] + interval)
+        return cls([Note(x) for x in midi], pitch_class=pitch_class)
@@ -0,0 +1,65 @@
+import logging
+
+from MIDIEvents.SequenceMatcher import SequenceMatcher
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class IntervalSequenceMatcher:
+    """
+    Matches interval patterns with two :py:class:`SequenceMatcher` automata over the intervals between consecutive
+    notes, one in semitones and one in semitones mod 12.  Every transposition of a pattern is the same string of
+    intervals, so one pattern covers every key, and a note is still one transition per automaton however many patterns
+    there are.
+    """
+
+    def __init__(self):
+        self._semitones = SequenceMatcher()
+        self._pitch_classes = SequenceMatcher()
+        self._previous = None  # Last note, to take the next interval from
+
+    def __len__(self):
+        return len(self._semitones) + len(self._pitch_classes)
+
+    def __contains__(self, key):
+        return key in self._semitones or key in self._pitch_classes
+
+    def add(self, key, intervals, pitch_class, recent_notes=()):
+        """
+        Add a pattern.  ``key`` is returned by :py:meth:`advance` when notes with ``intervals`` between them have just
+        been played.  Passing the recently played notes keeps the current state correct.
+        """
+        matcher = self._pitch_classes if pitch_class else self._semitones
+        matcher.add(key, intervals, self._intervals(recent_notes, pitch_class))
+        if recent_notes:
+            self._previous = recent_notes[-1]
+
+    def remove(self, key, recent_notes=()):
+        for pitch_class, matcher in ((False, self._semitones), (True, self._pitch_classes)):
+            if key in matcher:
+                matcher.remove(key, self._intervals(recent_notes, pitch_class))
+
+    def clear(self):
+        self._semitones.clear()
+        self._pitch_classes.clear()
+        self._previous = None
+
+    def advance(self, note):
+        """Keys of the patterns that ended on ``note``"""
+        previous = self._previous
+        self._previous = note
+        if previous is None:
+            return ()
+        interval = note - previous
+        matches = self._semitones.advance(interval) if self._semitones else ()
+        if self._pitch_classes:
+            pitch_class_matches = self._pitch_classes.advance(interval % 12)
+            if pitch_class_matches:
+                matches += pitch_class_matches
+        return matches
+
+    @staticmethod
+    def _intervals(notes, pitch_class):
+        notes = list(notes)
+        intervals = [b - a for a, b in zip(notes, notes[1:])]
+        return [interval % 12 for interval in intervals] if pitch_class else intervals
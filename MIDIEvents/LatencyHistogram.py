@@ -0,0 +1,85 @@
+import threading
+
+
+class LatencyHistogram:
+    """
+    HDR style histogram of durations in nanoseconds.  Every power of two is split into ``2 ** (significant_bits - 1)``
+    buckets, so any recorded value is known to within ``2 ** (1 - significant_bits)`` of itself, from 1 ns to hours, in
+    a few thousand counters.  Recording is a bit shift and a list increment.
+    """
+
+    def __init__(self, significant_bits=7):
+        if significant_bits < 1:
+            raise ValueError("significant_bits has to be at least 1")
+        self.significant_bits = significant_bits
+        self._half = 1 << (significant_bits - 1)  # Buckets per power of two
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (2 * self._half)
+            self.count = 0
+            self.total = 0
+            self.min = None
+            self.max = None
+
+    def record(self, value):
+        """Add one duration in ns.  Negative durations count as 0."""
+        if value < 0:
+            value = 0
+        index = self._index(value)
+        with self._lock:
+            if index >= len(self.counts):
+                self.counts.extend([0] * (index + 1 - len(self.counts)))
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent):
+        """Highest value that ``percent`` % of the recorded values are at or below, to the histogram's precision"""
+        if not 0 <= percent <= 100:
+            raise ValueError("percent has to be between 0 and 100")
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(1, -(-self.count * percent // 100))  # Ceiling, so the 100th percentile is the largest value
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= target:
+                    return min(self._highest_equivalent(index), self.max)
+
+    def summary(self):
+        """``dict`` of count, min, mean, p50, p90, p99, p99.9 and max, in ns"""
+        return {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p99.9": self.percentile(99.9),
+            "max": self.max,
+        }
+
+    def _index(self, value):
+        shift = value.bit_length() - self.significant_bits
+        if shift <= 0:
+            return value
+        return shift * self._half + (value >> shift)
+
+    def _highest_equivalent(self, index):
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        top = index - shift * self._half
+        return ((top + 1) << shift) - 1
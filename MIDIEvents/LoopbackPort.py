@@ -7,20 +7,133 @@ logger = logging.getLogger("MIDIEvents")
 
 
 class LoopbackPort(mido.ports.BaseIOPort):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    """
+    Port that receives what's sent to it.  Messages wait in a preallocated ring buffer until they're received, or go
+    straight to the callback if one is set.  When the buffer is full, ``overflow`` decides what happens:
+
+    * ``"lossless"`` doubles the buffer, so nothing is lost.
+    * ``"overwrite"`` drops the oldest messages to make room, and counts them in ``dropped``.
+    """
+    overflow_policies = ("lossless", "overwrite")
+
+    def __init__(self, *args, capacity=1024, overflow="lossless", **kwargs):
+        self._ring = []
+        self._head = 0  # Index of the oldest message
+        self._size = 0
+        self._ring_lock = threading.Lock()
+        super().__init__(*args, **kwargs)  # First, so close() works even if the checks below raise
         self._callback = None
+        if capacity < 1:
+            raise ValueError("capacity has to be at least 1")
+        if overflow not in self.overflow_policies:
+            raise ValueError(f"overflow has to be one of {self.overflow_policies}")
+        self.overflow = overflow
+        self.dropped = 0
+        self._ring = [None] * capacity
 
     def _open(self, callback=None):
         self._callback_lock = threading.RLock()
 
+    @property
+    def capacity(self):
+        return len(self._ring)
+
+    @property
+    def pending(self):
+        """Number of messages waiting to be received"""
+        return self._size
+
     def _send(self, msg):
         if self._callback:
             self._callback(msg)
-            logger.debug("{} message sent to callback".format(msg))
         else:
-            self._messages.append(msg)
-            logger.debug("{} message sent to internal queue".format(msg))
+            with self._ring_lock:
+                self._push([msg])
+
+    def send_many(self, msgs):
+        """
+        Send a list of messages in one go.  Unlike :py:meth:`send`, messages aren't copied or checked, so don't change
+        them afterwards.
+        """
+        if self.closed:
+            raise ValueError("send_many() called on closed port")
+        callback = self._callback
+        if callback:
+            for msg in msgs:
+                callback(msg)
+        else:
+            with self._ring_lock:
+                self._push(msgs if isinstance(msgs, list) else list(msgs))
+
+    def receive_many(self):
+        """Every pending message, oldest first, as a list.  Much faster than :py:meth:`iter_pending` in bulk."""
+        self._check_callback()
+        with self._lock:
+            msgs = list(self._messages)  # Anything put there directly goes first
+            self._messages.clear()
+        with self._ring_lock:
+            msgs.extend(self._pop_all())
+        return msgs
+
+    def iter_pending(self):
+        """Same as ``mido``'s, but takes what's waiting all at once instead of locking once per message"""
+        return iter(self.receive_many())
+
+    def _receive(self, block=True):
+        with self._ring_lock:
+            if not self._size:
+                return None
+            msg = self._ring[self._head]
+            self._ring[self._head] = None
+            self._head = (self._head + 1) % len(self._ring)
+            self._size -= 1
+            return msg
+
+    def _push(self, msgs):
+        ring = self._ring
+        capacity = len(ring)
+        n = len(msgs)
+        if n > capacity - self._size:
+            if self.overflow == "lossless":
+                while capacity - self._size < n:
+                    capacity *= 2
+                self._resize(capacity)
+                ring = self._ring
+            else:
+                if n > capacity:
+                    self.dropped += n - capacity
+                    msgs = msgs[n - capacity:]
+                    n = capacity
+                drop = n - (capacity - self._size)
+                self.dropped += drop
+                self._head = (self._head + drop) % capacity
+                self._size -= drop
+        tail = (self._head + self._size) % capacity
+        first = min(n, capacity - tail)
+        ring[tail:tail + first] = msgs[:first]
+        ring[:n - first] = msgs[first:]
+        self._size += n
+
+    def _pop_all(self):
+        ring = self._ring
+        head = self._head
+        end = head + self._size
+        if end <= len(ring):
+            msgs = ring[head:end]
+            ring[head:end] = [None] * self._size
+        else:
+            end -= len(ring)
+            msgs = ring[head:] + ring[:end]
+            ring[head:] = [None] * (len(ring) - head)
+            ring[:end] = [None] * end
+        self._head = 0
+        self._size = 0
+        return msgs
+
+    def _resize(self, capacity):
+        msgs = self._pop_all()
+        self._ring = msgs + [None] * (capacity - len(msgs))
+        self._size = len(msgs)
 
     @property
     def callback(self):
@@ -30,6 +143,11 @@ class LoopbackPort(mido.ports.BaseIOPort):
     def callback(self, func):
         with self._callback_lock:
             if func:
-                for msg in self.iter_pending():
+                with self._lock:
+                    msgs = list(self._messages)
+                    self._messages.clear()
+                with self._ring_lock:
+                    msgs.extend(self._pop_all())
+                for msg in msgs:
                     func(msg)
             self._callback = func
@@ -1,25 +1,126 @@
 import logging
 import threading
+import time
 from collections import deque
+from functools import partial
+from types import MappingProxyType
 
 import mido
 
 import MIDIEvents
-from MIDIEvents import Chord, Sequence, ChordProgression
+from MIDIEvents import (Chord, PitchClassChord, Sequence, FuzzySequence, IntervalSequence, TimedSequence, ChordProgression,
+                        Pattern)
+from MIDIEvents.ChordProgressionMatcher import ChordProgressionMatcher
+from MIDIEvents.EventHistory import EventHistory
+from MIDIEvents.FuzzySequenceMatcher import FuzzySequenceMatcher
+from MIDIEvents.HandlerExecutor import HandlerExecutor
+from MIDIEvents.HandlerRegistry import HandlerRegistry
+from MIDIEvents.Instrumentation import Instrumentation, TimedHandler
+from MIDIEvents.IntervalSequenceMatcher import IntervalSequenceMatcher
+from MIDIEvents.PatternMatcher import PatternMatcher
+from MIDIEvents.SequenceMatcher import SequenceMatcher
+from MIDIEvents.TimedSequenceMatcher import TimedSequenceMatcher
 
 logger = logging.getLogger("MIDIEvents")
 
 
+
+class InlineHandler:
+    """
+    Handler added with ``inline=True``.  Runs on the thread receiving MIDI until it goes over the budget
+    ``inline_overruns`` runs in a row.
+    """
+    __slots__ = ("func", "demoted", "overruns")
+
+    def __init__(self, func):
+        self.func = func
+        self.demoted = False
+        self.overruns = 0  # Runs over the budget in a row
+
+    def __call__(self):
+        return self.func()
+
+    def __eq__(self, other):
+        if isinstance(other, InlineHandler):
+            return self.func == other.func
+        return self.func == other
+
+    def __hash__(self):
+        return hash(self.func)
+
+    def __repr__(self):
+        return repr(self.func)
+
+
 class MIDIEventLoop:
-    def __init__(self, port="default", check_chords=True, check_sequences=True, check_chord_progressions=True):
+    wait_strategies = ("spin", "poll", "backoff", "block")
+    _clock = staticmethod(time.perf_counter)  # Seconds, for chord_window
+    inline_overruns = 3  # Runs over inline_budget in a row before an inline handler is moved to the executor
+    _flush_idle = 1.0  # Seconds without a batch before the batch thread for callbacks ends
+
+    def __init__(self, port="default", check_chords=True, check_sequences=True, check_chord_progressions=True, executor=None,
+                 wait="poll", poll_interval=0.0005, max_poll_interval=0.004, instrument=False, batch=False,
+                 batch_window=0.002, chord_window=None, inline_budget=0.0005, history=4096, unified=False):
+        if wait not in self.wait_strategies:
+            raise ValueError(f"wait must be one of {self.wait_strategies}, not {wait!r}")
+        if batch and chord_window:
+            raise ValueError("batch and chord_window can't be used together")
+        if unified and (batch or chord_window):
+            raise ValueError("unified can't be used with batch or chord_window")
+        self.wait = wait
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.batch = batch
+        self.batch_window = batch_window
+        self.batch_stats = {"batches": 0, "messages": 0, "chord_checks": 0, "chord_checks_saved": 0}
+        self._batch = []  # Messages from callbacks waiting for the batch to close
+        self._batch_lock = threading.Lock()
+        self._batch_process_lock = threading.Lock()
+        self._batch_opened = threading.Event()  # Set when the first message of a batch comes in by callback
+        self._flush_thread = None  # Thread that closes the batches from callbacks, while there are any
+        self.chord_window = chord_window
+        self.unified = unified
+        self.inline_budget = inline_budget
+        self.inline_stats = {"runs": 0, "failed": 0, "demoted": 0}
+        self.chord_window_stats = {"groups": 0, "notes": 0}
+        self._chord_group = None  # Timer of the open group of notes, or None
+        self._chord_group_start = 0
+        self._chord_window_lock = threading.Lock()
         self.check_chords = check_chords  # TODO test these bits
         self.check_sequences = check_sequences
         self.check_chord_progressions = check_chord_progressions
-        self.running_handler_threads = list()
-        self.handlers = dict()
-        self.down_notes = set()
-        self.recent_notes = deque(maxlen=Sequence.maxlen)
-        self.recent_chords = deque(maxlen=ChordProgression.maxlen)
+        self._owns_executor = executor is None
+        self.executor = HandlerExecutor() if executor is None else executor
+        self._registry = HandlerRegistry()  # Replaced, never changed, so the hot path can read it without a lock
+        self._registry_lock = threading.Lock()  # Only taken to change the handlers
+        self.down_mask = 0  # Bit n is set while MIDI note n is down
+        self._down_time = 0  # When the latest key down was recorded in the history
+        self.history = EventHistory(history)
+        self._pitch_class_counts = [0] * 12  # How many notes are down for each pitch class
+        self._pitch_class_set = 0
+        self._sequence_matcher = SequenceMatcher()
+        self._sequence_matches = ()  # Sequences that ended on the latest note
+        self._fuzzy_matcher = FuzzySequenceMatcher()
+        self._fuzzy_matches = ()  # FuzzySequences that started matching on the latest note
+        self._interval_matcher = IntervalSequenceMatcher()
+        self._interval_matches = ()  # IntervalSequences that ended on the latest note
+        self._timed_matcher = TimedSequenceMatcher()
+        self._timed_matches = ()  # TimedSequences that ended on the latest note in time
+        self._progression_matcher = ChordProgressionMatcher(ChordProgression.maxlen)
+        self._progression_matches = ()  # ChordProgressions completed by the latest chord
+        self._pattern_matcher = PatternMatcher()
+        self._pattern_matches = ()  # Patterns, and with unified the keys lowered to them, that ended on the latest note
+        self._matcher_updates = deque()  # Matcher changes waiting for the thread receiving MIDI
+        self.instrumentation = None
+        if instrument:  # Swap in the timed versions, so there's no cost at all when it's off
+            self.instrumentation = Instrumentation()
+            self._execute_handler = self._timed_execute_handler
+        if chord_window:  # These callbacks and _callback_batch only record "dispatch" and "total" when instrumented
+            self._callback = self._windowed_callback
+        elif unified:
+            self._callback = self._unified_callback
+        elif instrument:
+            self._callback = self._timed_callback
         if port == "default":
             try:
                 self.port = mido.open_input(mido.get_input_names()[0])
@@ -32,9 +133,10 @@ class MIDIEventLoop:
         else:
             raise TypeError("Expected mido port or string name compatible with ``mido.open_input()``")
         if MIDIEvents.callbacks_supported():
-            self.port.callback = self._callback
+            self.port.callback = self._buffer_callback if batch else self._callback
         else:
             self._running = False
+            self._stopped = threading.Event()  # Cuts short the wait between receives for "block"
             self._thread = None
         logger.debug("Created new MIDIEventLoop with __init__")
     
@@ -43,37 +145,223 @@ class MIDIEventLoop:
             self.stop()
         if hasattr(self, "port") and isinstance(self.port, mido.ports.BasePort):
             self.port.close()
+        if getattr(self, "_owns_executor", False):
+            self.executor.shutdown(wait=False)
+
+    @property
+    def handlers(self):
+        """Read only ``dict`` of every key mapped to a tuple of its handlers"""
+        return MappingProxyType(self._registry.merged())
+
+    @property
+    def chord_handlers(self):
+        return self._registry.chords
+
+    @property
+    def pitch_class_chord_handlers(self):
+        return self._registry.pitch_class_chords
 
-    def on_notes(self, notes_obj):
+    @property
+    def sequence_handlers(self):
+        return self._registry.sequences
+
+    @property
+    def chord_progression_handlers(self):
+        return self._registry.chord_progressions
+
+    @property
+    def pattern_handlers(self):
+        return self._registry.patterns
+
+    @property
+    def running_handler_threads(self):
+        """Worker threads of the executor that runs the handlers"""
+        return list(self.executor.threads)
+
+    def stats(self):
+        """Handler executor counters, and per stage latency summaries when ``instrument`` is on"""
+        stats = {"executor": self.executor.stats()}
+        if self.batch:
+            stats["batch"] = dict(self.batch_stats)
+        if self.chord_window:
+            stats["chord_window"] = dict(self.chord_window_stats)
+        if any(self.inline_stats.values()):
+            stats["inline"] = dict(self.inline_stats)
+        if self.instrumentation is not None:
+            stats["latency"] = self.instrumentation.stats()
+        return stats
+
+    @property
+    def recent_notes(self):
+        """Snapshot of the last :py:attr:`Sequence.maxlen` key downs from :py:attr:`history`, as a new ``deque`` each time"""
+        return deque(self.history.key_downs(Sequence.maxlen), maxlen=Sequence.maxlen)
+
+    @property
+    def recent_chords(self):
+        """
+        Snapshot of the Chords down after each of the last :py:attr:`ChordProgression.maxlen` key downs, from
+        :py:attr:`history`, as a new ``deque`` each time.  Kept for code written when this was updated on every key down.
+        """
+        window = self.history.window()
+        chords = deque(maxlen=ChordProgression.maxlen)
+        for i in range(window.size - 1, -1, -1):
+            if len(chords) == ChordProgression.maxlen:
+                break
+            if window.velocity[i]:
+                chords.appendleft(Chord.from_mask(window.held_mask(i)))
+        return chords
+
+    @property
+    def down_notes(self):
+        """Set of MIDI notes that are currently down"""
+        mask = self.down_mask
+        notes = set()
+        while mask:
+            low_bit = mask & -mask
+            notes.add(low_bit.bit_length() - 1)
+            mask ^= low_bit
+        return notes
+
+    def on_notes(self, notes_obj, inline=False):
         def _sub(func):
-            self.add_handler(func, notes_obj)
+            self.add_handler(func, notes_obj, inline)
             return func
         return _sub
 
-    def add_handler(self, func, notes_obj):
+    def add_handler(self, func, notes_obj, inline=False):
         # Pre-process notes_obj
         notes_obj = self._resolve_notes_obj(notes_obj)
+        if inline:
+            func = InlineHandler(func)
 
-        if notes_obj in self.handlers:
-            self.handlers[notes_obj].append(func)
-        else:
-            self.handlers[notes_obj] = [func]
+        with self._registry_lock:
+            registry = self._registry
+            new_registry = registry.with_handler(notes_obj, func)
+            if notes_obj not in registry:  # Before the swap, so a key that can't be indexed isn't registered
+                self._index_handler_key(notes_obj)
+            self._registry = new_registry
         logger.debug(f"Added handler for {notes_obj}")
 
     def clear_handlers(self, notes_obj=None):
         if isinstance(notes_obj, type):  # If it's a class remove instances from handlers
-            self.handlers = {key: val for key, val in self.handlers.items() if not isinstance(key, notes_obj)}
+            with self._registry_lock:
+                registry = self._registry
+                self._registry = registry.without_type(notes_obj)
+                for key in registry.merged():
+                    if isinstance(key, notes_obj):
+                        self._unindex_handler_key(key)
         elif notes_obj is not None:
             notes_obj = self._resolve_notes_obj(notes_obj)
-            del self.handlers[notes_obj]
+            with self._registry_lock:
+                self._registry = self._registry.without(notes_obj)
+                self._unindex_handler_key(notes_obj)
             logger.debug(f"Cleared handlers for {notes_obj}")
         else:
-            self.handlers = dict()
+            with self._registry_lock:
+                self._registry = HandlerRegistry()
+                self._matcher_updates.append(self._sequence_matcher.clear)
+                self._matcher_updates.append(self._fuzzy_matcher.clear)
+                self._matcher_updates.append(self._interval_matcher.clear)
+                self._matcher_updates.append(self._timed_matcher.clear)
+                self._matcher_updates.append(self._progression_matcher.clear)
+                self._matcher_updates.append(self._pattern_matcher.clear)
             logger.info("Cleared all handlers")
 
+    def _index_handler_key(self, notes_obj):
+        """Chords are indexed by the registry.  The matchers are changed later by ``_apply_matcher_updates``."""
+        if self._lowers(notes_obj):
+            self._matcher_updates.append(partial(self._add_pattern, notes_obj))
+        elif isinstance(notes_obj, Sequence):
+            self._matcher_updates.append(partial(self._add_sequence, notes_obj))
+        elif isinstance(notes_obj, ChordProgression):
+            chord_keys = tuple(ChordProgressionMatcher.chord_key(chord) for chord in notes_obj.chords)
+            self._matcher_updates.append(partial(self._progression_matcher.add, notes_obj, chord_keys))
+
+    def _unindex_handler_key(self, notes_obj):
+        if self._lowers(notes_obj):
+            self._matcher_updates.append(partial(self._pattern_matcher.remove, notes_obj))
+        elif isinstance(notes_obj, Sequence):
+            self._matcher_updates.append(partial(self._remove_sequence, notes_obj))
+        elif isinstance(notes_obj, ChordProgression):
+            self._matcher_updates.append(partial(self._progression_matcher.remove, notes_obj))
+
+    def _lowers(self, notes_obj):
+        """
+        Whether ``notes_obj`` goes to the Pattern matcher, which with ``unified`` is also Chords, PitchClassChords and
+        plain Sequences.  ChordProgressions stay on their trie, since the gaps between their chords would keep every
+        started progression live in the automaton.
+        """
+        if isinstance(notes_obj, Pattern):
+            return True
+        return self.unified and (type(notes_obj) is Sequence or isinstance(notes_obj, (Chord, PitchClassChord)))
+
+    def _add_pattern(self, notes_obj):
+        pattern = notes_obj if isinstance(notes_obj, Pattern) else Pattern.from_notes_obj(notes_obj)
+        self._pattern_matcher.add(notes_obj, pattern._tree)
+
+    def _recent_pattern_events(self):
+        """The last :py:attr:`Sequence.maxlen` key downs from :py:attr:`history`, as the Pattern matcher sees them"""
+        window = self.history.window()
+        events = []
+        for i in range(window.size - 1, -1, -1):
+            if len(events) == Sequence.maxlen:
+                break
+            if window.velocity[i]:
+                held_mask = mask = window.held_mask(i)
+                pitch_class_set = 0
+                while mask:
+                    pitch_class_set |= mask & 0xFFF
+                    mask >>= 12
+                events.append((window.note[i], held_mask, pitch_class_set))
+        events.reverse()
+        return events
+
+    def _recent_timed_key_downs(self):
+        """(note, time) of the last :py:attr:`Sequence.maxlen` key downs from :py:attr:`history`, oldest first"""
+        window = self.history.window()
+        key_downs = []
+        for i in range(window.size - 1, -1, -1):
+            if len(key_downs) == Sequence.maxlen:
+                break
+            if window.velocity[i]:
+                key_downs.append((window.note[i], window.time[i]))
+        key_downs.reverse()
+        return key_downs
+
+    def _add_sequence(self, seq):
+        recent_notes = self.history.key_downs(Sequence.maxlen)
+        if isinstance(seq, FuzzySequence):
+            self._fuzzy_matcher.add(seq, seq.midi, seq.max_errors, recent_notes)
+        elif isinstance(seq, IntervalSequence):
+            self._interval_matcher.add(seq, seq.intervals, seq.pitch_class, recent_notes)
+        elif isinstance(seq, TimedSequence):
+            self._timed_matcher.add(seq, seq.midi, seq.max_gap, seq.max_duration, self._recent_timed_key_downs())
+        else:
+            self._sequence_matcher.add(seq, seq.midi, recent_notes)
+
+    def _remove_sequence(self, seq):
+        recent_notes = self.history.key_downs(Sequence.maxlen)
+        if isinstance(seq, FuzzySequence):
+            self._fuzzy_matcher.remove(seq, recent_notes)
+        elif isinstance(seq, IntervalSequence):
+            self._interval_matcher.remove(seq, recent_notes)
+        elif isinstance(seq, TimedSequence):
+            self._timed_matcher.remove(seq)
+        else:
+            self._sequence_matcher.remove(seq, recent_notes)
+
+    def _apply_matcher_updates(self):
+        """The matchers keep state between messages, so only the thread receiving MIDI changes them"""
+        updates = self._matcher_updates
+        while updates:
+            updates.popleft()()
+        if self._pattern_matcher.stale:  # Once for all the changes
+            self._pattern_matcher.compile(self._recent_pattern_events())
+
     def start(self, blocking=False):
         if not MIDIEvents.callbacks_supported():
             self._running = True
+            self._stopped.clear()
             self._thread = threading.Thread(target=self._loop, name="MIDIEventLoop thread")
             self._thread.start()
             logger.info("MIDIEventLoop thread started")
@@ -85,6 +373,8 @@ class MIDIEventLoop:
     def stop(self):
         if not MIDIEvents.callbacks_supported():
             self._running = False
+            if getattr(self, "_stopped", None) is not None:
+                self._stopped.set()
             try:
                 self._thread.join()
             except AttributeError:  # Already garbage collected
@@ -95,70 +385,439 @@ class MIDIEventLoop:
             logger.warning("Called stop() while using a backend that supports callbacks.")
 
     def _loop(self):
+        if self.wait == "block":
+            self._receive_loop()
+            return
+        delay = 0
         while self._running:
-            for msg in self.port.iter_pending():
+            received = False
+            if self.batch:
+                msgs = self._collect_batch([])
+                if msgs:
+                    self._callback_batch(msgs)
+                    received = True
+            else:
+                for msg in self.port.iter_pending():
+                    self._callback(msg)
+                    received = True
+            if received or self.wait == "spin":
+                delay = 0
+            elif self.wait == "poll":
+                time.sleep(self.poll_interval)
+            else:  # Backoff, sleep twice as long each time nothing came in
+                delay = min(delay * 2 or self.poll_interval, self.max_poll_interval)
+                time.sleep(delay)
+
+    def _receive_loop(self):
+        """
+        Take each message with ``port.receive(block=False)``, and in between wait on ``_stopped``, which :py:meth:`stop`
+        sets, for as long as ``mido``'s own blocking receive would sleep
+        """
+        stopped = self._stopped
+        wait = mido.ports.get_sleep_time()
+        while not stopped.is_set():
+            try:
+                msg = self.port.receive(block=False)
+            except (OSError, ValueError):  # Port was closed
+                msg = None
+            if msg is None:
+                if self.port.closed:
+                    logger.warning("Port closed while MIDIEventLoop was receiving")
+                    break
+                stopped.wait(wait)
+            elif self.batch:
+                self._callback_batch(self._collect_batch([msg]))
+            else:
                 self._callback(msg)
 
+    def _collect_batch(self, msgs):
+        """
+        Add the pending messages.  While more keep arriving, poll again every ``poll_interval`` until a poll finds
+        nothing new or ``batch_window`` has passed, so a lone message isn't held up for the whole window.
+        """
+        msgs.extend(self.port.iter_pending())
+        if msgs and self.batch_window:
+            deadline = time.perf_counter() + self.batch_window
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                time.sleep(min(self.poll_interval, remaining))
+                received = len(msgs)
+                msgs.extend(self.port.iter_pending())
+                if len(msgs) == received:
+                    break
+        return msgs
+
+    def _buffer_callback(self, msg):
+        """
+        Callback for batch mode.  The first message of a batch wakes the flush thread, which handles the batch
+        ``batch_window`` later.
+        """
+        with self._batch_lock:
+            self._batch.append(msg)
+            if len(self._batch) > 1:
+                return
+            if self.batch_window:
+                if self._flush_thread is None:
+                    self._flush_thread = threading.Thread(target=self._flush_loop, name="MIDIEventLoop batch thread")
+                    self._flush_thread.daemon = True
+                    self._flush_thread.start()
+                self._batch_opened.set()
+                return
+        self._flush_batch()
+
+    def _flush_loop(self):
+        """Flush each batch ``batch_window`` after it opens.  Ends once no batch opens for ``_flush_idle`` seconds."""
+        while True:
+            self._batch_opened.wait(self._flush_idle)
+            with self._batch_lock:
+                if not self._batch_opened.is_set():
+                    self._flush_thread = None
+                    return
+                self._batch_opened.clear()
+            time.sleep(self.batch_window)
+            self._flush_batch()
+
+    def _flush_batch(self):
+        with self._batch_process_lock:
+            with self._batch_lock:
+                msgs, self._batch = self._batch, []
+            if msgs:
+                self._callback_batch(msgs)
+
+    def _callback_batch(self, msgs):
+        """
+        Handle several messages at once.  Notes still go through the Sequence automaton one at a time, but Chords,
+        PitchClassChords and ChordProgressions are only checked once per run of key downs, just before the next key up
+        or the end of the batch, so the partial chords on the way to a full one are skipped.
+        """
+        if self._matcher_updates:
+            self._apply_matcher_updates()
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            self._received = time.perf_counter_ns()
+            self._dispatch_time = 0
+        stats = self.batch_stats
+        chords_pending = False  # Key downs since the chords were last checked
+        for msg in msgs:
+            if msg.type == "note_on" and msg.velocity > 0:  # Key down
+                self._note_down(msg)
+                self._advance_sequences(msg.note)
+                if self.check_sequences:
+                    self._check_sequence_handlers()
+                self._check_pattern_handlers()
+                if chords_pending:
+                    stats["chord_checks_saved"] += 1
+                chords_pending = True
+            elif msg.type == "note_off" or (msg.type == "note_on" and msg.velocity == 0):  # Key up
+                if chords_pending:
+                    self._check_batch_chords()
+                    chords_pending = False
+                self._note_up(msg)
+        if chords_pending:
+            self._check_batch_chords()
+        stats["batches"] += 1
+        stats["messages"] += len(msgs)
+        if instrumentation is not None:
+            self._record_dispatch()
+
+    def _check_batch_chords(self):
+        self.batch_stats["chord_checks"] += 1
+        self._progression_matches = self._progression_matcher.advance(self.down_mask, self._pitch_class_set) if self._progression_matcher else ()
+        if self.check_chords:
+            self._check_chord_handlers()
+            self._check_pitch_class_chord_handlers()
+        if self.check_chord_progressions:
+            self._check_chord_progression_handlers()
+
     def _callback(self, msg):
+        if self._matcher_updates:
+            self._apply_matcher_updates()
         if msg.type == "note_on" and msg.velocity > 0:  # Key down
-            self.recent_notes.append(msg.note)
-            self.down_notes.add(msg.note)
-            self.recent_chords.append(Chord.from_midi_list(self.down_notes))
+            self._note_down(msg)
+            self._progression_matches = self._progression_matcher.advance(self.down_mask, self._pitch_class_set) if self._progression_matcher else ()
+            self._advance_sequences(msg.note)
             logger.debug(f"Note {msg.note} on")
             self._check_handlers()
         elif msg.type == "note_off" or (msg.type == "note_on" and msg.velocity == 0):  # Key up
-            self.down_notes.remove(msg.note)
+            self._note_up(msg)
             logger.debug(f"Note {msg.note} off")
-    
+
+    def _note_down(self, msg):
+        note = msg.note
+        bit = 1 << note
+        if not self.down_mask & bit:
+            self.down_mask |= bit
+            pc = note % 12
+            self._pitch_class_counts[pc] += 1
+            self._pitch_class_set |= 1 << pc
+        self._down_time = self._clock()
+        self.history.record(self._down_time, note, msg.velocity, msg.channel, self.down_mask)
+
+    def _note_up(self, msg):
+        note = msg.note
+        bit = 1 << note
+        if self.down_mask & bit:
+            self.down_mask ^= bit
+            pc = note % 12
+            self._pitch_class_counts[pc] -= 1
+            if not self._pitch_class_counts[pc]:
+                self._pitch_class_set &= ~(1 << pc)
+        self.history.record(self._clock(), note, 0, msg.channel, self.down_mask)
+
+    def _advance_sequences(self, note):
+        """Move every Sequence matcher on by a key down"""
+        self._sequence_matches = self._sequence_matcher.advance(note) if self._sequence_matcher else ()
+        self._fuzzy_matches = self._fuzzy_matcher.advance(note) if self._fuzzy_matcher else ()
+        self._interval_matches = self._interval_matcher.advance(note) if self._interval_matcher else ()
+        self._timed_matches = self._timed_matcher.advance(note, self._down_time) if self._timed_matcher else ()
+        self._pattern_matches = (self._pattern_matcher.advance(note, self.down_mask, self._pitch_class_set)
+                                 if self._pattern_matcher else ())
+
+    def _timed_callback(self, msg):
+        """Same as ``_callback``, recording each stage in :py:attr:`instrumentation`"""
+        now = time.perf_counter_ns
+        record = self.instrumentation.record
+        received = self._received = now()
+        if self._matcher_updates:
+            self._apply_matcher_updates()
+        if msg.type == "note_on" and msg.velocity > 0:  # Key down
+            self._note_down(msg)
+            start = now()
+            record("state", start - received)
+            self._progression_matches = self._progression_matcher.advance(self.down_mask, self._pitch_class_set) if self._progression_matcher else ()
+            end = now()
+            record("progressions", end - start)
+            self._advance_sequences(msg.note)
+            start = now()
+            record("sequences", start - end)
+            self._dispatch_time = 0
+            if self.check_chords:
+                self._check_chord_handlers()
+                self._check_pitch_class_chord_handlers()
+                end = now()
+                record("chords", end - start - self._dispatch_time)
+            if self.check_sequences:
+                self._check_sequence_handlers()
+            if self.check_chord_progressions:
+                self._check_chord_progression_handlers()
+            self._check_pattern_handlers()
+            record("dispatch", self._dispatch_time)
+        elif msg.type == "note_off" or (msg.type == "note_on" and msg.velocity == 0):  # Key up
+            self._note_up(msg)
+            record("state", now() - received)
+        record("total", now() - received)
+
+    def _windowed_callback(self, msg):
+        """
+        Callback for ``chord_window``.  Key downs within ``chord_window`` ms of the first one are grouped, and Chords,
+        PitchClassChords and ChordProgressions are only checked once the group closes.  It closes when the window runs
+        out, or early on a key up.  Sequences are still checked on every note.
+        """
+        with self._chord_window_lock:
+            if self._matcher_updates:
+                self._apply_matcher_updates()
+            if self.instrumentation is not None:
+                self._received = time.perf_counter_ns()
+                self._dispatch_time = 0
+            if msg.type == "note_on" and msg.velocity > 0:  # Key down
+                now = self._clock()
+                if self._chord_group is not None and (now - self._chord_group_start) * 1000 > self.chord_window:
+                    self._close_chord_group()  # The timer hasn't fired yet
+                self._note_down(msg)
+                self._advance_sequences(msg.note)
+                if self.check_sequences:
+                    self._check_sequence_handlers()
+                self._check_pattern_handlers()
+                self.chord_window_stats["notes"] += 1
+                if self._chord_group is None:
+                    self._chord_group_start = now
+                    self._chord_group = self._start_timer(self.chord_window / 1000, self._chord_window_expired)
+            elif msg.type == "note_off" or (msg.type == "note_on" and msg.velocity == 0):  # Key up
+                if self._chord_group is not None:
+                    self._close_chord_group()
+                self._note_up(msg)
+            if self.instrumentation is not None:
+                self._record_dispatch()
+
+    def _unified_callback(self, msg):
+        """
+        Callback for ``unified``.  Chords, PitchClassChords and plain Sequences are lowered to Patterns, so one step of
+        the Pattern automaton matches all of them.  ChordProgressions, FuzzySequences, IntervalSequences and
+        TimedSequences keep their own matchers.
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            self._received = time.perf_counter_ns()
+            self._dispatch_time = 0
+        if self._matcher_updates:
+            self._apply_matcher_updates()
+        if msg.type == "note_on" and msg.velocity > 0:  # Key down
+            self._note_down(msg)
+            self._progression_matches = self._progression_matcher.advance(self.down_mask, self._pitch_class_set) if self._progression_matcher else ()
+            self._advance_sequences(msg.note)
+            if self.check_sequences:
+                self._check_sequence_handlers()
+            self._check_pattern_handlers()
+            if self.check_chord_progressions:
+                self._check_chord_progression_handlers()
+        elif msg.type == "note_off" or (msg.type == "note_on" and msg.velocity == 0):  # Key up
+            self._note_up(msg)
+        if instrumentation is not None:
+            self._record_dispatch()
+
+    def _start_timer(self, delay, func):
+        """Call ``func`` with the timer after ``delay`` seconds.  Returns something with ``cancel()``."""
+        timer = threading.Timer(delay, lambda: func(timer))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def _chord_window_expired(self, timer):
+        with self._chord_window_lock:
+            if self._chord_group is timer:  # Not already closed by a key up
+                if self.instrumentation is not None:
+                    self._received = time.perf_counter_ns()
+                    self._dispatch_time = 0
+                self._close_chord_group()
+                if self.instrumentation is not None:
+                    self._record_dispatch()
+
+    def _record_dispatch(self):
+        self.instrumentation.record("dispatch", self._dispatch_time)
+        self.instrumentation.record("total", time.perf_counter_ns() - self._received)
+
+    def _close_chord_group(self):
+        self._chord_group.cancel()
+        self._chord_group = None
+        self.chord_window_stats["groups"] += 1
+        self._progression_matches = self._progression_matcher.advance(self.down_mask, self._pitch_class_set) if self._progression_matcher else ()
+        if self.check_chords:
+            self._check_chord_handlers()
+            self._check_pitch_class_chord_handlers()
+        if self.check_chord_progressions:
+            self._check_chord_progression_handlers()
+
     def _check_handlers(self):
         """Check the various handlers."""
         if self.check_chords:
             self._check_chord_handlers()
+            self._check_pitch_class_chord_handlers()
         if self.check_sequences:
             self._check_sequence_handlers()
         if self.check_chord_progressions:
             self._check_chord_progression_handlers()
+        self._check_pattern_handlers()
 
     def _check_chord_handlers(self):
-        """Find the Chords.  Uses __hash__ to find them in a dictionary."""
-        test_chord = self.recent_chords[-1]
-        if test_chord in self.handlers:
-            for func in self.handlers[test_chord]:
-                logger.debug(f"Triggered handler for {test_chord}")
-                self._execute_handler(func)
+        """Find the Chords.  Looks up the mask of held notes, so no Chord is created."""
+        registry = self._registry
+        test_chord = registry.chords_by_mask.get(self.down_mask)
+        if test_chord is not None:
+            self._dispatch(test_chord, registry.chords[test_chord])
+
+    def _check_pitch_class_chord_handlers(self):
+        """Find the PitchClassChords.  Any voicing of the held notes reduces to the same pitch class set."""
+        registry = self._registry
+        test_chord = registry.pitch_class_chords_by_set.get(self._pitch_class_set)
+        if test_chord is not None:
+            self._dispatch(test_chord, registry.pitch_class_chords[test_chord])
 
     def _check_sequence_handlers(self):
-        """
-        Find the Sequences.  Uses __eq__ to iterate over the sequence handlers and compare to recent notes.
-        TODO investigate another way to do this that might be faster
-        """
-        for seq, func_list in self.handlers.items():
-            if not isinstance(seq, Sequence):
-                continue
-            if seq == self.recent_notes:
-                for func in func_list:
-                    logger.debug(f"Triggered handler for {seq}")
-                    self._execute_handler(func)
+        """Find the Sequences.  The automaton already advanced on the latest note, this just runs what it matched."""
+        sequences = self._registry.sequences
+        for seq in self._sequence_matches:
+            funcs = sequences.get(seq)  # Might have been removed since the matcher was updated
+            if funcs:
+                self._dispatch(seq, funcs)
+        for matches in (self._fuzzy_matches, self._interval_matches, self._timed_matches):
+            for seq in matches:
+                funcs = sequences.get(seq)
+                if funcs:
+                    self._dispatch(seq, funcs)
 
     def _check_chord_progression_handlers(self):
-        for c_seq, func_list in self.handlers.items():
-            if not isinstance(c_seq, ChordProgression):
+        """Find the ChordProgressions.  The matcher already advanced on the latest chord, this just runs what it completed."""
+        chord_progressions = self._registry.chord_progressions
+        for c_seq in self._progression_matches:
+            funcs = chord_progressions.get(c_seq)
+            if funcs:
+                self._dispatch(c_seq, funcs)
+
+    def _check_pattern_handlers(self):
+        """Find the Patterns, and the keys lowered to them.  The automaton already advanced on the latest note."""
+        registry = self._registry
+        for key in self._pattern_matches:
+            if isinstance(key, (Chord, PitchClassChord)):
+                if not self.check_chords:
+                    continue
+            elif isinstance(key, Sequence) and not self.check_sequences:
+                continue
+            try:
+                funcs = registry[key]
+            except KeyError:  # Removed since the matcher was updated
                 continue
-            if c_seq.check_deque(self.recent_chords):
-                for func in func_list:
-                    logger.debug(f"Triggered handler for {c_seq}")
-                    self._execute_handler(func)
+            self._dispatch(key, funcs)
+
+    def _dispatch(self, notes_obj, funcs):
+        """Run the handlers of a key that matched"""
+        for func in funcs:
+            logger.debug(f"Triggered handler for {notes_obj}")
+            self._execute_handler(func)
 
     @staticmethod
     def _resolve_notes_obj(notes_obj):
         if isinstance(notes_obj, str):
-            notes_obj = Chord.from_ident(notes_obj)
-        if not (isinstance(notes_obj, Chord) or isinstance(notes_obj, Sequence) or isinstance(notes_obj, ChordProgression)):
-            raise TypeError("Expected a Sequence or Chord")
+            if any(x.isdigit() for x in notes_obj.split(" ")[0]):  # Base note has an octave, e.g. "C4 Major"
+                notes_obj = Chord.from_ident(notes_obj)
+            else:  # Just a pitch class, e.g. "C Major"
+                notes_obj = PitchClassChord.from_ident(notes_obj)
+        if not isinstance(notes_obj, (Chord, PitchClassChord, Sequence, ChordProgression, Pattern)):
+            raise TypeError("Expected a Sequence, Chord or Pattern")
+        if isinstance(notes_obj, ChordProgression):
+            for chord in notes_obj.chords:
+                if not isinstance(chord, (Chord, PitchClassChord)):
+                    raise TypeError(f"Expected a Chord or PitchClassChord in a ChordProgression, not {chord!r}")
         return notes_obj
     
     def _execute_handler(self, func):
-        t = threading.Thread(target=func)
-        t.daemon = True
-        t.start()
-        self.running_handler_threads.append(t)
+        if type(func) is InlineHandler and not func.demoted:
+            self._run_inline(func)
+        else:
+            self.executor.submit(func)
+
+    def _run_inline(self, handler):
+        """
+        Run an inline handler on this thread.  After ``inline_overruns`` runs in a row over ``inline_budget``, it's sent
+        to the executor from then on.  A single slow run, e.g. from a garbage collection, doesn't count for much.
+        """
+        start = time.perf_counter()
+        try:
+            handler.func()
+        except Exception:
+            elapsed = time.perf_counter() - start
+            self.inline_stats["failed"] += 1
+            logger.exception(f"Handler {handler.func} raised an exception")
+        else:
+            elapsed = time.perf_counter() - start
+        self.inline_stats["runs"] += 1
+        if elapsed <= self.inline_budget:
+            handler.overruns = 0
+            return
+        handler.overruns += 1
+        if handler.overruns >= self.inline_overruns:
+            handler.demoted = True
+            self.inline_stats["demoted"] += 1
+            logger.warning(f"Inline handler {handler.func} took {elapsed * 1000:.3f} ms, over the budget of "
+                           f"{self.inline_budget * 1000:.3f} ms {handler.overruns} times in a row.  Running it on "
+                           f"the executor from now on.")
+
+    def _timed_execute_handler(self, func):
+        start = time.perf_counter_ns()
+        if type(func) is InlineHandler and not func.demoted:
+            self.instrumentation.record("handler_start", start - self._received)
+            type(self)._execute_handler(self, func)
+        else:
+            type(self)._execute_handler(self, TimedHandler(func, self._received, self.instrumentation))
+        self._dispatch_time += time.perf_counter_ns() - start
@@ -0,0 +1,91 @@
+import logging
+from collections import namedtuple
+
+import mido
+
+from MIDIEvents import LoopbackPort, MIDIEventLoop
+
+logger = logging.getLogger("MIDIEvents")
+
+MatchEvent = namedtuple("MatchEvent", ["time", "notes_obj", "handlers"])
+
+
+class _ReplayTimer:
+    """Stands in for ``threading.Timer``.  Fired by :py:meth:`MIDIFileReplay.replay` once song time reaches ``deadline``."""
+    __slots__ = ("deadline", "func", "cancelled")
+
+    def __init__(self, deadline, func):
+        self.deadline = deadline
+        self.func = func
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class MIDIFileReplay(MIDIEventLoop):
+    """
+    Runs recorded MIDI through the same matching as :py:class:`MIDIEventLoop` as fast as it can go, without a port,
+    threads or sleeping.  Time is the song's time, so ``chord_window`` works the same as it would live.
+    """
+
+    def __init__(self, check_chords=True, check_sequences=True, check_chord_progressions=True, chord_window=None,
+                 run_handlers=False, history=4096, unified=False):
+        super().__init__(LoopbackPort(), check_chords, check_sequences, check_chord_progressions,
+                         chord_window=chord_window, history=history, unified=unified)
+        self.run_handlers = run_handlers
+        self.song_time = 0
+        self._events = []
+        self._timers = []
+
+    def replay(self, midi_file):
+        """
+        Generator of a :py:class:`MatchEvent` for every key that matched, in order.  Accepts a ``mido.MidiFile``, a
+        path to one, or any iterable of messages whose ``time`` is seconds since the previous message.
+        """
+        if isinstance(midi_file, str):
+            midi_file = mido.MidiFile(midi_file)
+        self.song_time = 0
+        events = self._events
+        timers = self._timers
+        callback = self._callback
+        for msg in midi_file:
+            self.song_time += msg.time
+            if msg.is_meta:
+                continue
+            if timers:
+                yield from self._fire_timers(self.song_time)
+            callback(msg)
+            if events:
+                yield from events
+                events.clear()
+        if timers:
+            yield from self._fire_timers(float("inf"))
+
+    def _fire_timers(self, until):
+        now = self.song_time
+        while self._timers and self._timers[0].deadline <= until:
+            timer = self._timers.pop(0)
+            if not timer.cancelled:
+                self.song_time = timer.deadline
+                timer.func(timer)
+                yield from self._events
+                self._events.clear()
+        self.song_time = now
+
+    def _clock(self):
+        return self.song_time
+
+    def _start_timer(self, delay, func):
+        timer = _ReplayTimer(self.song_time + delay, func)
+        self._timers.append(timer)  # Always the same delay, so they're already in order
+        return timer
+
+    def _dispatch(self, notes_obj, funcs):
+        self._events.append(MatchEvent(self.song_time, notes_obj, funcs))
+        if self.run_handlers:
+            for func in funcs:
+                try:
+                    func()
+                except Exception:
+                    logger.exception(f"Handler {func} raised an exception")
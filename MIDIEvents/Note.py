@@ -1,3 +1,4 @@
+import functools
 import logging
 import re
 
@@ -5,6 +6,8 @@ logger = logging.getLogger("MIDIEvents")
 
 
 class Note:
+    __slots__ = ("note", "octave", "midi", "pc", "freq")
+
     pitch_class_map = {  # Overflow is where octave changes
         0: 'C',
         1: 'C#',
@@ -20,9 +23,61 @@ class Note:
         11: 'B'
     }
     pitch_class_map_complement = {j: i for i, j in pitch_class_map.items()}
+    _table = ()  # Canonical Notes for MIDI 0 to 127, filled in below the class definition
+
+    def __new__(cls, *args, note_str=None, note=None, octave=None, midi=None):
+        # Fast path for the most common case, Note(60)
+        if len(args) == 1 and type(args[0]) is int and 0 <= args[0] < 128 and cls is Note:
+            return cls._table[args[0]]
+        if len(args) == 1 and type(args[0]) is str and args[0] and note_str is None and note is None and octave is None and midi is None:
+            midi = cls._parse_note_str(args[0])
+        else:
+            midi = cls._resolve_midi(*args, note_str=note_str, note=note, octave=octave, midi=midi)
+        if 0 <= midi < 128 and cls is Note:
+            return cls._table[midi]
+        logger.warning("Note created outside normal MIDI range of 0 to 127 (inclusive)")
+        return cls._build(midi)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} objects are immutable")
+
+    __delattr__ = __setattr__
+
+    def __reduce__(self):
+        return self.__class__, (self.midi,)
+
+    def __str__(self):
+        return self.note + str(self.octave)
+    
+    def __repr__(self):
+        return "Note(" + str(self) + ")"
 
-    def __init__(self, *args, note_str=None, note=None, octave=None, midi=None):
-        # Constructor pre-processing sets the same variables as passed to __init__ to let logic below finalize construction
+    def __gt__(self, other):
+        return self.midi > other.midi
+    
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return False
+        return self.midi == other.midi
+
+    def __hash__(self):
+        return hash(self.midi)
+
+    @classmethod
+    def _build(cls, midi):
+        """Create a new Note for ``midi`` without going through the canonical table"""
+        self = object.__new__(cls)
+        note, octave = cls._midi_to_note_octave(midi)
+        object.__setattr__(self, "note", note)
+        object.__setattr__(self, "octave", octave)
+        object.__setattr__(self, "midi", midi)
+        object.__setattr__(self, "pc", cls.pitch_class_map_complement[note])
+        object.__setattr__(self, "freq", round(2 ** ((midi - 69) / 12) * 440, 2))
+        return self
+
+    @classmethod
+    def _resolve_midi(cls, *args, note_str=None, note=None, octave=None, midi=None):
+        # Constructor pre-processing sets the same variables as passed to __new__ to let logic below find the MIDI number
 
         # Implicit argument mapping
         if len(args) == 1 and isinstance(args[0], str):
@@ -40,55 +95,34 @@ class Note:
             raise TypeError("Passing both keyword arguments for note/octave/midi is not supported while using positional argument note_str")
         
         if note_str:
-            match = re.match("([a-zA-Z#b]+)([0-9-]+)", note_str)
-            if not match:
-                raise ValueError("Invalid entry for note_str")
-            note = match.group(1)
-            octave = int(match.group(2))
-            logger.debug("Note created using __init__ note_str")
-
-        if note:
-            note = note.upper()
-
+            return cls._parse_note_str(note_str)
         if note is not None and octave is not None:  # From note and octave
-            if len(note) == 2 and note[-1] == "B":  # Flat, convert to sharp
-                pc = self.pitch_class_map_complement[note[0]] - 1  # Decrement pitch class
-                if pc == -1:  # Underflow
-                    note = "B"
-                    octave -= 1
-                else:
-                    note = self.pitch_class_map[pc]
-            self.note = note
-            self.octave = octave
-            self.midi = self._note_octave_to_midi(note, octave)
-            logger.debug("Note created using __init__ note and octave")
+            return cls._note_name_octave_to_midi(note, octave)
         elif midi is not None:  # From MIDI
-            self.note, self.octave = self._midi_to_note_octave(midi)
-            self.midi = midi
-            logger.debug("Note created using __init__ MIDI")
-        else:
-            raise TypeError
-        self.pc = self.pitch_class_map_complement[self.note]
-        self.freq = round(2 ** ((self.midi - 69) / 12) * 440, 2)
-        if self.midi not in range(128):
-            logger.warning("Note created outside normal MIDI range of 0 to 127 (inclusive)")
+            return midi
+        raise TypeError("Expected a note string, a MIDI number, or a note and octave")
 
-    def __str__(self):
-        return self.note + str(self.octave)
-    
-    def __repr__(self):
-        return "Note(" + str(self) + ")"
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _parse_note_str(note_str):
+        """MIDI number for a note string like "C#4".  Memoized, see ``Note._parse_note_str.cache_info()``."""
+        match = re.match("([a-zA-Z#b]+)([0-9-]+)", note_str)
+        if not match:
+            raise ValueError("Invalid entry for note_str")
+        return Note._note_name_octave_to_midi(match.group(1), int(match.group(2)))
 
-    def __gt__(self, other):
-        return self.midi > other.midi
-    
-    def __eq__(self, other):
-        if not isinstance(other, self.__class__):
-            return False
-        return self.midi == other.midi
-
-    def __hash__(self):
-        return hash(self.midi)
+    @classmethod
+    def _note_name_octave_to_midi(cls, note, octave):
+        """Like _note_octave_to_midi, but accepts lower case and flats"""
+        note = note.upper()
+        if len(note) == 2 and note[-1] == "B":  # Flat, convert to sharp
+            pc = cls.pitch_class_map_complement[note[0]] - 1  # Decrement pitch class
+            if pc == -1:  # Underflow
+                note = "B"
+                octave -= 1
+            else:
+                note = cls.pitch_class_map[pc]
+        return cls._note_octave_to_midi(note, octave)
 
     @classmethod
     def _note_octave_to_midi(cls, note, octave):
@@ -105,3 +139,6 @@ class Note:
         octave, note = divmod(m, 12)
         note = cls.pitch_class_map[note]
         return note, octave
+
+
+Note._table = tuple(Note._build(m) for m in range(128))
@@ -1,3 +1,4 @@
+import functools
 import logging
 
 from MIDIEvents import Note
@@ -33,7 +34,7 @@ class NoteList:
         return repr(self)
 
     def __hash__(self):
-        return hash(self.notes)
+        return self._hash
 
     def __eq__(self, other):
         return self.notes == other.notes
@@ -44,9 +45,17 @@ class NoteList:
 
     @notes.setter
     def notes(self, notes):
+        self._check_not_frozen()
         self._notes = tuple(sorted(notes))
+        self._hash = hash(self._notes)
+
+    def _check_not_frozen(self):
+        # Instances are shared by the parsing caches and used as dictionary keys, so notes can only be set once
+        if hasattr(self, "_hash"):
+            raise AttributeError(f"{self.__class__.__name__} objects are immutable")
 
     @classmethod
+    @functools.lru_cache(maxsize=4096)
     def from_ascii(cls, note_string):  # TODO note_string is similar to note_str in the Note class, maybe rename this?
         note_string = note_string.replace(",", "")
         return cls([Note(x) for x in note_string.split(" ")])
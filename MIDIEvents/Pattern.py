@@ -0,0 +1,207 @@
+import logging
+import re
+
+from MIDIEvents import Note, Chord, PitchClassChord, Sequence
+
+logger = logging.getLogger("MIDIEvents")
+
+_TOKEN = re.compile(r"\s*(?:(\[[^\]]*\])|([A-Ga-g][#b]?-?\d+)|(\d+)|(\{\d+(?:,\d*)?\})|([.|*+?()]))")
+_NOTE = re.compile(r"[A-Ga-g][#b]?-?\d+$")
+_PITCH_CLASS = re.compile(r"[A-Ga-g][#b]?$")
+
+
+class Pattern:
+    """
+    A pattern over key downs, written as a small regular expression.  Each key down is one event, with the note that
+    went down and the notes held down with it.
+
+    * ``C4``, ``F#3``, ``60``: a key down of that note
+    * ``[C4 Major]``, ``[C4 E4 G4]``, ``[60 64 67]``: a key down that leaves exactly that :py:class:`Chord` held
+    * ``[C Major]``, ``[C E G]``: a key down that leaves that :py:class:`PitchClassChord` held, in any voicing
+    * ``.``: any key down
+    * ``a b`` one after the other, ``a | b`` either, ``(a b)`` grouping, ``a*``, ``a+``, ``a?``, ``a{2}``, ``a{2,4}``
+      and ``a{2,}`` repetition
+
+    Like a :py:class:`Sequence`, the pattern matches on the key down that ends it, however it started.
+    """
+    max_repeat = 32  # Largest count in {m,n}, since each copy is compiled separately
+
+    def __init__(self, source):
+        self.source = source
+        self._tree = _Parser(source).parse()
+        if _nullable(self._tree):
+            raise ValueError(f"Pattern {source!r} matches no notes at all, so it would match everywhere")
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.source!r})"
+
+    def __str__(self):
+        return self.source
+
+    def __eq__(self, other):
+        if not isinstance(other, Pattern):
+            return False
+        return self.source == other.source
+
+    def __hash__(self):
+        return hash(self.source)
+
+    @classmethod
+    def from_notes_obj(cls, notes_obj):
+        """
+        The same match as a :py:class:`Chord`, :py:class:`PitchClassChord` or plain :py:class:`Sequence`.  There's no
+        :py:class:`ChordProgression`, since a pattern can't count chords the way :py:attr:`ChordProgression.maxlen` does.
+        """
+        if isinstance(notes_obj, Chord):
+            return cls(cls._chord_source(notes_obj))
+        if isinstance(notes_obj, PitchClassChord):
+            return cls(cls._pitch_class_chord_source(notes_obj))
+        if type(notes_obj) is Sequence:
+            return cls(" ".join(str(midi) for midi in notes_obj.midi))
+        raise TypeError(f"Can't make a Pattern from {notes_obj!r}")
+
+    @staticmethod
+    def _chord_source(chord):
+        return "[" + " ".join(str(note.midi) for note in chord.notes) + "]"
+
+    @staticmethod
+    def _pitch_class_chord_source(chord):
+        return "[" + " ".join(Note.pitch_class_map[pc] for pc in range(12) if chord.pitch_class_set >> pc & 1) + "]"
+
+
+def _nullable(tree):
+    op = tree[0]
+    if op == "atom":
+        return False
+    if op == "cat":
+        return all(_nullable(child) for child in tree[1])
+    if op == "alt":
+        return any(_nullable(child) for child in tree[1])
+    return op in ("star", "opt") or _nullable(tree[1])
+
+
+class _Parser:
+    """
+    Recursive descent parser into a tree of tuples: ``("atom", kind, value)`` with kind "note", "chord",
+    "pitch_class_chord" or "any", ``("cat", children)``, ``("alt", children)``, ``("star", child)``, ``("plus", child)``
+    and ``("opt", child)``
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.tokens = []
+        position = 0
+        source = source.rstrip()
+        while position < len(source):
+            match = _TOKEN.match(source, position)
+            if not match:
+                raise ValueError(f"Can't parse pattern {self.source!r} at {source[position:]!r}")
+            self.tokens.append(match)
+            position = match.end()
+        self.index = 0
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Empty pattern")
+        tree = self._alternation()
+        if self.index < len(self.tokens):
+            raise ValueError(f"Unexpected {self._peek()!r} in pattern {self.source!r}")
+        return tree
+
+    def _peek(self):
+        if self.index < len(self.tokens):
+            return self.tokens[self.index].group().strip()
+        return None
+
+    def _alternation(self):
+        options = [self._concatenation()]
+        while self._peek() == "|":
+            self.index += 1
+            options.append(self._concatenation())
+        return options[0] if len(options) == 1 else ("alt", tuple(options))
+
+    def _concatenation(self):
+        parts = []
+        while self._peek() not in (None, "|", ")"):
+            parts.append(self._repetition())
+        if not parts:
+            raise ValueError(f"Empty alternative in pattern {self.source!r}")
+        return parts[0] if len(parts) == 1 else ("cat", tuple(parts))
+
+    def _repetition(self):
+        tree = self._atom()
+        while True:
+            token = self._peek()
+            if token == "*":
+                tree = ("star", tree)
+            elif token == "+":
+                tree = ("plus", tree)
+            elif token == "?":
+                tree = ("opt", tree)
+            elif token is not None and token.startswith("{"):
+                tree = self._counted(tree, token)
+            else:
+                return tree
+            self.index += 1
+
+    def _counted(self, tree, token):
+        low, _, high = token[1:-1].partition(",")
+        low = int(low)
+        if "," not in token:
+            high = low
+        elif high:
+            high = int(high)
+        else:
+            high = None  # {m,}
+        if (high is not None and high < low) or max(low, high or 0) > Pattern.max_repeat:
+            raise ValueError(f"Bad repetition {token} in pattern {self.source!r}")
+        parts = [tree] * low
+        if high is None:
+            parts.append(("star", tree))
+        else:
+            parts.extend([("opt", tree)] * (high - low))
+        if not parts:
+            raise ValueError(f"Repetition {token} leaves nothing to match in pattern {self.source!r}")
+        return parts[0] if len(parts) == 1 else ("cat", tuple(parts))
+
+    def _atom(self):
+        if self.index >= len(self.tokens):
+            raise ValueError(f"Pattern {self.source!r} ends early")
+        match = self.tokens[self.index]
+        self.index += 1
+        chord, note, midi, _, symbol = match.groups()
+        if chord is not None:
+            return self._chord(chord[1:-1].strip())
+        if note is not None:
+            return ("atom", "note", Note(note).midi)
+        if midi is not None:
+            if not 0 <= int(midi) < 128:
+                raise ValueError(f"MIDI note {midi} out of range in pattern {self.source!r}")
+            return ("atom", "note", int(midi))
+        if symbol == ".":
+            return ("atom", "any", None)
+        if symbol == "(":
+            tree = self._alternation()
+            if self._peek() != ")":
+                raise ValueError(f"Missing ) in pattern {self.source!r}")
+            self.index += 1
+            return tree
+        raise ValueError(f"Unexpected {symbol!r} in pattern {self.source!r}")
+
+    def _chord(self, content):
+        names = content.split()
+        try:
+            if names and all(name.isdigit() for name in names):
+                return ("atom", "chord", Chord.from_midi_list([int(name) for name in names])._key)
+            if names and all(_NOTE.match(name) for name in names):
+                return ("atom", "chord", Chord.from_midi_list([Note(name).midi for name in names])._key)
+            if names and all(_PITCH_CLASS.match(name) for name in names):
+                pitch_class_set = 0
+                for name in names:
+                    pitch_class_set |= 1 << (Note(name + "4").midi % 12)
+                return ("atom", "pitch_class_chord", pitch_class_set)
+            if any(x.isdigit() for x in names[0]):  # Base note has an octave, e.g. "C4 Major"
+                return ("atom", "chord", Chord.from_ident(content)._key)
+            return ("atom", "pitch_class_chord", PitchClassChord.from_ident(content).pitch_class_set)
+        except (AssertionError, IndexError, KeyError, ValueError):
+            raise ValueError(f"Unknown chord [{content}] in pattern {self.source!r}")
@@ -0,0 +1,213 @@
+import logging
+from collections import OrderedDict
+
+from MIDIEvents.Pattern import _nullable
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class _State:
+    __slots__ = ("positions", "transitions", "outputs", "key")
+
+    def __init__(self, positions, outputs):
+        self.positions = positions  # frozenset of the atoms that matched the latest event and can go on
+        self.transitions = dict()  # Event class to _State, filled in as events come
+        self.outputs = outputs  # Keys of the patterns that ended on the latest event
+        self.key = (positions, outputs)
+
+
+class PatternMatcher:
+    """
+    Every :py:class:`Pattern` compiled into one deterministic automaton over key downs.  The patterns are turned into
+    a Glushkov automaton, one position per atom, and its sets of positions become states of a DFA the first time an
+    event reaches them, so only the states that get played are ever built.  An event is reduced to its class, the note,
+    held chord and held pitch class set that some atom tests for, and once a transition has been built, following it is
+    one lookup however many patterns there are.
+
+    Past ``max_states`` states the least recently used one is dropped, and built again if it's reached, which bounds the
+    memory of patterns whose DFA would be exponential.  Building a state steps every live position, so that's what an
+    event costs until its transition has been built.  The atoms patterns start with, before any ``|`` or repetition,
+    share their positions like a trie, so the Chords and Sequences lowered to Patterns keep about as many positions
+    live as the longest one has notes, rather than one per pattern.
+
+    A pattern matches on the key down that ends it, so a part at its start that can match nothing, like ``.*`` or
+    ``60?``, never changes where it matches.  It's left out, or it would keep a position live on every key down.
+
+    Adding and removing patterns only takes effect on :py:meth:`compile`, so many changes cost one compilation.
+    """
+
+    def __init__(self, max_states=4096):
+        self.max_states = max_states
+        self._trees = dict()  # Key to the tree of its Pattern, in the order added
+        self.compile()
+
+    def __len__(self):
+        return len(self._trees)
+
+    def __contains__(self, key):
+        return key in self._trees
+
+    def add(self, key, tree):
+        """Add the tree of a :py:class:`Pattern`.  ``key`` is returned by :py:meth:`advance` when it has just matched."""
+        if key in self._trees:
+            raise KeyError(f"{key} has already been added")
+        self._trees[key] = tree
+        self.stale = True
+
+    def remove(self, key):
+        if self._trees.pop(key, None) is not None:
+            self.stale = True
+
+    def clear(self):
+        self._trees.clear()
+        self.stale = True
+
+    def advance(self, note, held_mask, pitch_class_set):
+        """Keys of the patterns that ended on this key down"""
+        if self.stale:  # Changed without compile(), start from nothing
+            self.compile()
+        event_class = (note if note in self._notes else None,
+                       held_mask if held_mask in self._chords else None,
+                       pitch_class_set if pitch_class_set in self._pitch_class_chords else None)
+        state = self._state.transitions.get(event_class)
+        if state is None:
+            state = self._step(event_class)
+        else:
+            try:
+                self._states.move_to_end(state.key)
+            except KeyError:  # Dropped, but still reached from a state that wasn't
+                self._keep(state)
+        self._state = state
+        return state.outputs
+
+    def _step(self, event_class):
+        """Build the transition of the current state on ``event_class``"""
+        note, held_mask, pitch_class_set = event_class
+        follow = self._follow
+        first = self._first
+        matching = (("any", None), ("note", note), ("chord", held_mask), ("pitch_class_chord", pitch_class_set))
+        # A match can start on any event, so the first positions are always tried.  There are a lot, so they're looked up.
+        positions = set()
+        for atom in matching:
+            positions.update(first.get(atom, ()))
+        for p in self._state.positions:
+            after = follow[p]
+            for atom in matching:
+                if atom in after:
+                    positions.update(after[atom])
+        last = self._last
+        order = self._order
+        outputs = tuple(sorted({key for p in positions if p in last for key in last[p]}, key=order.__getitem__))
+        positions = frozenset(positions)
+        state = self._states.get((positions, outputs))
+        if state is None:
+            state = _State(positions, outputs)
+            self._keep(state)
+        else:
+            self._states.move_to_end(state.key)
+        self._state.transitions[event_class] = state
+        return state
+
+    def _keep(self, state):
+        """Add ``state`` to the built ones, dropping the least recently used past ``max_states``"""
+        states = self._states
+        states[state.key] = state
+        if len(states) > self.max_states:
+            _, dropped = states.popitem(last=False)
+            dropped.transitions.clear()  # Other states can still reach it, but it doesn't keep more alive
+
+    def compile(self, recent_events=()):
+        """
+        Compile every pattern, then replay the recent ``(note, held_mask, pitch_class_set)`` events to get back to the
+        current state
+        """
+        self.stale = False
+        self._atoms = []  # Position to (kind, value)
+        self._follow = []  # Position to the positions that can come after it, by atom once compiled
+        first = set()  # Positions any pattern can start with
+        self._last = dict()  # Position that can end a pattern to the keys it ends
+        self._order = dict()  # Key to when it was added, so matches come out in that order
+        trie = dict()  # (Previous position or None, atom) to the position shared by patterns that are runs of atoms
+        for key, tree in self._trees.items():
+            self._order[key] = len(self._order)
+            while tree[0] == "cat" and _nullable(tree[1][0]):  # Doesn't change where it matches, see the class
+                children = tree[1][1:]
+                tree = children[0] if len(children) == 1 else ("cat", children)
+            children = (tree,) if tree[0] == "atom" else tree[1] if tree[0] == "cat" else ()
+            run = 0  # The atoms it starts with go in the trie
+            while run < len(children) and children[run][0] == "atom":
+                run += 1
+            if run:
+                p = None
+                for child in children[:run]:
+                    q = trie.get((p, child))
+                    if q is None:
+                        q = trie[p, child] = len(self._atoms)
+                        self._atoms.append(child[1:])
+                        self._follow.append(set())
+                        if p is None:
+                            first.add(q)
+                        else:
+                            self._follow[p].add(q)
+                    p = q
+                last = {p}
+                rest = children[run:]
+                if rest:
+                    nullable, rest_first, last = self._compile(rest[0] if len(rest) == 1 else ("cat", rest))
+                    self._follow[p] |= rest_first
+                    if nullable:
+                        last = last | {p}
+            else:
+                _, pattern_first, last = self._compile(tree)
+                first |= pattern_first
+            for p in last:
+                self._last.setdefault(p, []).append(key)
+        self._first = dict()  # Atom to the first positions with it
+        for p in sorted(first):
+            self._first.setdefault(self._atoms[p], []).append(p)
+        for p, follow in enumerate(self._follow):  # Atom to the positions after p with it, since a trie node has many
+            after = dict()
+            for q in sorted(follow):
+                after.setdefault(self._atoms[q], []).append(q)
+            self._follow[p] = after
+        self._notes = frozenset(value for kind, value in self._atoms if kind == "note")
+        self._chords = frozenset(value for kind, value in self._atoms if kind == "chord")
+        self._pitch_class_chords = frozenset(value for kind, value in self._atoms if kind == "pitch_class_chord")
+        self._state = _State(frozenset(), ())
+        self._states = OrderedDict()  # (positions, outputs) to its _State, least recently used first
+        self._keep(self._state)
+        for note, held_mask, pitch_class_set in recent_events:
+            self.advance(note, held_mask, pitch_class_set)
+
+    def _compile(self, tree):
+        """Add the positions of ``tree``, and return whether it matches nothing, its first and its last positions"""
+        op = tree[0]
+        if op == "atom":
+            p = len(self._atoms)
+            self._atoms.append(tree[1:])
+            self._follow.append(set())
+            return False, {p}, {p}
+        if op == "cat":
+            nullable, first, last = self._compile(tree[1][0])
+            for child in tree[1][1:]:
+                child_nullable, child_first, child_last = self._compile(child)
+                for p in last:
+                    self._follow[p] |= child_first
+                if nullable:
+                    first = first | child_first
+                last = last | child_last if child_nullable else child_last
+                nullable = nullable and child_nullable
+            return nullable, first, last
+        if op == "alt":
+            nullable, first, last = False, set(), set()
+            for child in tree[1]:
+                child_nullable, child_first, child_last = self._compile(child)
+                nullable = nullable or child_nullable
+                first |= child_first
+                last |= child_last
+            return nullable, first, last
+        nullable, first, last = self._compile(tree[1])
+        if op in ("star", "plus"):
+            for p in last:
+                self._follow[p] |= first
+        return nullable or op in ("star", "opt"), first, last
@@ -0,0 +1,58 @@
+import logging
+
+from MIDIEvents import Note, Chord
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class PitchClassChord:
+    """A chord without octaves or voicing, e.g. "C Major".  Equal to any other with the same set of pitch classes."""
+
+    def __init__(self, root, chord_name):
+        if isinstance(root, str):
+            try:
+                root = Note(root, 4).pc
+            except KeyError:
+                raise ValueError(f"Invalid pitch class '{root}'")
+        self.root = root % 12
+        self.name = chord_name
+        self.pitch_class_set = Chord._pitch_class_set_from_semitones(Chord._get_semitones_from_chord_name(chord_name), self.root)
+
+    def __str__(self):
+        if self.name is None:
+            return " ".join(Note.pitch_class_map[pc] for pc in range(12) if self.pitch_class_set >> pc & 1)
+        return Note.pitch_class_map[self.root] + " " + self.name
+
+    def __repr__(self):
+        return self.__class__.__name__ + "(" + str(self) + ")"
+
+    def __eq__(self, other):
+        if not isinstance(other, PitchClassChord):
+            return False
+        return self.pitch_class_set == other.pitch_class_set
+
+    def __hash__(self):
+        return hash(self.pitch_class_set)
+
+    def identify(self):
+        return [Note.pitch_class_map[root] + " " + name for root, name in Chord._get_pitch_class_table()[self.pitch_class_set]]
+
+    @classmethod
+    def from_ident(cls, ident_chord_name):
+        root, *chord_name = ident_chord_name.split(" ")
+        assert chord_name, "No chord name detected, make sure there's a space in ident_chord_name."
+        return cls(root, " ".join(chord_name).strip())
+
+    @classmethod
+    def from_pitch_class_set(cls, pitch_class_set):
+        if not 0 <= pitch_class_set < 4096:
+            raise ValueError("Pitch class sets are 12 bit integers")
+        obj = cls.__new__(cls)
+        obj.pitch_class_set = pitch_class_set
+        obj.root = None
+        obj.name = None
+        return obj
+
+    @classmethod
+    def from_chord(cls, chord_obj):
+        return cls.from_pitch_class_set(chord_obj.pitch_class_set)
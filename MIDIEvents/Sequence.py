@@ -21,8 +21,26 @@ class Sequence(NoteList):
             other = Sequence(notes)
         if isinstance(other, tuple):
             other = Sequence(other)
-        if isinstance(other, self.__class__) or issubclass(self.__class__, other.__class__):  # Needs to be last
+        if isinstance(other, Sequence):
             return self.notes == other.notes
+        if issubclass(self.__class__, other.__class__):  # Plain NoteList, which keeps its notes sorted
+            return tuple(sorted(self.notes)) == other.notes
         return False
 
     __hash__ = NoteList.__hash__
+
+    @property
+    def notes(self):
+        return self._notes
+
+    @notes.setter
+    def notes(self, notes):
+        # Unlike the other note lists, the order is kept
+        self._check_not_frozen()
+        self._notes = tuple(notes)
+        self._hash = hash(self._notes)
+
+    @property
+    def midi(self):
+        """Tuple of the MIDI numbers of the notes, in order"""
+        return tuple(note.midi for note in self._notes)
@@ -0,0 +1,125 @@
+import logging
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class _Node:
+    __slots__ = ("parent", "note", "children", "keys", "generation", "fail", "transitions", "outputs")
+
+    def __init__(self, parent, note):
+        self.parent = parent
+        self.note = note
+        self.children = dict()  # MIDI note to _Node, the trie itself
+        self.keys = list()  # Keys of the patterns ending at this node
+        self.generation = -1  # Everything below here is derived from the trie, and recomputed when this is stale
+        self.fail = None
+        self.transitions = dict()
+        self.outputs = None
+
+
+class SequenceMatcher:
+    """
+    Aho-Corasick automaton over MIDI note numbers.  Every pattern is matched with one transition per note, no matter how
+    many patterns there are.  The failure links, transitions and outputs are computed lazily and cached on each node.
+    Adding or removing a pattern only edits the trie and invalidates those caches.
+    """
+
+    def __init__(self):
+        self.root = _Node(None, None)
+        self.state = self.root
+        self._generation = 0
+        self._nodes_by_key = dict()
+
+    def __len__(self):
+        return len(self._nodes_by_key)
+
+    def __contains__(self, key):
+        return key in self._nodes_by_key
+
+    def add(self, key, notes, recent_notes=()):
+        """
+        Add a pattern.  ``key`` is returned by :py:meth:`advance` when ``notes`` has just been played.  Passing the
+        recently played notes keeps the current state correct.
+        """
+        notes = tuple(notes)
+        if key in self._nodes_by_key:
+            raise KeyError(f"{key} has already been added")
+        if not notes:  # Can't end on any particular note, so it never matches
+            return
+        node = self.root
+        for note in notes:
+            child = node.children.get(note)
+            if child is None:
+                child = node.children[note] = _Node(node, note)
+            node = child
+        node.keys.append(key)
+        self._nodes_by_key[key] = node
+        self._invalidate(recent_notes)
+
+    def remove(self, key, recent_notes=()):
+        node = self._nodes_by_key.pop(key, None)
+        if node is None:
+            return
+        node.keys.remove(key)
+        while node is not self.root and not node.keys and not node.children:  # Prune branches nothing ends on
+            del node.parent.children[node.note]
+            node = node.parent
+        self._invalidate(recent_notes)
+
+    def clear(self):
+        self.root = _Node(None, None)
+        self.state = self.root
+        self._nodes_by_key = dict()
+        self._generation += 1
+
+    def advance(self, note):
+        """Move to the next state and return a tuple of the keys of every pattern that ends with this note"""
+        state = self.state
+        next_state = state.transitions.get(note) if state.generation == self._generation else None
+        if next_state is None:
+            next_state = self._transition(state, note)
+        self.state = next_state
+        outputs = next_state.outputs if next_state.generation == self._generation else None
+        if outputs is None:
+            outputs = self._outputs(next_state)
+        return outputs
+
+    def _invalidate(self, recent_notes):
+        self._generation += 1
+        self.state = self.root
+        for note in recent_notes:
+            self.advance(note)
+
+    def _refresh(self, node):
+        node.generation = self._generation
+        node.fail = None
+        node.transitions = dict()
+        node.outputs = None
+
+    def _fail(self, node):
+        if node.generation != self._generation:
+            self._refresh(node)
+        if node.fail is None:
+            if node is self.root or node.parent is self.root:
+                node.fail = self.root
+            else:
+                node.fail = self._transition(self._fail(node.parent), node.note)
+        return node.fail
+
+    def _transition(self, node, note):
+        if node.generation != self._generation:
+            self._refresh(node)
+        next_node = node.transitions.get(note)
+        if next_node is None:
+            next_node = node.children.get(note)
+            if next_node is None:
+                next_node = self.root if node is self.root else self._transition(self._fail(node), note)
+            node.transitions[note] = next_node
+        return next_node
+
+    def _outputs(self, node):
+        if node.generation != self._generation:
+            self._refresh(node)
+        if node.outputs is None:
+            node.outputs = tuple(node.keys) + (() if node is self.root else self._outputs(self._fail(node)))
+        return node.outputs
@@ -0,0 +1,34 @@
+import logging
+
+from MIDIEvents import Sequence
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class TimedSequence(Sequence):
+    """
+    A :py:class:`Sequence` that only matches when each note comes within ``max_gap`` seconds of the one before, and the
+    whole of it within ``max_duration`` seconds.  Either limit can be ``None``.
+    """
+
+    def __init__(self, *args, max_gap=None, max_duration=None):
+        super().__init__(*args)
+        if max_gap is None and max_duration is None:
+            raise ValueError("TimedSequences need a max_gap, a max_duration or both")
+        if (max_gap is not None and max_gap < 0) or (max_duration is not None and max_duration < 0):
+            raise ValueError("max_gap and max_duration can't be negative")
+        self.max_gap = max_gap
+        self.max_duration = max_duration
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}({', '.join(str(x) for x in self.notes)}, max_gap={self.max_gap}, "
+                f"max_duration={self.max_duration})")
+
+    def __eq__(self, other):
+        if not isinstance(other, TimedSequence):
+            return False
+        return (self.notes == other.notes and self.max_gap == other.max_gap
+                and self.max_duration == other.max_duration)
+
+    def __hash__(self):
+        return hash((self._hash, self.max_gap, self.max_duration))
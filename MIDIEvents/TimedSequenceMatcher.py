@@ -0,0 +1,124 @@
+import logging
+
+logger = logging.getLogger("MIDIEvents")
+
+_UNLIMITED = float("inf")
+
+
+class _Node:
+    __slots__ = ("parent", "note", "children", "keys", "max_gap", "max_duration")
+
+    def __init__(self, parent, note):
+        self.parent = parent
+        self.note = note
+        self.children = dict()  # MIDI note to _Node, the trie itself
+        self.keys = dict()  # Keys of the patterns ending at this node, to their (max_gap, max_duration)
+        # Loosest limits of the patterns through this node, past which a partial match here can't finish
+        self.max_gap = 0
+        self.max_duration = 0
+
+
+class TimedSequenceMatcher:
+    """
+    Trie of patterns with limits on the time between notes and overall.  A partial match is a node, when it started and
+    its widest gap so far, and it's dropped on the note where no pattern through it allows that gap or duration any
+    more.  Partial matches at the same node would have started on the same note, so there are never more of them than
+    notes in the longest pattern, and a note costs the same however many patterns there are.
+    """
+
+    def __init__(self):
+        self.root = _Node(None, None)
+        self._nodes_by_key = dict()
+        self._partials = []  # (node, start time, widest gap)
+        self._last_time = None
+
+    def __len__(self):
+        return len(self._nodes_by_key)
+
+    def __contains__(self, key):
+        return key in self._nodes_by_key
+
+    def add(self, key, notes, max_gap=None, max_duration=None, recent=()):
+        """
+        Add a pattern.  ``key`` is returned by :py:meth:`advance` when ``notes`` has just been played within the limits,
+        in seconds.  ``None`` is no limit.  Passing the recently played (note, time) pairs keeps the partial matches
+        correct, so the pattern can finish on the next note.
+        """
+        notes = tuple(notes)
+        if key in self._nodes_by_key:
+            raise KeyError(f"{key} has already been added")
+        if not notes:  # Can't end on any particular note, so it never matches
+            return
+        max_gap = _UNLIMITED if max_gap is None else max_gap
+        max_duration = _UNLIMITED if max_duration is None else max_duration
+        node = self.root
+        for note in notes:
+            child = node.children.get(note)
+            if child is None:
+                child = node.children[note] = _Node(node, note)
+            child.max_gap = max(child.max_gap, max_gap)
+            child.max_duration = max(child.max_duration, max_duration)
+            node = child
+        node.keys[key] = (max_gap, max_duration)
+        self._nodes_by_key[key] = node
+        if recent:
+            self._replay(recent)
+
+    def remove(self, key):
+        node = self._nodes_by_key.pop(key, None)
+        if node is None:
+            return
+        del node.keys[key]
+        while node is not self.root and not node.keys and not node.children:  # Prune branches nothing ends on
+            del node.parent.children[node.note]
+            node = node.parent
+        while node is not self.root:  # The limits left are those of the patterns still through here
+            limits = list(node.keys.values()) + [(child.max_gap, child.max_duration) for child in node.children.values()]
+            node.max_gap = max(gap for gap, _ in limits)
+            node.max_duration = max(duration for _, duration in limits)
+            node = node.parent
+
+    def clear(self):
+        self.root = _Node(None, None)
+        self._nodes_by_key = dict()
+        self._partials = []
+        self._last_time = None
+
+    def advance(self, note, time):
+        """Keys of every pattern that ends with this note, played within its limits.  ``time`` is in seconds."""
+        gap = 0 if self._last_time is None else time - self._last_time
+        self._last_time = time
+        matches = ()
+        partials = []
+        for node, start, widest in self._partials:
+            child = node.children.get(note)
+            if child is None:
+                continue
+            if gap > widest:
+                widest = gap
+            if widest > child.max_gap or time - start > child.max_duration:  # Too slow for everything through here
+                continue
+            if child.keys:
+                matches += self._completed(child, widest, time - start)
+            if child.children:
+                partials.append((child, start, widest))
+        child = self.root.children.get(note)
+        if child is not None:
+            if child.keys:
+                matches += self._completed(child, 0, 0)
+            if child.children:
+                partials.append((child, time, 0))
+        self._partials = partials
+        return matches
+
+    def _replay(self, recent):
+        """Rebuild the partial matches from the notes played before, ignoring what they matched"""
+        self._partials = []
+        self._last_time = None
+        for note, time in recent:
+            self.advance(note, time)
+
+    @staticmethod
+    def _completed(node, widest, duration):
+        return tuple(key for key, (max_gap, max_duration) in node.keys.items()
+                     if widest <= max_gap and duration <= max_duration)
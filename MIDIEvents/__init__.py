@@ -8,17 +8,39 @@ from MIDIEvents.LoopbackPort import LoopbackPort
 from MIDIEvents.Note import Note
 from MIDIEvents.NoteList import NoteList
 from MIDIEvents.Chord import Chord
+from MIDIEvents.PitchClassChord import PitchClassChord
 from MIDIEvents.Sequence import Sequence
+from MIDIEvents.FuzzySequence import FuzzySequence
+from MIDIEvents.IntervalSequence import IntervalSequence
+from MIDIEvents.TimedSequence import TimedSequence
 from MIDIEvents.ChordProgression import ChordProgression
+from MIDIEvents.Pattern import Pattern
+from MIDIEvents.HandlerExecutor import HandlerExecutor
+from MIDIEvents.LatencyHistogram import LatencyHistogram
+from MIDIEvents.Instrumentation import Instrumentation
+from MIDIEvents.EventHistory import EventHistory
 from MIDIEvents.MIDIEventLoop import MIDIEventLoop
+from MIDIEvents.AsyncMIDIEventLoop import AsyncMIDIEventLoop
+from MIDIEvents.MIDIFileReplay import MIDIFileReplay
 
 __all__ = [
     "Note",
     "NoteList",
     "Chord",
+    "PitchClassChord",
     "Sequence",
+    "FuzzySequence",
+    "IntervalSequence",
+    "TimedSequence",
     "ChordProgression",
+    "Pattern",
     "MIDIEventLoop",
+    "AsyncMIDIEventLoop",
+    "MIDIFileReplay",
+    "HandlerExecutor",
+    "Instrumentation",
+    "LatencyHistogram",
+    "EventHistory",
     "LoopbackPort"
 ]
 
@@ -27,6 +49,21 @@ def callbacks_supported():
     return mido.backend.name in ["mido.backends.rtmidi", "mido.backends.rtmidi_python"]
 
 
+def parse_cache_info():
+    """Hit and miss statistics for the memoized string parsers, as ``functools.lru_cache`` ``CacheInfo`` tuples"""
+    return {
+        "Note": Note._parse_note_str.cache_info(),
+        "NoteList.from_ascii": NoteList.from_ascii.cache_info(),
+        "Chord.from_ident": Chord.from_ident.cache_info(),
+    }
+
+
+def parse_cache_clear():
+    Note._parse_note_str.cache_clear()
+    NoteList.from_ascii.cache_clear()
+    Chord.from_ident.cache_clear()
+
+
 logger = logging.getLogger("MIDIEvents")
 mido.set_backend()  # environment var MIDO_BACKEND or default.  Unloaded
 logger.debug(f"Using backend '{mido.backend.name}' from either default or environment variable.  Backend {'supports' if callbacks_supported() else 'does not support'} callbacks.")
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import threading
+import unittest
+import unittest.mock
+
+import mido
+
+from MIDIEvents import AsyncMIDIEventLoop, Chord, LoopbackPort, Sequence
+
+logger = logging.getLogger("MIDIEvents")
+logger.setLevel(logging.ERROR)
+
+
+def send_notes(loopback, notes):
+    for note in notes:
+        loopback.send(mido.Message("note_on", note=note))
+    for note in notes:
+        loopback.send(mido.Message("note_off", note=note))
+
+
+class AsyncMIDIEventLoop_base_tests:
+    """To be inherited from.  Override ``setUp``"""
+
+    async def run_until(self, condition, timeout=1):
+        task = self.MEL.start()
+        try:
+            for _ in range(int(timeout / 0.005)):
+                if condition():
+                    break
+                await asyncio.sleep(0.005)
+        finally:
+            self.MEL.stop()
+            await task
+
+    def test_coroutine_handler(self):
+        calls = []
+
+        @self.MEL.on_notes("C4 Major")
+        async def sub():
+            await asyncio.sleep(0)
+            calls.append(asyncio.current_task())
+
+        async def main():
+            send_notes(self.loopback, [60, 64, 67])
+            await self.run_until(lambda: calls)
+
+        asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertIsNotNone(calls[0])  # Ran as a task on the event loop
+
+    def test_sync_handler(self):
+        mock = unittest.mock.Mock()
+        self.MEL.add_handler(mock, Sequence.from_midi_list([1, 2, 3]))
+
+        async def main():
+            send_notes(self.loopback, [1])
+            send_notes(self.loopback, [2])
+            send_notes(self.loopback, [3])
+            await self.run_until(lambda: mock.called)
+
+        asyncio.run(main())
+        mock.assert_called_once()
+
+    def test_max_concurrent_handlers(self):
+        MEL = AsyncMIDIEventLoop(port=self.loopback, max_concurrent_handlers=2)
+        active = []
+        peak = []
+
+        async def main():
+            async def handler():
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.pop()
+
+            for i in range(10):
+                MEL.add_handler(handler, Chord.from_midi_list([60]))
+            send_notes(self.loopback, [60])
+            task = MEL.start()
+            for _ in range(200):
+                if len(peak) == 10:
+                    break
+                await asyncio.sleep(0.005)
+            MEL.stop()
+            await task
+
+        asyncio.run(main())
+        self.assertEqual(len(peak), 10)
+        self.assertEqual(max(peak), 2)
+
+    def test_handler_exception(self):
+        async def handler():
+            raise ValueError
+
+        self.MEL.add_handler(handler, Chord.from_midi_list([60]))
+
+        async def main():
+            send_notes(self.loopback, [60])
+            await self.run_until(lambda: False, timeout=0.05)
+
+        with self.assertLogs(logger=logger, level="ERROR"):
+            asyncio.run(main())
+
+    def test_instrumented_coroutine_handler(self):
+        MEL = AsyncMIDIEventLoop(port=self.loopback, instrument=True)
+        calls = []
+
+        @MEL.on_notes("C4 Major")
+        async def sub():
+            calls.append(1)
+
+        async def main():
+            send_notes(self.loopback, [60, 64, 67])
+            task = MEL.start()
+            for _ in range(200):
+                if calls:
+                    break
+                await asyncio.sleep(0.005)
+            MEL.stop()
+            await task
+
+        asyncio.run(main())
+        self.assertEqual(calls, [1])
+        self.assertEqual(MEL.stats()["latency"]["handler_start"]["count"], 1)
+
+    def test_batch(self):
+        MEL = AsyncMIDIEventLoop(port=self.loopback, batch=True, batch_window=0.01)
+        calls = []
+
+        @MEL.on_notes("C4 Major")
+        async def sub():
+            calls.append(1)
+
+        async def main():
+            task = MEL.start()
+            await asyncio.sleep(0.01)
+            send_notes(self.loopback, [60, 64, 67])
+            for _ in range(200):
+                if calls:
+                    break
+                await asyncio.sleep(0.005)
+            MEL.stop()
+            await task
+
+        asyncio.run(main())
+        self.assertEqual(calls, [1])
+        self.assertEqual(MEL.stats()["batch"]["chord_checks"], 1)
+
+    def test_chord_window(self):
+        MEL = AsyncMIDIEventLoop(port=self.loopback, chord_window=50)
+        calls = []
+
+        @MEL.on_notes("C4 Major")
+        async def sub():
+            calls.append(asyncio.current_task())
+
+        async def main():
+            task = MEL.start()
+            for note in (60, 64, 67):
+                self.loopback.send(mido.Message("note_on", note=note))
+                await asyncio.sleep(0.002)
+            for _ in range(200):
+                if calls:
+                    break
+                await asyncio.sleep(0.005)
+            MEL.stop()
+            await task
+
+        asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(MEL.stats()["chord_window"]["groups"], 1)
+
+    def test_inline_handler(self):
+        threads = []
+        self.MEL.add_handler(lambda: threads.append(threading.current_thread()), Chord.from_midi_list([60]), inline=True)
+
+        async def main():
+            send_notes(self.loopback, [60])
+            await self.run_until(lambda: threads)
+
+        asyncio.run(main())
+        self.assertEqual(threads, [threading.current_thread()])  # Ran on the event loop
+
+    def test_run_twice(self):
+        async def main():
+            task = self.MEL.start()
+            await asyncio.sleep(0)
+            with self.assertRaises(RuntimeError):
+                await self.MEL.run()
+            self.MEL.stop()
+            await task
+
+        asyncio.run(main())
+
+    def test_start_blocking(self):
+        async def main():
+            with self.assertRaises(ValueError):
+                self.MEL.start(blocking=True)
+
+        asyncio.run(main())
+
+
+class TestAsyncMIDIEventLoop_callbacks(unittest.TestCase, AsyncMIDIEventLoop_base_tests):
+    def setUp(self):
+        patcher = unittest.mock.patch("MIDIEvents.callbacks_supported", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.loopback = LoopbackPort()
+        self.MEL = AsyncMIDIEventLoop(port=self.loopback)
+
+
+class TestAsyncMIDIEventLoop_polling(unittest.TestCase, AsyncMIDIEventLoop_base_tests):
+    def setUp(self):
+        patcher = unittest.mock.patch("MIDIEvents.callbacks_supported", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.loopback = LoopbackPort()
+        self.MEL = AsyncMIDIEventLoop(port=self.loopback)
@@ -28,6 +28,43 @@ class TestChord(unittest.TestCase):
         c2 = Chord()
         self.assertEqual(c2.identify(), None)
 
+    def test_identify_matches_linear_search(self):
+        for chord in Chord.chords:
+            for semitones in chord["semitones"]:
+                c1 = Chord.from_midi_list([40 + x for x in semitones])
+                expected = [
+                    str(c1.notes[0]) + " " + other["name"]
+                    for other in Chord.chords
+                    for other_semitones in other["semitones"]
+                    if other_semitones == c1._get_semitones()
+                ]
+                self.assertEqual(c1.identify(), expected)
+
+    def test_identify_invariant(self):
+        self.assertIn("C Major", Chord.from_ascii("E3 G3 C5").identify(invariant=True))
+        self.assertNotIn("E3 Major", Chord.from_ascii("E3 G3 C5").identify())
+        self.assertIn("A Major", Chord.from_ascii("A2 A3 C#4 E5").identify(invariant=True))
+
+    def test_pitch_class_set(self):
+        self.assertEqual(Chord.from_ident("C4 Major").pitch_class_set, 0b10010001)
+        self.assertEqual(Chord.from_ascii("C2 E5 G7 C8").pitch_class_set, 0b10010001)
+        self.assertEqual(Chord().pitch_class_set, 0)
+
+    def test_pitch_class_table(self):
+        table = Chord._get_pitch_class_table()
+        self.assertEqual(len(table), 4096)
+        self.assertIn((0, "Major"), table[0b10010001])
+        self.assertIn((9, "Minor seventh"), table[0b10010001 | (1 << 9)])
+
+    def test_identify_many(self):
+        c1 = Chord.from_ident("A4 Major")
+        c2 = Chord.from_ident("C4 Minor")
+        c3 = Chord.from_midi_list([1, 2])
+        self.assertEqual(Chord.identify_many([c1, c2, c1, Chord(), c3]), [c1.identify(), c2.identify(), c1.identify(), None, []])
+        results = Chord.identify_many([c1, c1])
+        self.assertIsNot(results[0], results[1])  # Callers get their own lists
+        self.assertEqual(Chord.identify_many([c1], invariant=True), [c1.identify(invariant=True)])
+
     def test_get_semitones(self):
         c1 = Chord.from_ident("A4 Major")
         self.assertEqual(c1._get_semitones(), [0, 4, 7])
@@ -43,6 +80,14 @@ class TestChord(unittest.TestCase):
         with self.assertRaises(ValueError):  # This is a different error message in _get_semitones_from_chord_name
             Chord.from_ident("A4 test")
 
+    def test_from_ident_cached(self):
+        Chord.from_ident.cache_clear()
+        c1 = Chord.from_ident("A4 Major")
+        self.assertIs(Chord.from_ident("A4 Major"), c1)
+        self.assertEqual(Chord.from_ident.cache_info().hits, 1)
+        with self.assertRaises(AttributeError):
+            c1.notes = (Note(1),)
+
     def test_from_note_chord(self):
         c1 = Chord(Note(69), Note(73), Note(76))
         c2 = Chord.from_note_chord(Note(69), "Major")
@@ -57,5 +102,47 @@ class TestChord(unittest.TestCase):
 
     def test_hash(self):
         c1 = Chord(Note(69), Note(73), Note(76))
-        self.assertEqual(hash(c1), 643362958232848345)
+        c2 = Chord.from_midi_list([76, 69, 73])
+        self.assertEqual(hash(c1), hash(c2))
+        self.assertEqual(hash(c1), hash(c1.mask))
         self.assertEqual(Chord.__hash__, NoteList.__hash__)
+
+    def test_mask(self):
+        c1 = Chord(Note(69), Note(73), Note(76))
+        self.assertEqual(c1.mask, (1 << 69) | (1 << 73) | (1 << 76))
+        self.assertEqual(c1.multiplicity, {})
+        self.assertEqual(Chord().mask, 0)
+
+    def test_from_mask(self):
+        c1 = Chord.from_mask((1 << 69) | (1 << 73) | (1 << 76))
+        self.assertIsNone(c1._notes)  # Notes are only built when needed
+        self.assertEqual(c1.notes, (Note(69), Note(73), Note(76)))
+        self.assertEqual(c1, Chord.from_ident("A4 Major"))
+        with self.assertRaises(ValueError):
+            Chord.from_mask(-1)
+
+    def test_doubled_notes(self):
+        c1 = Chord(Note(69), Note(69), Note(73))
+        c2 = Chord(Note(69), Note(73))
+        self.assertEqual(c1.multiplicity, {69: 2})
+        self.assertEqual(c1.notes, (Note(69), Note(69), Note(73)))
+        self.assertNotEqual(c1, c2)
+        self.assertEqual(c1, Chord.from_midi_list([73, 69, 69]))
+        self.assertEqual(c1, Chord.from_mask(c2.mask, {69: 2}))
+
+    def test_from_mask_multiplicity(self):
+        c1 = Chord.from_mask(1 << 60, {60: 1})
+        self.assertEqual(c1, Chord.from_midi_list([60]))
+        self.assertEqual(hash(c1), hash(Chord.from_midi_list([60])))
+        self.assertEqual(c1.multiplicity, {})
+        with self.assertRaises(ValueError):
+            Chord.from_mask(1 << 60, {62: 2})
+
+    def test_issubset(self):
+        c1 = Chord.from_ident("A4 Major")
+        c2 = Chord.from_ident("A4 Major seventh")
+        self.assertTrue(c1.issubset(c2))
+        self.assertFalse(c2.issubset(c1))
+        self.assertTrue(c1.issubset(c1))
+        self.assertFalse(Chord.from_midi_list([69, 69]).issubset(Chord.from_midi_list([69])))
+        self.assertTrue(Chord.from_midi_list([69]).issubset(Chord.from_midi_list([69, 69])))
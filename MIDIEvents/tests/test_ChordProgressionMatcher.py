@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+from MIDIEvents import Chord, PitchClassChord
+from MIDIEvents.ChordProgressionMatcher import ChordProgressionMatcher
+
+
+class TestChordProgressionMatcher(TestCase):
+    def test_advance(self):
+        cpm = ChordProgressionMatcher(32)
+        cpm.add("abc", "abc")
+        cpm.add("bc", "bc")
+        self.assertEqual(cpm.advance("a"), ())
+        self.assertEqual(cpm.advance("b"), ())
+        self.assertEqual(set(cpm.advance("c")), {"abc", "bc"})
+
+    def test_chords_between(self):
+        cpm = ChordProgressionMatcher(32)
+        cpm.add("abc", "abc")
+        for chord in "axbyyb":
+            self.assertEqual(cpm.advance(chord), ())
+        self.assertEqual(cpm.advance("c"), ("abc",))
+
+    def test_completions_dont_overlap(self):
+        cpm = ChordProgressionMatcher(32)
+        cpm.add("ab", "ab")
+        self.assertEqual([cpm.advance(chord) for chord in "abbab"], [(), ("ab",), (), (), ("ab",)])
+        cpm = ChordProgressionMatcher(32)
+        cpm.add("aa", "aa")
+        self.assertEqual([cpm.advance(chord) for chord in "aaaa"], [(), ("aa",), (), ("aa",)])
+
+    def test_window(self):
+        cpm = ChordProgressionMatcher(4)
+        cpm.add("ab", "ab")
+        for chord in "axx":
+            cpm.advance(chord)
+        self.assertEqual(cpm.advance("b"), ("ab",))  # a, x, x, b fits in 4
+        for chord in "axxx":
+            cpm.advance(chord)
+        self.assertEqual(cpm.advance("b"), ())  # a, x, x, x, b doesn't
+        self.assertFalse(cpm.active)
+
+    def test_add_remove(self):
+        cpm = ChordProgressionMatcher(32)
+        cpm.add("ab", "ab")
+        self.assertIn("ab", cpm)
+        with self.assertRaises(KeyError):
+            cpm.add("ab", "ab")
+        cpm.advance("a")
+        cpm.remove("ab")
+        self.assertNotIn("ab", cpm)
+        self.assertEqual(cpm.root.children, {})
+        self.assertEqual(cpm.advance("b"), ())
+        cpm.add("empty", "")
+        self.assertEqual(len(cpm), 0)
+        cpm.remove("missing")
+
+    def test_shared_prefix(self):
+        cpm = ChordProgressionMatcher(32)
+        cpm.add("abc", "abc")
+        cpm.add("abd", "abd")
+        cpm.add("abc2", "abc")
+        for chord in "ab":
+            cpm.advance(chord)
+        self.assertEqual(set(cpm.advance("c")), {"abc", "abc2"})
+        self.assertEqual(cpm.advance("d"), ("abd",))
+
+    def test_clear(self):
+        cpm = ChordProgressionMatcher(32)
+        cpm.add("ab", "ab")
+        cpm.advance("a")
+        cpm.clear()
+        self.assertFalse(cpm)
+        self.assertEqual(cpm.advance("b"), ())
+
+    def test_pitch_class_chords(self):
+        cpm = ChordProgressionMatcher(32)
+        c4 = Chord.from_ident("C4 Major")
+        g = PitchClassChord.from_ident("G Major")
+        cpm.add("C4 G", [ChordProgressionMatcher.chord_key(c4), ChordProgressionMatcher.chord_key(g)])
+        g3 = Chord.from_ident("G3 Major")
+        self.assertEqual(cpm.advance(c4._key, c4.pitch_class_set), ())
+        self.assertEqual(cpm.advance(g3._key, g3.pitch_class_set), ("C4 G",))
+        self.assertEqual(cpm.advance(c4._key), ())
+        self.assertEqual(cpm.advance(g3._key), ())  # Without the pitch class set only exact chords match
+        with self.assertRaises(TypeError):
+            ChordProgressionMatcher.chord_key("C4 Major")
@@ -0,0 +1,83 @@
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+from MIDIEvents import Chord
+from MIDIEvents.ChordVocabulary import ChordVocabulary
+
+
+class TestChordVocabulary(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        cache_path = os.path.join(self.tmp_dir.name, "chords.pickle")
+        self.cache_patch = unittest.mock.patch.object(ChordVocabulary, "cache_path", cache_path)
+        self.cache_patch.start()
+        ChordVocabulary.clear()
+
+    def tearDown(self):
+        self.cache_patch.stop()
+        ChordVocabulary.clear()
+        self.tmp_dir.cleanup()
+
+    def test_not_loaded_on_import(self):
+        code = "import MIDIEvents; from MIDIEvents.ChordVocabulary import ChordVocabulary; print(ChordVocabulary._loaded)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "None")
+
+    def test_load_writes_cache(self):
+        self.assertFalse(os.path.exists(ChordVocabulary.cache_path))
+        vocabulary = ChordVocabulary.load()
+        self.assertIs(ChordVocabulary.load(), vocabulary)
+        self.assertTrue(os.path.exists(ChordVocabulary.cache_path))
+        ChordVocabulary.clear()
+        with unittest.mock.patch.object(ChordVocabulary, "_load_source") as load_source:
+            cached = ChordVocabulary.load()
+            load_source.assert_not_called()
+        self.assertEqual(cached.chords, vocabulary.chords)
+        self.assertEqual(cached.interval_index, vocabulary.interval_index)
+        self.assertEqual(cached.pitch_class_table, vocabulary.pitch_class_table)
+
+    def test_stale_cache_ignored(self):
+        ChordVocabulary.load()
+        with open(ChordVocabulary.cache_path, "rb") as f:
+            cached = pickle.load(f)
+        cached["source"] = (0, 0)
+        with open(ChordVocabulary.cache_path, "wb") as f:
+            pickle.dump(cached, f)
+        ChordVocabulary.clear()
+        self.assertIsNone(ChordVocabulary._load_cache())
+
+    def test_corrupt_cache_ignored(self):
+        with open(ChordVocabulary.cache_path, "wb") as f:
+            f.write(b"not a pickle")
+        self.assertIsNone(ChordVocabulary._load_cache())
+        self.assertIn("A4 Major", Chord.from_ident("A4 Major").identify())
+
+    def test_unreadable_cache_ignored(self):
+        for error in (ValueError("unsupported pickle protocol: 5"), ModuleNotFoundError("no module named x")):
+            ChordVocabulary.load()
+            ChordVocabulary.clear()
+            with unittest.mock.patch("pickle.load", side_effect=error):
+                self.assertIsNone(ChordVocabulary._load_cache())
+                self.assertTrue(ChordVocabulary.load().chords)
+
+    def test_cache_path_has_python_version(self):
+        self.cache_patch.stop()
+        try:
+            self.assertIn(f"py{sys.version_info[0]}{sys.version_info[1]}", os.path.basename(ChordVocabulary.cache_path))
+        finally:
+            self.cache_patch.start()
+
+    def test_unwritable_cache(self):
+        not_a_dir = os.path.join(self.tmp_dir.name, "file")
+        open(not_a_dir, "w").close()
+        with unittest.mock.patch.object(ChordVocabulary, "cache_path", os.path.join(not_a_dir, "chords.pickle")):
+            self.assertTrue(ChordVocabulary.load().chords)
+
+    def test_chords_attribute(self):
+        self.assertIs(Chord.chords, ChordVocabulary.load().chords)
+        self.assertEqual(Chord.chords[0]["name"], "Augmented")
@@ -0,0 +1,55 @@
+from unittest import TestCase
+
+from MIDIEvents import EventHistory
+
+
+class TestEventHistory(TestCase):
+    def test_empty(self):
+        history = EventHistory(4)
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.window().size, 0)
+        self.assertEqual(history.events(), [])
+
+    def test_window_keeps_latest(self):
+        history = EventHistory(4)
+        for i in range(10):
+            history.record(i / 10, 60 + i, 100, 0, 1 << (60 + i))
+            self.assertEqual(history.window().note.tolist(), list(range(max(60, 57 + i), 61 + i)))
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history.total, 10)
+        self.assertIsInstance(history.window().note, memoryview)
+        self.assertEqual(history.window(last=2).note.tolist(), [68, 69])
+        self.assertEqual(history.window(last=2).time.tolist(), [0.8, 0.9])
+
+    def test_held_mask(self):
+        history = EventHistory(8)
+        mask = (1 << 20) | (1 << 100)
+        history.record(0, 100, 90, 3, mask)
+        event, = history.events()
+        self.assertEqual(event, (0, 100, 90, 3, mask))
+        self.assertEqual(history.window().held_mask(0), mask)
+
+    def test_since(self):
+        history = EventHistory(8)
+        for i in range(12):
+            history.record(float(i), i, 1, 0, 0)
+        self.assertEqual(history.window(since=8.5).note.tolist(), [9, 10, 11])
+        self.assertEqual(history.window(since=0).note.tolist(), list(range(4, 12)))
+        self.assertEqual([event.note for event in history.events(last=4, since=10)], [10, 11])
+
+    def test_key_downs(self):
+        history = EventHistory(8)
+        for note, velocity in ((60, 100), (60, 0), (62, 100), (64, 100), (62, 0)):
+            history.record(0, note, velocity, 0, 0)
+        self.assertEqual(history.key_downs(2), [62, 64])
+        self.assertEqual(history.key_downs(16), [60, 62, 64])
+
+    def test_clear(self):
+        history = EventHistory(4)
+        history.record(0, 60, 100, 0, 0)
+        history.clear()
+        self.assertEqual(list(history), [])
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            EventHistory(0)
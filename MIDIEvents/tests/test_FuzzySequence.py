@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from MIDIEvents import FuzzySequence, Note, Sequence
+
+
+class TestFuzzySequence(TestCase):
+    def test_init(self):
+        seq = FuzzySequence(Note(60), Note(62), Note(64), max_errors=2)
+        self.assertEqual(seq.midi, (60, 62, 64))
+        self.assertEqual(seq.max_errors, 2)
+        self.assertEqual(FuzzySequence.from_midi_list([60, 62]).max_errors, 1)
+        self.assertEqual(FuzzySequence(Sequence.from_midi_list([60, 62, 64]), max_errors=0).midi, (60, 62, 64))
+
+    def test_max_errors(self):
+        with self.assertRaises(ValueError):
+            FuzzySequence(Note(60), Note(62), max_errors=2)
+        with self.assertRaises(ValueError):
+            FuzzySequence(Note(60), Note(62), max_errors=-1)
+
+    def test_eq_hash(self):
+        seq = FuzzySequence.from_midi_list([60, 62, 64])
+        self.assertEqual(seq, FuzzySequence.from_midi_list([60, 62, 64]))
+        self.assertEqual(hash(seq), hash(FuzzySequence.from_midi_list([60, 62, 64])))
+        self.assertNotEqual(seq, FuzzySequence(seq, max_errors=2))
+        self.assertNotEqual(seq, Sequence.from_midi_list([60, 62, 64]))
+        self.assertNotEqual(Sequence.from_midi_list([60, 62, 64]), seq)
+        self.assertEqual(len({seq, Sequence.from_midi_list([60, 62, 64])}), 2)
+
+    def test_repr(self):
+        self.assertEqual(repr(FuzzySequence.from_midi_list([60, 62])), "FuzzySequence(C4, D4, max_errors=1)")
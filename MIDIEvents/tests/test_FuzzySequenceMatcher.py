@@ -0,0 +1,110 @@
+import random
+from unittest import TestCase
+
+from MIDIEvents.FuzzySequenceMatcher import FuzzySequenceMatcher
+
+
+def edit_distance_to_suffix(pattern, history):
+    """
+    Smallest edit distance between ``pattern`` and any suffix of ``history``, where the last note of ``history`` is
+    matched, substituted or inserted rather than followed by deleted pattern notes
+    """
+    previous = list(range(len(pattern) + 1))
+    ending = len(pattern)
+    for note in history:
+        current = [0]
+        for i, p in enumerate(pattern):
+            current.append(min(previous[i] + (p != note), previous[i + 1] + 1, current[i] + 1))
+        ending = min(previous[-2] + (pattern[-1] != note), previous[-1] + 1)
+        previous = current
+    return ending
+
+
+class TestFuzzySequenceMatcher(TestCase):
+    def test_exact(self):
+        fm = FuzzySequenceMatcher()
+        fm.add("abc", (1, 2, 3), 0)
+        self.assertEqual(fm.advance(1), ())
+        self.assertEqual(fm.advance(2), ())
+        self.assertEqual(fm.advance(3), ("abc",))
+
+    def test_errors(self):
+        for played in ((1, 9, 3, 4), (1, 2, 9, 3, 4), (1, 3, 4)):  # Substitution, insertion, deletion
+            fm = FuzzySequenceMatcher()
+            fm.add("abcd", (1, 2, 3, 4), 1)
+            fm.add("exact", (1, 2, 3, 4), 0)
+            self.assertEqual([fm.advance(note) for note in played][-1], ("abcd",), played)
+        fm = FuzzySequenceMatcher()
+        fm.add("abcd", (1, 2, 3, 4), 1)
+        for note in (1, 9, 9, 4):
+            self.assertEqual(fm.advance(note), ())
+
+    def test_reported_once(self):
+        fm = FuzzySequenceMatcher()
+        fm.add("abcd", (1, 2, 3, 4), 1)
+        self.assertEqual([fm.advance(note) for note in (1, 2, 3, 4, 5)], [(), (), (), ("abcd",), ()])
+        self.assertEqual([fm.advance(note) for note in (7, 8, 1, 2, 3, 4)], [(), (), (), (), (), ("abcd",)])
+
+    def test_last_note_played(self):
+        """Missing notes at the end of a pattern don't make it match early"""
+        fm = FuzzySequenceMatcher()
+        fm.add("k", (60, 62, 64, 65), 1)
+        fm.add("pair", (60, 62), 1)
+        self.assertEqual([fm.advance(note) for note in (60, 62, 64, 65)], [(), ("pair",), (), ("k",)])
+
+    def test_add_remove(self):
+        fm = FuzzySequenceMatcher()
+        fm.add("abc", (1, 2, 3), 0)
+        self.assertIn("abc", fm)
+        with self.assertRaises(KeyError):
+            fm.add("abc", (1, 2, 3), 1)
+        with self.assertRaises(ValueError):
+            fm.add("too fuzzy", (1, 2), 2)
+        fm.advance(1)
+        fm.advance(2)
+        fm.add("def", (4, 5, 6), 1, recent_notes=(1, 2))
+        self.assertEqual(fm.advance(3), ("abc",))  # Kept its state
+        fm.remove("abc")
+        self.assertEqual(len(fm), 1)
+        self.assertEqual([fm.advance(note) for note in (1, 2, 3)], [(), (), ()])
+        fm.remove("missing")  # Doesn't raise
+        fm.clear()
+        self.assertEqual(len(fm), 0)
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(0)
+        patterns = {}
+        fm = FuzzySequenceMatcher()
+        for key in range(30):
+            notes = tuple(rng.choice(range(60, 66)) for _ in range(rng.randint(2, 6)))
+            patterns[key] = (notes, rng.randint(0, len(notes) - 1))
+            fm.add(key, *patterns[key])
+        history = []
+        matching = set()
+        for _ in range(500):
+            history.append(rng.choice(range(60, 66)))
+            recent = history[-12:]  # Longer than any pattern plus its errors
+            now = {key for key, (notes, errors) in patterns.items() if edit_distance_to_suffix(notes, recent) <= errors}
+            self.assertEqual(set(fm.advance(history[-1])), now - matching)
+            matching = now
+
+    def test_random_add_remove(self):
+        """Adding and removing while playing matches the same as starting over with the patterns left"""
+        rng = random.Random(1)
+        fm = FuzzySequenceMatcher()
+        patterns = {}
+        history = []
+        for step in range(300):
+            if patterns and rng.random() < 0.4:
+                key = rng.choice(list(patterns))
+                del patterns[key]
+                fm.remove(key, history[-16:])
+            elif rng.random() < 0.5:
+                notes = tuple(rng.choice(range(60, 64)) for _ in range(rng.randint(2, 5)))
+                patterns[step] = (notes, rng.randint(0, len(notes) - 1))
+                fm.add(step, *patterns[step], history[-16:])
+            history.append(rng.choice(range(60, 64)))
+            fresh = FuzzySequenceMatcher()
+            for key, (notes, errors) in patterns.items():
+                fresh.add(key, notes, errors, history[-16:-1])
+            self.assertEqual(set(fm.advance(history[-1])), set(fresh.advance(history[-1])))
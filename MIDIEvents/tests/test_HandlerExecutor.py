@@ -0,0 +1,136 @@
+import logging
+import threading
+import unittest
+import unittest.mock
+
+from MIDIEvents.HandlerExecutor import HandlerExecutor
+
+logger = logging.getLogger("MIDIEvents")
+
+
+class TestHandlerExecutor(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def blocker(self):
+        self.started.set()
+        self.release.wait()
+
+    def test_runs_handlers(self):
+        executor = HandlerExecutor(max_workers=2)
+        mock = unittest.mock.Mock()
+        for _ in range(10):
+            executor.submit(mock)
+        executor.shutdown()
+        self.assertEqual(mock.call_count, 10)
+        self.assertEqual(executor.stats()["completed"], 10)
+        self.assertEqual(len(executor.threads), 2)  # Threads are reused, not one per handler
+
+    def test_drop(self):
+        executor = HandlerExecutor(max_workers=1, max_queue=1, overflow="drop")
+        executor.submit(self.blocker)
+        self.started.wait(1)
+        mock = unittest.mock.Mock()
+        self.assertTrue(executor.submit(mock))  # Fills the queue
+        with self.assertLogs(logger=logger, level="WARNING"):
+            self.assertFalse(executor.submit(mock))
+        self.assertEqual(executor.rejected, 1)
+        self.assertEqual(executor.queue_depth, 1)
+        self.release.set()
+        executor.shutdown()
+        mock.assert_called_once()
+
+    def test_coalesce(self):
+        executor = HandlerExecutor(max_workers=1, max_queue=4, overflow="coalesce")
+        executor.submit(self.blocker)
+        self.started.wait(1)
+        mock1 = unittest.mock.Mock()
+        mock2 = unittest.mock.Mock()
+        self.assertTrue(executor.submit(mock1))
+        self.assertFalse(executor.submit(mock1))
+        self.assertTrue(executor.submit(mock2))
+        self.assertEqual(executor.coalesced, 1)
+        self.release.set()
+        executor.shutdown()
+        mock1.assert_called_once()
+        mock2.assert_called_once()
+
+    def test_block(self):
+        executor = HandlerExecutor(max_workers=1, max_queue=1, overflow="block")
+        executor.submit(self.blocker)
+        self.started.wait(1)
+        mock = unittest.mock.Mock()
+        executor.submit(mock)
+        t = threading.Thread(target=executor.submit, args=(mock,))
+        t.start()
+        t.join(0.05)
+        self.assertTrue(t.is_alive())  # Waiting for space in the queue
+        self.release.set()
+        t.join(1)
+        executor.shutdown()
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(executor.rejected, 0)
+
+    def test_block_from_worker(self):
+        executor = HandlerExecutor(max_workers=1, max_queue=1, overflow="block")
+        mock = unittest.mock.Mock()
+        results = list()
+
+        def handler():
+            results.append(executor.submit(mock))  # Fills the queue
+            results.append(executor.submit(mock))  # Would wait for this worker forever
+            self.started.set()
+        with self.assertLogs(logger=logger, level="WARNING"):
+            executor.submit(handler)
+            self.started.wait(1)
+        executor.shutdown()
+        self.assertEqual(results, [True, False])
+        self.assertEqual(executor.rejected, 1)
+        mock.assert_called_once()
+
+    def test_default_drops(self):
+        executor = HandlerExecutor(max_workers=1, max_queue=1)
+        executor.submit(self.blocker)
+        self.started.wait(1)
+        mock = unittest.mock.Mock()
+        executor.submit(mock)
+        with self.assertLogs(logger=logger, level="WARNING"):
+            self.assertFalse(executor.submit(mock))
+        self.release.set()
+        executor.shutdown()
+
+    def test_shutdown_without_wait_full_queue(self):
+        executor = HandlerExecutor(max_workers=1, max_queue=1, overflow="block")
+        executor.submit(self.blocker)
+        self.started.wait(1)
+        mock = unittest.mock.Mock()
+        executor.submit(mock)  # Fills the queue
+        t = threading.Thread(target=executor.shutdown, kwargs={"wait": False})
+        t.start()
+        t.join(1)
+        self.assertFalse(t.is_alive())
+        self.release.set()
+        executor.threads[0].join(1)
+        self.assertFalse(executor.threads[0].is_alive())
+        mock.assert_called_once()
+
+    def test_exception(self):
+        executor = HandlerExecutor(max_workers=1)
+        with self.assertLogs(logger=logger, level="ERROR"):
+            executor.submit(unittest.mock.Mock(side_effect=ValueError))
+            executor.shutdown()
+        self.assertEqual(executor.failed, 1)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            HandlerExecutor(overflow="test")
+        with self.assertRaises(ValueError):
+            HandlerExecutor(max_workers=0)
+        executor = HandlerExecutor()
+        executor.shutdown()
+        with self.assertRaises(RuntimeError):
+            executor.submit(unittest.mock.Mock())
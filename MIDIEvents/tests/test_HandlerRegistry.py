@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+from MIDIEvents import Chord, PitchClassChord, Sequence, ChordProgression, Pattern
+from MIDIEvents.HandlerRegistry import HandlerRegistry
+
+
+def handler():
+    pass
+
+
+def other_handler():
+    pass
+
+
+class TestHandlerRegistry(TestCase):
+    def setUp(self):
+        self.chord = Chord.from_ident("C4 Major")
+        self.pc_chord = PitchClassChord("C", "Major")
+        self.seq = Sequence.from_midi_list([60, 62, 64])
+        self.progression = ChordProgression(Chord.from_ident("C4 Major"), Chord.from_ident("F4 Major"))
+        self.pattern = Pattern("[C4 Major] .* 60")
+
+    def test_empty(self):
+        registry = HandlerRegistry()
+        self.assertEqual(len(registry), 0)
+        self.assertNotIn(self.chord, registry)
+
+    def test_with_handler_is_a_copy(self):
+        empty = HandlerRegistry()
+        registry = empty.with_handler(self.chord, handler)
+        self.assertNotIn(self.chord, empty)
+        self.assertEqual(registry[self.chord], (handler,))
+        self.assertEqual(registry.with_handler(self.chord, other_handler)[self.chord], (handler, other_handler))
+        self.assertEqual(registry[self.chord], (handler,))
+
+    def test_split_by_type(self):
+        registry = HandlerRegistry()
+        for key in (self.chord, self.pc_chord, self.seq, self.progression, self.pattern):
+            registry = registry.with_handler(key, handler)
+        self.assertEqual(list(registry.chords), [self.chord])
+        self.assertEqual(list(registry.pitch_class_chords), [self.pc_chord])
+        self.assertEqual(list(registry.sequences), [self.seq])
+        self.assertEqual(list(registry.chord_progressions), [self.progression])
+        self.assertEqual(list(registry.patterns), [self.pattern])
+        self.assertEqual(len(registry.merged()), 5)
+        self.assertEqual(len(registry), 5)
+
+    def test_untouched_types_shared(self):
+        registry = HandlerRegistry().with_handler(self.chord, handler)
+        registry2 = registry.with_handler(self.seq, handler)
+        self.assertIs(registry._dicts["chords"], registry2._dicts["chords"])
+        self.assertIs(registry._dicts["chords_by_mask"], registry2._dicts["chords_by_mask"])
+
+    def test_indexes(self):
+        registry = HandlerRegistry().with_handler(self.chord, handler).with_handler(self.pc_chord, handler)
+        self.assertIs(registry.chords_by_mask[self.chord.mask], self.chord)
+        self.assertIs(registry.pitch_class_chords_by_set[self.pc_chord.pitch_class_set], self.pc_chord)
+        self.assertFalse(registry.without(self.chord).chords_by_mask)
+
+    def test_without(self):
+        registry = HandlerRegistry().with_handler(self.chord, handler)
+        self.assertNotIn(self.chord, registry.without(self.chord))
+        with self.assertRaises(KeyError):
+            registry.without(self.seq)
+
+    def test_without_type(self):
+        registry = HandlerRegistry().with_handler(self.chord, handler).with_handler(self.seq, handler)
+        registry = registry.without_type(Chord)
+        self.assertNotIn(self.chord, registry)
+        self.assertIn(self.seq, registry)
+        self.assertIs(registry.without_type(Chord), registry)
+
+    def test_immutable(self):
+        registry = HandlerRegistry().with_handler(self.chord, handler)
+        with self.assertRaises(AttributeError):
+            registry.chords = {}
+        with self.assertRaises(TypeError):
+            registry.chords[self.chord] = (other_handler,)
@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from MIDIEvents import IntervalSequence, Note, Sequence
+
+
+class TestIntervalSequence(TestCase):
+    def test_intervals(self):
+        seq = IntervalSequence.from_midi_list([60, 64, 55])
+        self.assertEqual(seq.intervals, (4, -9))
+        self.assertEqual(IntervalSequence(seq, pitch_class=True).intervals, (4, 3))
+        self.assertEqual(IntervalSequence.from_intervals([4, 3]).midi, (60, 64, 67))
+
+    def test_too_short(self):
+        with self.assertRaises(ValueError):
+            IntervalSequence(Note(60))
+
+    def test_eq_hash(self):
+        c_major = IntervalSequence.from_midi_list([60, 64, 67])
+        d_major = IntervalSequence.from_midi_list([62, 66, 69])
+        self.assertEqual(c_major, d_major)
+        self.assertEqual(hash(c_major), hash(d_major))
+        self.assertNotEqual(c_major, IntervalSequence(c_major, pitch_class=True))
+        self.assertNotEqual(c_major, Sequence.from_midi_list([60, 64, 67]))
+        self.assertNotEqual(Sequence.from_midi_list([60, 64, 67]), c_major)
+        spread = IntervalSequence(Sequence.from_midi_list([60, 76, 55]), pitch_class=True)
+        self.assertEqual(spread, IntervalSequence(c_major, pitch_class=True))
+
+    def test_repr(self):
+        self.assertEqual(repr(IntervalSequence.from_midi_list([60, 62])), "IntervalSequence(C4, D4, pitch_class=False)")
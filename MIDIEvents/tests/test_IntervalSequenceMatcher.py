@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from MIDIEvents.IntervalSequenceMatcher import IntervalSequenceMatcher
+
+
+class TestIntervalSequenceMatcher(TestCase):
+    def test_any_key(self):
+        im = IntervalSequenceMatcher()
+        im.add("major", (4, 3), False)
+        for root in (60, 61, 50, 90):
+            self.assertEqual([im.advance(note) for note in (root, root + 4, root + 7)], [(), (), ("major",)])
+
+    def test_pitch_class(self):
+        im = IntervalSequenceMatcher()
+        im.add("major", (4, 3), False)
+        im.add("major pc", (4, 3), True)
+        self.assertEqual([im.advance(note) for note in (60, 76, 55)], [(), (), ("major pc",)])
+        self.assertEqual(set(im.advance(59)), set())
+        self.assertEqual([im.advance(note) for note in (63, 66)], [(), ("major", "major pc")])
+
+    def test_add_remove(self):
+        im = IntervalSequenceMatcher()
+        im.add("up", (2, 2), False)
+        self.assertIn("up", im)
+        im.advance(60)
+        im.advance(62)
+        im.add("down", (10, 10), True, recent_notes=(60, 62))  # Down a tone, as pitch classes
+        self.assertEqual(im.advance(64), ("up",))  # Kept its state
+        im.remove("up", recent_notes=(60, 62, 64))
+        self.assertNotIn("up", im)
+        self.assertEqual(len(im), 1)
+        self.assertEqual([im.advance(note) for note in (62, 60)], [(), ("down",)])
+        im.clear()
+        self.assertEqual(len(im), 0)
+        self.assertEqual(im.advance(58), ())
@@ -0,0 +1,70 @@
+import random
+from unittest import TestCase
+
+from MIDIEvents import LatencyHistogram
+
+
+class TestLatencyHistogram(TestCase):
+    def test_empty(self):
+        h = LatencyHistogram()
+        self.assertEqual(h.count, 0)
+        self.assertIsNone(h.percentile(50))
+        self.assertIsNone(h.mean)
+
+    def test_small_values_exact(self):
+        h = LatencyHistogram(significant_bits=7)
+        for value in range(128):
+            h.record(value)
+        self.assertEqual(h.percentile(50), 63)
+        self.assertEqual(h.percentile(100), 127)
+        self.assertEqual(h.min, 0)
+
+    def test_precision(self):
+        h = LatencyHistogram(significant_bits=7)
+        values = [random.randrange(1, 10 ** 10) for _ in range(2000)]
+        for value in values:
+            h.record(value)
+        values.sort()
+        for percent in (10, 50, 90, 99):
+            expected = values[-(-len(values) * percent // 100) - 1]
+            self.assertGreaterEqual(h.percentile(percent), expected)
+            self.assertLessEqual(h.percentile(percent), expected * (1 + 2 ** -6))
+        self.assertEqual(h.percentile(100), values[-1])
+        self.assertEqual(h.max, values[-1])
+
+    def test_buckets_contiguous(self):
+        h = LatencyHistogram(significant_bits=4)
+        previous = -1
+        for value in range(5000):
+            index = h._index(value)
+            self.assertIn(index - previous, (0, 1))
+            self.assertGreaterEqual(h._highest_equivalent(index), value)
+            previous = index
+
+    def test_negative(self):
+        h = LatencyHistogram()
+        h.record(-5)
+        self.assertEqual(h.min, 0)
+
+    def test_reset(self):
+        h = LatencyHistogram()
+        h.record(1000)
+        h.reset()
+        self.assertEqual(h.count, 0)
+        self.assertIsNone(h.max)
+
+    def test_summary(self):
+        h = LatencyHistogram()
+        for value in (10, 20, 30):
+            h.record(value)
+        summary = h.summary()
+        self.assertEqual(summary["count"], 3)
+        self.assertEqual(summary["mean"], 20)
+        self.assertEqual(summary["p50"], 20)
+        self.assertEqual(summary["max"], 30)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            LatencyHistogram(significant_bits=0)
+        with self.assertRaises(ValueError):
+            LatencyHistogram().percentile(101)
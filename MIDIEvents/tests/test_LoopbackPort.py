@@ -33,3 +33,56 @@ class TestLoopbackPort(unittest.TestCase):
         self.loopback.send(note_on)
         msg_received = self.loopback.receive(block=False)
         self.assertEqual(note_on, msg_received)
+
+    def test_order_across_wrap(self):
+        loopback = LoopbackPort(capacity=4)
+        msgs = [mido.Message("note_on", note=n) for n in range(10)]
+        loopback.send_many(msgs[:3])
+        self.assertEqual(loopback.receive(block=False), msgs[0])
+        self.assertEqual(loopback.receive(block=False), msgs[1])
+        loopback.send_many(msgs[3:6])  # Wraps around the end
+        self.assertEqual(list(loopback.iter_pending()), msgs[2:6])
+        self.assertEqual(loopback.pending, 0)
+
+    def test_lossless_grows(self):
+        loopback = LoopbackPort(capacity=4)
+        msgs = [mido.Message("note_on", note=n) for n in range(10)]
+        loopback.send(msgs[0])
+        loopback.send_many(msgs[1:])
+        self.assertGreaterEqual(loopback.capacity, 10)
+        self.assertEqual(loopback.receive_many(), msgs)
+        self.assertEqual(loopback.dropped, 0)
+
+    def test_overwrite_oldest(self):
+        loopback = LoopbackPort(capacity=4, overflow="overwrite")
+        msgs = [mido.Message("note_on", note=n) for n in range(10)]
+        loopback.send_many(msgs[:3])
+        loopback.send_many(msgs[3:5])
+        self.assertEqual(loopback.dropped, 1)
+        self.assertEqual(loopback.receive_many(), msgs[1:5])
+        loopback.send_many(msgs)
+        self.assertEqual(loopback.dropped, 7)
+        self.assertEqual(loopback.receive_many(), msgs[6:])
+        self.assertEqual(loopback.capacity, 4)
+
+    def test_send_many_callback(self):
+        mock = unittest.mock.Mock()
+        self.loopback.send_many([mido.Message("note_on", note=n) for n in range(3)])
+        self.loopback.callback = mock
+        self.loopback.send_many([mido.Message("note_on", note=n) for n in range(3, 5)])
+        self.assertEqual([c.args[0].note for c in mock.call_args_list], [0, 1, 2, 3, 4])
+
+    def test_receive_many_with_callback(self):
+        self.loopback.callback = unittest.mock.Mock()
+        with self.assertRaises(ValueError):
+            self.loopback.receive_many()
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            LoopbackPort(capacity=0)
+        with self.assertRaises(ValueError):
+            LoopbackPort(overflow="block")
+        port = LoopbackPort.__new__(LoopbackPort)
+        with self.assertRaises(ValueError):
+            port.__init__(capacity=0)
+        port.close()  # What __del__ does with it
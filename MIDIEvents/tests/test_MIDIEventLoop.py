@@ -1,11 +1,13 @@
 import logging
+import random
+import threading
 import time
 import unittest
 import unittest.mock
 
 import mido
 
-from MIDIEvents import Chord, Sequence, MIDIEventLoop, LoopbackPort, Note, ChordProgression
+from MIDIEvents import HandlerExecutor, Chord, PitchClassChord, Sequence, FuzzySequence, IntervalSequence, TimedSequence, MIDIEventLoop, LoopbackPort, Note, ChordProgression, Pattern
 
 # Prevents a race condition while testing with a non-callback backend.  Runs on both to make inheritance easier.
 # Can run as low as 0.005, but lots of stdout content or other lag can cause problems.
@@ -16,7 +18,7 @@ logger = logging.getLogger("MIDIEvents")
 logger.setLevel(logging.ERROR)
 
 
-def press_chord(loopback, chord_obj, direction=None):
+def press_chord(loopback, chord_obj, direction=None, delay=TEST_CHORD_DELAY):
     if direction is None:
         direction = "downup"
     if "down" in direction:
@@ -25,18 +27,76 @@ def press_chord(loopback, chord_obj, direction=None):
     if "up" in direction:
         for note in chord_obj.notes:
             loopback.send(mido.Message("note_off", note=note.midi))
-    time.sleep(TEST_CHORD_DELAY)
+    time.sleep(delay)
 
 
-def press_sequence(loopback, sequence_obj):
+def press_sequence(loopback, sequence_obj, delay=TEST_CHORD_DELAY):
     for note in sequence_obj.notes:
         loopback.send(mido.Message("note_on", note=note.midi))
         loopback.send(mido.Message("note_off", note=note.midi))
-    time.sleep(TEST_CHORD_DELAY)
+    time.sleep(delay)
+
+
+def send(loopback, *msgs, delay=TEST_CHORD_DELAY):
+    for msg in msgs:
+        loopback.send(msg)
+    time.sleep(delay)
+
+
+def count_handled(MEL):
+    """Count the messages the internal loop has finished with in ``MEL.handled``, so tests can wait for them"""
+    MEL.handled = 0
+    callback, callback_batch = MEL._callback, MEL._callback_batch
+
+    def counted(msg):
+        callback(msg)
+        MEL.handled += 1
+
+    def counted_batch(msgs):
+        callback_batch(msgs)
+        MEL.handled += len(msgs)
+
+    MEL._callback = counted
+    MEL._callback_batch = counted_batch
+
+
+def wait_until_handled(MEL, handled, timeout=5):
+    """
+    Wait until ``MEL`` has handled ``handled`` messages in all, closed its chord_window group, and every handler it gave
+    the executor has run
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        loop_done = (MEL.handled >= handled and MEL._chord_group is None and not MEL._chord_window_lock.locked())
+        stats = MEL.executor.stats()
+        if loop_done and stats["submitted"] == stats["completed"] + stats["failed"] + stats["rejected"] + stats["coalesced"]:
+            return
+        time.sleep(0.001)
+    raise AssertionError(f"MIDIEventLoop handled {MEL.handled} of {handled} messages in {timeout}s")
 
 
 class MIDIEventLoop_base_tests:
-    """To be inherited from.  Override ``setUp`` and ``tearDown``"""
+    """To be inherited from.  Override ``setUp`` and ``tearDown``, and call :py:func:`count_handled` before starting"""
+
+    def press_chord(self, chord_obj, direction=None):
+        direction = "downup" if direction is None else direction
+        self._press(len(chord_obj.notes) * (("down" in direction) + ("up" in direction)),
+                    press_chord, chord_obj, direction)
+
+    def press_sequence(self, sequence_obj):
+        self._press(2 * len(sequence_obj.notes), press_sequence, sequence_obj)
+
+    def send(self, *msgs):
+        self._press(len(msgs), send, *msgs)
+
+    def _press(self, messages, press, *args):
+        """Press, then wait for the loop and its handlers to finish instead of sleeping for long enough"""
+        if not hasattr(self.MEL, "handled"):  # Callbacks run as each message is sent
+            press(self.loopback, *args)
+            return
+        handled = self.MEL.handled + messages
+        press(self.loopback, *args, delay=0)
+        wait_until_handled(self.MEL, handled)
 
     def test_decorator_string(self):
         mock = unittest.mock.Mock()
@@ -47,9 +107,28 @@ class MIDIEventLoop_base_tests:
             mock()
 
         self.assertTrue(self.MEL.handlers)  # Not empty
-        press_chord(self.loopback, Chord.from_ident("C4 Major"))
+        self.press_chord(Chord.from_ident("C4 Major"))
         mock.assert_called()
 
+    def test_decorator_pitch_class_chord(self):
+        mock = unittest.mock.Mock()
+
+        @self.MEL.on_notes("C Major")
+        def sub():
+            mock()
+
+        self.assertIn(PitchClassChord("C", "Major"), self.MEL.handlers)
+        self.press_chord(Chord.from_ascii("E3 G3 C5"))  # Inversion in an open voicing
+        mock.assert_called()
+
+    def test_pitch_class_chord_any_voicing(self):
+        mock = unittest.mock.Mock()
+        self.MEL.add_handler(mock, PitchClassChord("A", "Minor"))
+        self.press_chord(Chord.from_ascii("A2 A3 C4 E5"))
+        self.assertEqual(mock.call_count, 1)  # Only once the final note is down
+        self.press_chord(Chord.from_ascii("A4 C5"))
+        self.assertEqual(mock.call_count, 1)
+
     def test_decorator_chord(self):
         mock = unittest.mock.Mock()
         self.assertFalse(self.MEL.handlers)  # Empty
@@ -61,7 +140,7 @@ class MIDIEventLoop_base_tests:
             mock()
 
         self.assertTrue(self.MEL.handlers)  # Not empty
-        press_chord(self.loopback, c1)
+        self.press_chord(c1)
         mock.assert_called()
 
     def test_decorator_sequence(self):
@@ -74,7 +153,7 @@ class MIDIEventLoop_base_tests:
         def sub():
             mock()
 
-        press_sequence(self.loopback, seq1)
+        self.press_sequence(seq1)
         self.assertTrue(self.MEL.handlers)  # Not empty
         mock.assert_called()
 
@@ -133,39 +212,76 @@ class MIDIEventLoop_base_tests:
 
     def test_note_on(self):
         """Test that notes are released when a 0 velocity ``note_on`` message is received"""
-        self.loopback.send(mido.Message("note_on", note=60))  # C4
-        self.loopback.send(mido.Message("note_on", note=64))  # E4
-        self.loopback.send(mido.Message("note_on", note=67))  # G4
-        time.sleep(TEST_CHORD_DELAY)
+        self.send(
+            mido.Message("note_on", note=60),  # C4
+            mido.Message("note_on", note=64),  # E4
+            mido.Message("note_on", note=67),  # G4
+        )
         self.assertTrue(self.MEL.down_notes)  # assert not empty
 
-        self.loopback.send(mido.Message("note_on", note=60, velocity=0))
-        self.loopback.send(mido.Message("note_on", note=64, velocity=0))
-        self.loopback.send(mido.Message("note_on", note=67, velocity=0))
-        time.sleep(TEST_CHORD_DELAY)
+        self.send(
+            mido.Message("note_on", note=60, velocity=0),
+            mido.Message("note_on", note=64, velocity=0),
+            mido.Message("note_on", note=67, velocity=0),
+        )
         self.assertFalse(self.MEL.down_notes)  # assert empty
 
     def test_note_off(self):
         """Test that notes are release when the ``note_off`` message is received"""
-        self.loopback.send(mido.Message("note_on", note=60))  # C4
-        self.loopback.send(mido.Message("note_on", note=64))  # E4
-        self.loopback.send(mido.Message("note_on", note=67))  # G4
-        time.sleep(TEST_CHORD_DELAY)
+        self.send(
+            mido.Message("note_on", note=60),  # C4
+            mido.Message("note_on", note=64),  # E4
+            mido.Message("note_on", note=67),  # G4
+        )
         self.assertTrue(self.MEL.down_notes)  # assert not empty
         
-        self.loopback.send(mido.Message("note_off", note=60))
-        self.loopback.send(mido.Message("note_off", note=64))
-        self.loopback.send(mido.Message("note_off", note=67))
-        time.sleep(TEST_CHORD_DELAY)
+        self.send(
+            mido.Message("note_off", note=60),
+            mido.Message("note_off", note=64),
+            mido.Message("note_off", note=67),
+        )
         self.assertFalse(self.MEL.down_notes)  # assert empty
 
+    def test_down_mask(self):
+        self.send(
+            mido.Message("note_on", note=60),
+            mido.Message("note_on", note=64),
+            mido.Message("note_on", note=64),  # Repeated note_on shouldn't count twice
+        )
+        self.assertEqual(self.MEL.down_mask, (1 << 60) | (1 << 64))
+        self.assertEqual(self.MEL.down_notes, {60, 64})
+        self.send(
+            mido.Message("note_off", note=64),
+            mido.Message("note_off", note=70),  # Never pressed
+        )
+        self.assertEqual(self.MEL.down_notes, {60})
+
+    def test_history(self):
+        self.send(
+            mido.Message("note_on", note=60, velocity=90, channel=2),
+            mido.Message("note_on", note=64),
+            mido.Message("note_off", note=60),
+        )
+        events = self.MEL.history.events()
+        self.assertEqual([(e.note, e.velocity, e.channel) for e in events], [(60, 90, 2), (64, 64, 0), (60, 0, 0)])
+        self.assertEqual([e.held_mask for e in events], [1 << 60, (1 << 60) | (1 << 64), 1 << 64])
+        self.assertLessEqual(events[0].time, events[2].time)
+        self.assertEqual(list(self.MEL.recent_notes), [60, 64])
+        recent = self.MEL.recent_notes
+        recent.append(1)  # Only changes the snapshot
+        self.send(mido.Message("note_on", note=67))
+        self.assertEqual(list(recent), [60, 64, 1])
+        self.assertEqual(list(self.MEL.recent_notes), [60, 64, 67])
+        self.assertEqual(list(self.MEL.recent_chords), [Chord.from_midi_list([60]), Chord.from_midi_list([60, 64]),
+                                                        Chord.from_midi_list([64, 67])])
+
     def test_trigger_on_custom_chord(self):
         mock = unittest.mock.Mock()
         chord = Chord.from_midi_list([20, 40, 60])
         self.assertFalse(self.MEL.handlers)  # Empty check
         self.MEL.add_handler(mock, chord)
 
-        press_chord(self.loopback, chord)
+        self.press_chord(chord)
         mock.assert_called()
 
     def test_trigger_on_sequence(self):
@@ -174,9 +290,75 @@ class MIDIEventLoop_base_tests:
         self.assertFalse(self.MEL.handlers)  # Empty check
         self.MEL.add_handler(mock, seq1)
 
-        press_sequence(self.loopback, seq1)
+        self.press_sequence(seq1)
         mock.assert_called()
     
+    def test_sequence_order(self):
+        mock = unittest.mock.Mock()
+        self.MEL.add_handler(mock, Sequence.from_midi_list([64, 62, 60]))
+        self.press_sequence(Sequence.from_midi_list([60, 62, 64]))
+        mock.assert_not_called()
+        self.press_sequence(Sequence.from_midi_list([64, 62, 60]))
+        mock.assert_called_once()
+
+    def test_fuzzy_sequence(self):
+        exact = unittest.mock.Mock()
+        fuzzy = unittest.mock.Mock()
+        self.MEL.add_handler(exact, Sequence.from_midi_list([60, 62, 64, 65]))
+        self.MEL.add_handler(fuzzy, FuzzySequence.from_midi_list([60, 62, 64, 65]))
+        self.press_sequence(Sequence.from_midi_list([60, 62, 63, 65]))  # One wrong note
+        exact.assert_not_called()
+        fuzzy.assert_called_once()
+        self.press_sequence(Sequence.from_midi_list([70, 72, 60, 62, 64, 65]))
+        exact.assert_called_once()
+        self.assertEqual(fuzzy.call_count, 2)
+        self.MEL.clear_handlers(FuzzySequence)
+        self.assertEqual(len(self.MEL.sequence_handlers), 1)
+        self.press_sequence(Sequence.from_midi_list([60, 62, 65]))
+        self.assertEqual(fuzzy.call_count, 2)
+
+    def test_interval_sequence(self):
+        mock = unittest.mock.Mock()
+        pc_mock = unittest.mock.Mock()
+        self.MEL.add_handler(mock, IntervalSequence.from_intervals([4, 3]))
+        self.MEL.add_handler(pc_mock, IntervalSequence.from_intervals([4, 3], pitch_class=True))
+        self.press_sequence(Sequence.from_midi_list([62, 66, 69]))  # D major
+        self.assertEqual(mock.call_count, 1)
+        self.press_sequence(Sequence.from_midi_list([40, 56, 47]))  # E major, spread out
+        self.assertEqual(mock.call_count, 1)
+        self.assertEqual(pc_mock.call_count, 2)
+
+    def test_timed_sequence_added_while_playing(self):
+        mock = unittest.mock.Mock()
+        self.press_sequence(Sequence.from_midi_list([60, 62]))
+        self.MEL.add_handler(mock, TimedSequence(Sequence.from_midi_list([60, 62, 64]), max_gap=5))
+        self.press_sequence(Sequence.from_midi_list([64]))  # Started before it was added
+        self.assertEqual(mock.call_count, 1)
+
+    def test_pattern(self):
+        mock = unittest.mock.Mock()
+        pattern = Pattern("[C4 Major] (D4 | E4)+ C5")
+        self.MEL.add_handler(mock, pattern)
+        self.assertEqual(self.MEL.pattern_handlers[pattern], (mock,))
+        self.press_chord(Chord.from_ident("C4 Major"), "down")
+        self.press_sequence(Sequence.from_midi_list([62, 64, 62, 72]))
+        self.assertEqual(mock.call_count, 1)
+        self.press_sequence(Sequence.from_midi_list([62, 72]))  # C4 Major isn't held anymore
+        self.assertEqual(mock.call_count, 1)
+        self.MEL.clear_handlers(pattern)
+        self.press_chord(Chord.from_ident("C4 Major"), "down")
+        self.press_sequence(Sequence.from_midi_list([62, 72]))
+        self.assertEqual(mock.call_count, 1)
+
+    def test_sequence_removed(self):
+        mock = unittest.mock.Mock()
+        seq1 = Sequence.from_midi_list([1, 2, 3])
+        self.MEL.add_handler(mock, seq1)
+        self.press_sequence(Sequence.from_midi_list([1, 2]))
+        self.MEL.clear_handlers(seq1)
+        self.press_sequence(Sequence.from_midi_list([3]))
+        mock.assert_not_called()
+
     def test_multiple_callbacks_different_chords(self):
         mock1 = unittest.mock.Mock()
         mock2 = unittest.mock.Mock()
@@ -185,11 +367,11 @@ class MIDIEventLoop_base_tests:
         self.MEL.add_handler(mock1, c1)
         self.MEL.add_handler(mock2, c2)
 
-        press_chord(self.loopback, c1)
+        self.press_chord(c1)
         mock1.assert_called()
         mock2.assert_not_called()
 
-        press_chord(self.loopback, c2)
+        self.press_chord(c2)
         mock2.assert_called()
 
     def test_multiple_callbacks_same_chord(self):
@@ -200,7 +382,7 @@ class MIDIEventLoop_base_tests:
         self.MEL.add_handler(mock1, c1)
         self.MEL.add_handler(mock2, c2)
 
-        press_chord(self.loopback, c1)
+        self.press_chord(c1)
         mock1.assert_called()
         mock2.assert_called()
 
@@ -212,11 +394,11 @@ class MIDIEventLoop_base_tests:
         self.MEL.add_handler(mock1, seq1)
         self.MEL.add_handler(mock2, seq2)
 
-        press_sequence(self.loopback, seq1)
+        self.press_sequence(seq1)
         mock1.assert_called()
         mock2.assert_not_called()
 
-        press_sequence(self.loopback, seq2)
+        self.press_sequence(seq2)
         mock2.assert_called()
 
     def test_multiple_callbacks_same_sequence(self):
@@ -227,7 +409,7 @@ class MIDIEventLoop_base_tests:
         self.MEL.add_handler(mock1, seq1)
         self.MEL.add_handler(mock2, seq2)
 
-        press_sequence(self.loopback, seq1)
+        self.press_sequence(seq1)
         mock1.assert_called()
         mock2.assert_called()
 
@@ -238,7 +420,7 @@ class MIDIEventLoop_base_tests:
         seq1 = Sequence(Note(1), Note(2), Note(3))
         self.MEL.add_handler(chord_mock, c1)
         self.MEL.add_handler(sequence_mock, seq1)
-        press_chord(self.loopback, c1)  # Should trigger both
+        self.press_chord(c1)  # Should trigger both
         chord_mock.assert_called()
         sequence_mock.assert_called()
 
@@ -260,10 +442,9 @@ class MIDIEventLoop_base_tests:
         cs1 = ChordProgression(c1, c2, c3)
         mock = unittest.mock.Mock()
         self.MEL.add_handler(mock, cs1)
-        press_chord(self.loopback, c1)
-        press_chord(self.loopback, c2)
-        press_chord(self.loopback, c3)
-        time.sleep(TEST_CHORD_DELAY)
+        self.press_chord(c1)
+        self.press_chord(c2)
+        self.press_chord(c3)
         mock.assert_called()
 
     def test_chord_progression_multiple_callback(self):
@@ -279,18 +460,219 @@ class MIDIEventLoop_base_tests:
         mock2 = unittest.mock.Mock()
         self.MEL.add_handler(mock1, cs1)
         self.MEL.add_handler(mock2, cs2)
-        press_chord(self.loopback, c1)
-        press_chord(self.loopback, c2)
-        press_chord(self.loopback, c3)
-        time.sleep(TEST_CHORD_DELAY)
+        self.press_chord(c1)
+        self.press_chord(c2)
+        self.press_chord(c3)
         mock1.assert_called()
-        press_chord(self.loopback, c4)
-        press_chord(self.loopback, c5)
-        press_chord(self.loopback, c6)
-        time.sleep(TEST_CHORD_DELAY)
+        self.press_chord(c4)
+        self.press_chord(c5)
+        self.press_chord(c6)
         mock2.assert_called()
 
 
+    def test_chord_progression_with_chords_between(self):
+        c1 = Chord.from_ident("A1 Major")
+        c2 = Chord.from_ident("A2 Major")
+        mock = unittest.mock.Mock()
+        self.MEL.add_handler(mock, ChordProgression(c1, c2))
+        self.press_chord(c1)
+        self.press_chord(Chord.from_ident("C4 Minor"))
+        mock.assert_not_called()
+        self.press_chord(c2)
+        mock.assert_called_once()
+        self.press_chord(c2)  # Needs a new c1 before it completes again
+        mock.assert_called_once()
+        self.press_chord(c1)
+        self.press_chord(c2)
+        self.assertEqual(mock.call_count, 2)
+
+    def test_chord_progression_pitch_class_chord(self):
+        mock = unittest.mock.Mock()
+        progression = ChordProgression(Chord.from_ident("C4 Major"), PitchClassChord.from_ident("G Major"))
+        self.MEL.add_handler(mock, progression)
+        self.press_chord(Chord.from_ident("C4 Major"))
+        self.press_chord(Chord.from_ident("G2 Major"))
+        mock.assert_called_once()
+
+    def test_chord_progression_invalid_chord(self):
+        progression = ChordProgression(Chord.from_ident("C4 Major"), Note("G4"))
+        with self.assertRaises(TypeError):
+            self.MEL.add_handler(print, progression)
+        self.assertNotIn(progression, self.MEL.handlers)
+
+    def test_handler_threads_bounded(self):
+        mock = unittest.mock.Mock()
+        c1 = Chord.from_ident("C4 Major")
+        self.MEL.add_handler(mock, c1)
+        for _ in range(5):
+            self.press_chord(c1)
+        self.assertEqual(mock.call_count, 5)
+        self.assertLessEqual(len(self.MEL.running_handler_threads), self.MEL.executor.max_workers)
+        self.assertEqual(self.MEL.executor.stats()["submitted"], 5)
+
+    def test_custom_executor(self):
+        executor = HandlerExecutor(max_workers=1, max_queue=8, overflow="coalesce")
+        MEL = MIDIEventLoop(port=LoopbackPort(), executor=executor)
+        self.assertIs(MEL.executor, executor)
+
+    def test_handlers_read_only(self):
+        c1 = Chord.from_ident("C4 Major")
+        s1 = Sequence.from_midi_list([1, 2, 3])
+        self.MEL.add_handler(print, c1)
+        self.MEL.add_handler(print, s1)
+        self.assertEqual(self.MEL.chord_handlers[c1], (print,))
+        self.assertEqual(list(self.MEL.sequence_handlers), [s1])
+        with self.assertRaises(TypeError):
+            self.MEL.handlers[c1] = []
+
+    def test_change_handlers_while_receiving(self):
+        errors = []
+        mock = unittest.mock.Mock()
+        s1 = Sequence.from_midi_list([1, 2, 3])
+        c1 = Chord.from_midi_list([1])
+        self.MEL.add_handler(mock, s1)
+        stop = threading.Event()
+
+        def change():
+            try:
+                while not stop.is_set():
+                    for i in range(4, 40):
+                        self.MEL.add_handler(print, Sequence.from_midi_list([1, 2, i]))
+                        self.MEL.add_handler(print, Chord.from_midi_list([i]))
+                    self.MEL.clear_handlers(Chord)
+                    for i in range(4, 40):
+                        self.MEL.clear_handlers(Sequence.from_midi_list([1, 2, i]))
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=change)
+        thread.start()
+        try:
+            for _ in range(20):
+                self.press_sequence(s1)
+        finally:
+            stop.set()
+            thread.join()
+        for _ in range(20):  # The changing thread can hold up the handler threads
+            if mock.call_count == 20:
+                break
+            time.sleep(TEST_CHORD_DELAY)
+        self.assertFalse(errors)
+        self.assertEqual(mock.call_count, 20)
+        self.assertNotIn(c1, self.MEL.handlers)
+
+    def test_inline_handler(self):
+        threads = []
+        c1 = Chord.from_ident("C4 Major")
+
+        @self.MEL.on_notes(c1, inline=True)
+        def sub():
+            threads.append(threading.current_thread())
+
+        self.press_chord(c1)
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threads[0], self.MEL.running_handler_threads)
+        self.assertEqual(self.MEL.stats()["inline"], {"runs": 1, "failed": 0, "demoted": 0})
+        self.assertEqual(self.MEL.executor.stats()["submitted"], 0)
+
+    def test_inline_handler_demoted(self):
+        threads = []
+        c1 = Chord.from_ident("C4 Major")
+
+        def slow():
+            threads.append(threading.current_thread())
+            time.sleep(0.002)
+
+        self.MEL.inline_budget = 0.001
+        self.MEL.add_handler(slow, c1, inline=True)
+        self.press_chord(c1)
+        self.press_chord(c1)
+        with self.assertLogs(logger=logger, level="WARNING"):
+            self.press_chord(c1)  # The third run over the budget in a row
+        self.press_chord(c1)
+        self.assertEqual(len(threads), 4)
+        self.assertNotIn(threads[2], self.MEL.running_handler_threads)
+        self.assertIn(threads[3], self.MEL.running_handler_threads)
+        self.assertEqual(self.MEL.stats()["inline"]["demoted"], 1)
+
+    def test_inline_handler_outlier(self):
+        c1 = Chord.from_ident("C4 Major")
+        slow = [True, False, True, False, True]
+        threads = []
+
+        def sometimes_slow():
+            threads.append(threading.current_thread())
+            if slow.pop(0):
+                time.sleep(0.05)
+
+        self.MEL.inline_budget = 0.02  # Well above a fast run, even when another thread holds the GIL
+        self.MEL.add_handler(sometimes_slow, c1, inline=True)
+        for _ in range(5):
+            self.press_chord(c1)
+        self.assertEqual(self.MEL.stats()["inline"]["demoted"], 0)
+        self.assertNotIn(threads[-1], self.MEL.running_handler_threads)
+
+    def test_inline_handler_exception(self):
+        c1 = Chord.from_ident("C4 Major")
+        mock = unittest.mock.Mock(side_effect=ValueError)
+        self.MEL.add_handler(mock, c1, inline=True)
+        with self.assertLogs(logger=logger, level="ERROR"):
+            self.press_chord(c1)
+        self.press_chord(c1)
+        self.assertEqual(mock.call_count, 2)  # The loop kept going
+        self.assertEqual(self.MEL.stats()["inline"]["failed"], 2)
+
+    def test_stats_without_instrumentation(self):
+        self.assertNotIn("latency", self.MEL.stats())
+        self.assertIn("executor", self.MEL.stats())
+
+    def test_instrumentation(self):
+        loopback = LoopbackPort()
+        MEL = MIDIEventLoop(port=loopback, instrument=True)
+        MEL.start()
+        try:
+            mock = unittest.mock.Mock()
+            c1 = Chord.from_ident("C4 Major")
+            MEL.add_handler(mock, c1)
+            press_chord(loopback, c1)
+        finally:
+            MEL.stop()
+        self.assertEqual(mock.call_count, 1)
+        latency = MEL.stats()["latency"]
+        self.assertEqual(latency["state"]["count"], 6)
+        self.assertEqual(latency["chords"]["count"], 3)
+        self.assertEqual(latency["dispatch"]["count"], 3)
+        self.assertEqual(latency["handler_start"]["count"], 1)
+        self.assertEqual(latency["total"]["count"], 6)
+        self.assertGreaterEqual(latency["handler_start"]["min"], latency["dispatch"]["min"])
+        MEL.instrumentation.reset()
+        self.assertEqual(MEL.stats()["latency"]["total"]["count"], 0)
+
+    def test_instrumentation_with_modes(self):
+        for mode in ({"batch": True}, {"chord_window": 10}, {"unified": True}):
+            loopback = LoopbackPort()
+            MEL = MIDIEventLoop(port=loopback, instrument=True, **mode)
+            count_handled(MEL)
+            MEL.start()
+            try:
+                mock = unittest.mock.Mock()
+                c1 = Chord.from_ident("C4 Major")
+                MEL.add_handler(mock, c1)
+                press_chord(loopback, c1, delay=0)
+                wait_until_handled(MEL, 6)
+            finally:
+                MEL.stop()
+            self.assertEqual(mock.call_count, 1, mode)
+            latency = MEL.stats()["latency"]
+            self.assertGreaterEqual(latency["total"]["count"], 1, mode)
+            self.assertGreaterEqual(latency["dispatch"]["count"], 1, mode)
+            self.assertEqual(latency["handler_start"]["count"], 1, mode)
+            self.assertEqual(latency["state"]["count"], 0, mode)  # Only timed per stage without a mode
+
+    def test_invalid_wait(self):
+        with self.assertRaises(ValueError):
+            MIDIEventLoop(port=LoopbackPort(), wait="sleep")
+
     def test_no_ports(self):
         with self.assertRaises(RuntimeError):
             MIDIEventLoop()
@@ -319,7 +701,310 @@ class TestMIDIEventLoop_pygame(unittest.TestCase, MIDIEventLoop_base_tests):
         self.loopback = LoopbackPort()
         mido.set_backend("mido.backends.pygame", load=True)
         self.MEL = MIDIEventLoop(port=self.loopback)
+        count_handled(self.MEL)
         self.MEL.start()
 
     def tearDown(self):
         self.MEL.stop()
+
+
+class TestMIDIEventLoop_pygame_spin(TestMIDIEventLoop_pygame):
+    def setUp(self):
+        self.loopback = LoopbackPort()
+        mido.set_backend("mido.backends.pygame", load=True)
+        self.MEL = MIDIEventLoop(port=self.loopback, wait="spin")
+        count_handled(self.MEL)
+        self.MEL.start()
+
+
+class TestMIDIEventLoop_pygame_poll(TestMIDIEventLoop_pygame):
+    def setUp(self):
+        self.loopback = LoopbackPort()
+        mido.set_backend("mido.backends.pygame", load=True)
+        self.MEL = MIDIEventLoop(port=self.loopback, wait="poll")
+        count_handled(self.MEL)
+        self.MEL.start()
+
+
+class TestMIDIEventLoop_pygame_block(TestMIDIEventLoop_pygame):
+    def setUp(self):
+        self.loopback = LoopbackPort()
+        mido.set_backend("mido.backends.pygame", load=True)
+        self.MEL = MIDIEventLoop(port=self.loopback, wait="block")
+        count_handled(self.MEL)
+        self.MEL.start()
+
+    def test_stop_wakes_receive(self):
+        start = time.perf_counter()
+        self.MEL.stop()
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertIsNone(self.loopback.receive(block=False))  # Nothing was put in the port to wake it
+        self.MEL.start()
+        mock = unittest.mock.Mock()
+        self.MEL.add_handler(mock, Chord.from_ident("C4 Major"))
+        self.press_chord(Chord.from_ident("C4 Major"))
+        self.assertEqual(mock.call_count, 1)  # Receiving again after a restart
+
+    def test_idle_cpu(self):
+        start = time.process_time()
+        time.sleep(0.2)
+        self.assertLess(time.process_time() - start, 0.15)
+
+
+class TestMIDIEventLoop_pygame_batch(TestMIDIEventLoop_pygame):
+    def setUp(self):
+        self.loopback = LoopbackPort()
+        mido.set_backend("mido.backends.pygame", load=True)
+        self.MEL = MIDIEventLoop(port=self.loopback, batch=True)
+        count_handled(self.MEL)
+        self.MEL.start()
+
+    def test_batch_skips_partial_chords(self):
+        c_major = unittest.mock.Mock()
+        c = unittest.mock.Mock()
+        self.MEL.add_handler(c_major, Chord.from_ident("C4 Major"))
+        self.MEL.add_handler(c, Chord.from_midi_list([60]))
+        self.MEL.stop()
+        press_chord(self.loopback, Chord.from_ident("C4 Major"))  # Queued while stopped, so it's one batch
+        self.MEL.start()
+        time.sleep(TEST_CHORD_DELAY)
+        self.assertEqual(c_major.call_count, 1)
+        self.assertEqual(c.call_count, 0)
+        stats = self.MEL.stats()["batch"]
+        self.assertEqual(stats["messages"], 6)
+        self.assertEqual(stats["chord_checks"], 1)
+        self.assertEqual(stats["chord_checks_saved"], 2)
+
+    def test_batch_sequence_per_note(self):
+        mock = unittest.mock.Mock()
+        self.MEL.add_handler(mock, Sequence.from_midi_list([60, 62, 64]))
+        self.MEL.stop()
+        press_sequence(self.loopback, Sequence.from_midi_list([60, 62, 64]))
+        self.MEL.start()
+        time.sleep(TEST_CHORD_DELAY)
+        self.assertEqual(mock.call_count, 1)
+
+
+    def test_lone_message_not_held(self):
+        self.MEL.stop()
+        self.MEL.batch_window = 1
+        self.MEL.start()
+        start = time.perf_counter()
+        self.loopback.send(mido.Message("note_on", note=60))
+        wait_until_handled(self.MEL, 1)
+        self.assertLess(time.perf_counter() - start, 0.5)  # Closed by the first poll that found nothing new
+
+
+class TestMIDIEventLoop_pygame_block_batch(TestMIDIEventLoop_pygame_batch):
+    def setUp(self):
+        self.loopback = LoopbackPort()
+        mido.set_backend("mido.backends.pygame", load=True)
+        self.MEL = MIDIEventLoop(port=self.loopback, wait="block", batch=True)
+        count_handled(self.MEL)
+        self.MEL.start()
+
+
+class TestMIDIEventLoop_pygame_unified(TestMIDIEventLoop_pygame):
+    """Every test again, with Chords, Sequences and ChordProgressions matched as Patterns"""
+    def setUp(self):
+        self.loopback = LoopbackPort()
+        mido.set_backend("mido.backends.pygame", load=True)
+        self.MEL = MIDIEventLoop(port=self.loopback, unified=True)
+        count_handled(self.MEL)
+        self.MEL.start()
+
+    def test_lowered(self):
+        self.MEL.add_handler(print, Chord.from_ident("C4 Major"))
+        self.MEL.add_handler(print, Sequence.from_midi_list([60, 62]))
+        self.MEL.add_handler(print, ChordProgression(Chord.from_ident("C4 Major"), Chord.from_ident("G4 Major")))
+        self.MEL.add_handler(print, FuzzySequence(Sequence.from_midi_list([60, 62]), max_errors=1))
+        press_sequence(self.loopback, Sequence.from_midi_list([1]))  # Matchers change on the next message
+        self.assertEqual(len(self.MEL._pattern_matcher), 2)
+        self.assertEqual(len(self.MEL._fuzzy_matcher), 1)
+        self.assertEqual(len(self.MEL._sequence_matcher), 0)
+        self.assertEqual(len(self.MEL._progression_matcher), 1)
+
+    def test_live_positions_bounded(self):
+        """The automaton only remembers the last few key downs, however long it has been playing"""
+        rng = random.Random(0)
+        MEL = MIDIEventLoop(port=LoopbackPort(), unified=True)
+        mock = unittest.mock.Mock()
+        for _ in range(300):
+            notes = rng.sample(range(60, 72), 4)
+            MEL.add_handler(mock, rng.choice((Chord.from_midi_list(notes[:2]), Sequence.from_midi_list(notes),
+                                              ChordProgression(Chord.from_midi_list(notes[:2]),
+                                                               Chord.from_midi_list(notes[2:])))))
+        matcher = MEL._pattern_matcher
+        most = 0
+        for _ in range(1000):  # Chords of one or two notes
+            notes = rng.sample(range(60, 72), rng.randint(1, 2))
+            for note in notes:
+                MEL._callback(mido.Message("note_on", note=note))
+                most = max(most, len(matcher._state.positions))
+            for note in notes:
+                MEL._callback(mido.Message("note_off", note=note))
+        self.assertLessEqual(most, 5)  # One per note of the longest Sequence, and a Chord
+        positions = matcher._state.positions
+        matcher.compile(MEL._recent_pattern_events())  # Only the last Sequence.maxlen key downs
+        self.assertEqual(matcher._state.positions, positions)
+        MEL.executor.shutdown()
+
+    def test_with_batch(self):
+        with self.assertRaises(ValueError):
+            MIDIEventLoop(port=LoopbackPort(), unified=True, batch=True)
+        with self.assertRaises(ValueError):
+            MIDIEventLoop(port=LoopbackPort(), unified=True, chord_window=20)
+
+
+class TestMIDIEventLoop_callback_batch(unittest.TestCase):
+    def setUp(self):
+        patcher = unittest.mock.patch("MIDIEvents.callbacks_supported", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.loopback = LoopbackPort()
+
+    def test_batch_window(self):
+        MEL = MIDIEventLoop(port=self.loopback, batch=True, batch_window=0.05)
+        c_major = unittest.mock.Mock()
+        MEL.add_handler(c_major, Chord.from_ident("C4 Major"))
+        press_chord(self.loopback, Chord.from_ident("C4 Major"), delay=0.15)
+        self.assertEqual(c_major.call_count, 1)
+        self.assertEqual(MEL.stats()["batch"]["batches"], 1)
+        self.assertEqual(MEL.stats()["batch"]["chord_checks_saved"], 2)
+
+    def test_no_batch_window(self):
+        MEL = MIDIEventLoop(port=self.loopback, batch=True, batch_window=0)
+        c_major = unittest.mock.Mock()
+        MEL.add_handler(c_major, Chord.from_ident("C4 Major"))
+        press_chord(self.loopback, Chord.from_ident("C4 Major"))
+        self.assertEqual(c_major.call_count, 1)
+        self.assertEqual(MEL.stats()["batch"]["batches"], 6)
+
+    def test_one_flush_thread(self):
+        MEL = MIDIEventLoop(port=self.loopback, batch=True, batch_window=0.05)
+        press_chord(self.loopback, Chord.from_ident("C4 Major"), delay=0.15)
+        thread = MEL._flush_thread
+        press_chord(self.loopback, Chord.from_ident("C4 Major"), delay=0.15)
+        self.assertIs(MEL._flush_thread, thread)  # Reused, not a new thread per batch
+        self.assertEqual(MEL.stats()["batch"]["batches"], 2)
+
+    def test_flush_thread_ends(self):
+        MEL = MIDIEventLoop(port=self.loopback, batch=True, batch_window=0.01)
+        MEL._flush_idle = 0.01
+        press_chord(self.loopback, Chord.from_ident("C4 Major"), delay=0.15)
+        self.assertIsNone(MEL._flush_thread)
+        press_chord(self.loopback, Chord.from_ident("C4 Major"), delay=0.15)  # Starts another
+        self.assertEqual(MEL.stats()["batch"]["batches"], 2)
+
+
+class ManualTimers:
+    """Stands in for the clock and timers of a :py:class:`MIDIEventLoop`, so time only moves on :py:meth:`sleep`"""
+
+    class Timer:
+        def __init__(self, deadline, func):
+            self.deadline = deadline
+            self.func = func
+            self.cancelled = False
+
+        def cancel(self):
+            self.cancelled = True
+
+    def __init__(self, MEL):
+        self.now = 0.0
+        self.timers = []
+        MEL._clock = self.clock
+        MEL._start_timer = self.start_timer
+
+    def clock(self):
+        return self.now
+
+    def start_timer(self, delay, func):
+        timer = self.Timer(self.now + delay, func)
+        self.timers.append(timer)
+        return timer
+
+    def sleep(self, seconds):
+        """Move the clock on, firing the timers that run out on the way"""
+        until = self.now + seconds
+        for timer in sorted(self.timers, key=lambda t: t.deadline):
+            if timer.deadline <= until:
+                self.timers.remove(timer)
+                if not timer.cancelled:
+                    self.now = timer.deadline
+                    timer.func(timer)
+        self.now = until
+
+
+class TestMIDIEventLoop_callback_chord_window(unittest.TestCase):
+    """Driven by :py:class:`ManualTimers`, and inline handlers so they've run once the message is sent"""
+    def setUp(self):
+        patcher = unittest.mock.patch("MIDIEvents.callbacks_supported", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.loopback = LoopbackPort()
+        self.MEL = MIDIEventLoop(port=self.loopback, chord_window=20)
+        self.timers = ManualTimers(self.MEL)
+        self.c_major = unittest.mock.Mock()
+        self.c = unittest.mock.Mock()
+        self.MEL.add_handler(self.c_major, Chord.from_ident("C4 Major"), inline=True)
+        self.MEL.add_handler(self.c, Chord.from_midi_list([60]), inline=True)
+
+    def send(self, msg_type, notes, gap=0):
+        for note in notes:
+            self.loopback.send(mido.Message(msg_type, note=note))
+            self.timers.sleep(gap)
+
+    def test_arpeggio_grouped(self):
+        self.send("note_on", (60, 64, 67), gap=0.002)
+        self.assertEqual(self.c_major.call_count, 0)  # Still open
+        self.timers.sleep(0.015)  # Window closes without a key up
+        self.assertEqual(self.c_major.call_count, 1)
+        self.assertEqual(self.c.call_count, 0)
+        self.assertEqual(self.MEL.stats()["chord_window"], {"groups": 1, "notes": 3})
+
+    def test_key_up_closes_group(self):
+        self.send("note_on", (60, 64, 67))
+        self.send("note_off", (60, 64, 67))
+        self.assertEqual(self.c_major.call_count, 1)
+        self.assertEqual(self.MEL.stats()["chord_window"]["groups"], 1)
+
+    def test_separate_groups(self):
+        self.send("note_on", (60,))
+        self.timers.sleep(0.05)
+        self.send("note_on", (64, 67))
+        self.timers.sleep(0.05)
+        self.assertEqual(self.c.call_count, 1)
+        self.assertEqual(self.c_major.call_count, 1)
+        self.assertEqual(self.MEL.stats()["chord_window"]["groups"], 2)
+
+    def test_late_note_closes_group(self):
+        """The timer hasn't fired yet, but the next key down is already past the window"""
+        self.send("note_on", (60,))
+        self.timers.now += 0.05
+        self.send("note_on", (64, 67))
+        self.assertEqual(self.c.call_count, 1)
+        self.timers.sleep(0.05)
+        self.assertEqual(self.c_major.call_count, 1)
+
+    def test_progression(self):
+        mock = unittest.mock.Mock()
+        self.MEL.add_handler(mock, ChordProgression(Chord.from_ident("C4 Major"), Chord.from_ident("F4 Major")),
+                             inline=True)
+        for chord in ("C4 Major", "F4 Major"):
+            midi = [note.midi for note in Chord.from_ident(chord).notes]
+            self.send("note_on", midi, gap=0.002)  # Arpeggiated, the partial chords don't count
+            self.send("note_off", midi)
+        mock.assert_called_once()
+
+    def test_with_batch(self):
+        with self.assertRaises(ValueError):
+            MIDIEventLoop(port=LoopbackPort(), batch=True, chord_window=20)
+
+
+class TestMIDIEventLoop_pygame_chord_window(TestMIDIEventLoop_pygame):
+    def setUp(self):
+        self.loopback = LoopbackPort()
+        mido.set_backend("mido.backends.pygame", load=True)
+        self.MEL = MIDIEventLoop(port=self.loopback, chord_window=10)
+        count_handled(self.MEL)
+        self.MEL.start()
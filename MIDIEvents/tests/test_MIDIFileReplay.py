@@ -0,0 +1,134 @@
+import logging
+import os
+import random
+import tempfile
+import unittest
+import unittest.mock
+
+import mido
+
+from MIDIEvents import Chord, ChordProgression, MIDIFileReplay, Pattern, PitchClassChord, Sequence, TimedSequence
+
+logger = logging.getLogger("MIDIEvents")
+logger.setLevel(logging.ERROR)
+
+TICKS_PER_BEAT = 480  # At the default 120 bpm, 960 ticks is a second
+
+
+def make_file(*notes):
+    """``notes`` are (MIDI note, start tick, end tick)"""
+    events = []
+    for note, start, end in notes:
+        events.append((start, 1, mido.Message("note_on", note=note, velocity=64)))
+        events.append((end, 0, mido.Message("note_off", note=note)))
+    events.sort(key=lambda x: (x[0], x[1]))
+    track = mido.MidiTrack()
+    last = 0
+    for tick, _, msg in events:
+        track.append(msg.copy(time=tick - last))
+        last = tick
+    midi_file = mido.MidiFile(ticks_per_beat=TICKS_PER_BEAT)
+    midi_file.tracks.append(track)
+    return midi_file
+
+
+class TestMIDIFileReplay(unittest.TestCase):
+    def test_chord_events(self):
+        replay = MIDIFileReplay()
+        mock = unittest.mock.Mock()
+        c1 = Chord.from_ident("C4 Major")
+        replay.add_handler(mock, c1)
+        midi_file = make_file((60, 960, 1440), (64, 960, 1440), (67, 960, 1440),
+                              (60, 1920, 2400), (64, 1920, 2400), (67, 1920, 2400))
+        events = list(replay.replay(midi_file))
+        self.assertEqual([event.time for event in events], [1, 2])
+        self.assertEqual(events[0].notes_obj, c1)
+        self.assertEqual(events[0].handlers, (mock,))
+        mock.assert_not_called()
+
+    def test_run_handlers(self):
+        replay = MIDIFileReplay(run_handlers=True)
+        mock = unittest.mock.Mock()
+        replay.add_handler(mock, Sequence.from_midi_list([60, 62, 64]))
+        list(replay.replay(make_file((60, 0, 100), (62, 100, 200), (64, 200, 300))))
+        mock.assert_called_once()
+
+    def test_progression(self):
+        replay = MIDIFileReplay()
+        progression = ChordProgression(Chord.from_ident("C4 Major"), Chord.from_ident("F4 Major"))
+        replay.add_handler(print, progression)
+        midi_file = make_file(*[(note.midi, 0, 480) for note in Chord.from_ident("C4 Major").notes],
+                              *[(note.midi, 480, 960) for note in Chord.from_ident("F4 Major").notes])
+        events = list(replay.replay(midi_file))
+        self.assertEqual([(event.time, event.notes_obj) for event in events], [(0.5, progression)])
+
+    def test_chord_window_song_time(self):
+        """Arpeggio 10 ms apart in song time, grouped by a 30 ms window without any real waiting"""
+        replay = MIDIFileReplay(chord_window=30)
+        c1 = Chord.from_ident("C4 Major")
+        c = Chord.from_midi_list([60])
+        replay.add_handler(print, c1)
+        replay.add_handler(print, c)
+        midi_file = make_file((60, 0, 2000), (64, 10, 2000), (67, 19, 2000),  # Ticks are ~1 ms
+                              (60, 3000, 5000))
+        events = list(replay.replay(midi_file))
+        self.assertEqual([event.notes_obj for event in events], [c1, c])
+        self.assertAlmostEqual(events[0].time, 0.03)
+        self.assertAlmostEqual(events[1].time, 3000 / 960 + 0.03)  # Closed by the timer after the last message
+
+    def test_path(self):
+        replay = MIDIFileReplay()
+        replay.add_handler(print, Chord.from_midi_list([60]))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.mid")
+            make_file((60, 0, 480)).save(path)
+            self.assertEqual(len(list(replay.replay(path))), 1)
+
+    def test_no_threads(self):
+        replay = MIDIFileReplay(run_handlers=True)
+        replay.add_handler(unittest.mock.Mock(), Chord.from_midi_list([60]))
+        list(replay.replay(make_file((60, 0, 480))))
+        self.assertFalse(replay.running_handler_threads)
+
+    def test_timed_sequence(self):
+        replay = MIDIFileReplay()
+        seq = TimedSequence(Sequence.from_midi_list([60, 62, 64]), max_gap=0.75)
+        replay.add_handler(print, seq)
+        midi_file = make_file((60, 0, 240), (62, 480, 720), (64, 960, 1200),  # Half a second apart
+                              (60, 1920, 2160), (62, 2880, 3120), (64, 3360, 3600))  # One second gap
+        events = list(replay.replay(midi_file))
+        self.assertEqual([(event.time, event.notes_obj) for event in events], [(1.0, seq)])
+
+    def test_pattern(self):
+        replay = MIDIFileReplay()
+        pattern = Pattern("C4 (D4 | E4)* G4")
+        replay.add_handler(print, pattern)
+        midi_file = make_file((60, 0, 240), (62, 240, 480), (64, 480, 720), (67, 720, 960),
+                              (60, 960, 1200), (61, 1200, 1440), (67, 1440, 1680))
+        events = list(replay.replay(midi_file))
+        self.assertEqual([(event.time, event.notes_obj) for event in events], [(0.75, pattern)])
+
+    def test_unified_same_matches(self):
+        """Random chords and runs of notes match the same Chords, PitchClassChords and Sequences when lowered"""
+        rng = random.Random(0)
+        keys = [Chord.from_ident("C4 Major"), Chord.from_ident("F4 Major"), Chord.from_midi_list([60]),
+                PitchClassChord.from_ident("C Major"), PitchClassChord.from_ident("G Major"),
+                Sequence.from_midi_list([60, 62, 64]), Sequence.from_midi_list([67, 67]),
+                ChordProgression(Chord.from_ident("C4 Major"), Chord.from_ident("F4 Major"))]
+        notes = []
+        tick = 0
+        for _ in range(300):
+            chord = rng.choice(["C4 Major", "F4 Major", "G3 Major", "C5 Major", "C4 Minor"])
+            midi = [note.midi for note in Chord.from_ident(chord).notes] if rng.random() < 0.5 else \
+                [rng.choice([60, 62, 64, 67])]
+            notes.extend((note, tick + i, tick + 100) for i, note in enumerate(midi))
+            tick += 120
+        midi_file = make_file(*notes)
+        matches = []
+        for unified in (False, True):
+            replay = MIDIFileReplay(unified=unified)
+            for key in keys:
+                replay.add_handler(print, key)
+            matches.append([(event.time, event.notes_obj) for event in replay.replay(midi_file)])
+        self.assertTrue(matches[0])
+        self.assertEqual(matches[0], matches[1])
@@ -1,6 +1,8 @@
 import logging
+import pickle
 import unittest
 
+import MIDIEvents
 from MIDIEvents import Note
 
 logger = logging.getLogger("MIDIEvents")
@@ -67,3 +69,38 @@ class TestNote(unittest.TestCase):
     def test_MIDI_range_warn(self):
         with self.assertLogs(logger=logger, level="WARNING"):
             Note("A11")
+
+    def test_canonical_instances(self):
+        self.assertIs(Note(60), Note("C4"))
+        self.assertIs(Note(60), Note("C", 4))
+        self.assertIs(Note(59), Note("Cb4"))
+        self.assertIs(Note(midi=69), Note(note_str="A4"))
+
+    def test_immutable(self):
+        n1 = Note(69)
+        with self.assertRaises(AttributeError):
+            n1.midi = 70
+        with self.assertRaises(AttributeError):
+            n1.extra = True
+        self.assertEqual(Note(69).midi, 69)
+
+    def test_out_of_range_not_canonical(self):
+        with self.assertLogs(logger=logger, level="WARNING"):
+            n1 = Note("A11")
+        self.assertEqual(n1.midi, 153)
+        self.assertEqual(str(n1), "A11")
+
+    def test_pickle(self):
+        self.assertIs(pickle.loads(pickle.dumps(Note(69))), Note(69))
+
+    def test_parse_cache(self):
+        MIDIEvents.parse_cache_clear()
+        Note("G#3")
+        Note("G#3")
+        info = MIDIEvents.parse_cache_info()["Note"]
+        self.assertEqual((info.hits, info.misses), (1, 1))
+        self.assertEqual(set(MIDIEvents.parse_cache_info()), {"Note", "NoteList.from_ascii", "Chord.from_ident"})
+        with self.assertRaises(ValueError):  # Errors aren't cached
+            Note("4A")
+        with self.assertRaises(ValueError):
+            Note("4A")
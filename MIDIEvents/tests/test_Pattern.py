@@ -0,0 +1,56 @@
+import unittest
+
+from MIDIEvents import Chord, ChordProgression, Note, Pattern, PitchClassChord, Sequence
+
+
+class TestPattern(unittest.TestCase):
+    def test_notes(self):
+        self.assertEqual(Pattern("C4 60 Db4")._tree,
+                         ("cat", (("atom", "note", 60), ("atom", "note", 60), ("atom", "note", 61))))
+        self.assertEqual(Pattern(".")._tree, ("atom", "any", None))
+
+    def test_chords(self):
+        c_major = Chord.from_ident("C4 Major")._key
+        for source in ("[C4 Major]", "[C4 E4 G4]", "[60 64 67]", "[ 67 60 64 ]"):
+            self.assertEqual(Pattern(source)._tree, ("atom", "chord", c_major), source)
+        pitch_class_set = PitchClassChord.from_ident("C Major").pitch_class_set
+        for source in ("[C Major]", "[C E G]", "[G E C]"):
+            self.assertEqual(Pattern(source)._tree, ("atom", "pitch_class_chord", pitch_class_set), source)
+
+    def test_operators(self):
+        self.assertEqual(Pattern("(60 | 62)+ 64? .*")._tree,
+                         ("cat", (("plus", ("alt", (("atom", "note", 60), ("atom", "note", 62)))),
+                                  ("opt", ("atom", "note", 64)),
+                                  ("star", ("atom", "any", None)))))
+        note = ("atom", "note", 60)
+        self.assertEqual(Pattern("60{3}")._tree, ("cat", (note, note, note)))
+        self.assertEqual(Pattern("60{1,2}")._tree, ("cat", (note, ("opt", note))))
+        self.assertEqual(Pattern("60{2,}")._tree, ("cat", (note, note, ("star", note))))
+
+    def test_errors(self):
+        for source in ("", "  ", "(60", "60)", "60 |", "| 60", "[Q Major]", "[]", "60{3,2}", "60{0}", "60{99}",
+                       "200", "60 ~", "60*", "60? .*", "(60 | 62?)"):
+            with self.assertRaises(ValueError, msg=source):
+                Pattern(source)
+
+    def test_eq_hash(self):
+        self.assertEqual(Pattern("60 62"), Pattern("60 62"))
+        self.assertNotEqual(Pattern("60 62"), Pattern("60  62"))
+        self.assertNotEqual(Pattern("60 62"), Sequence.from_midi_list([60, 62]))
+        self.assertEqual(len({Pattern("60 62"), Pattern("60 62"), Pattern("62")}), 2)
+        self.assertEqual(repr(Pattern("C4 [C Major]")), "Pattern('C4 [C Major]')")
+
+    def test_from_notes_obj(self):
+        self.assertEqual(Pattern.from_notes_obj(Chord.from_ident("C4 Major")), Pattern("[60 64 67]"))
+        self.assertEqual(Pattern.from_notes_obj(PitchClassChord.from_ident("D Minor")), Pattern("[D F A]"))
+        self.assertEqual(Pattern.from_notes_obj(Sequence.from_midi_list([60, 62, 64])), Pattern("60 62 64"))
+        repeated = Chord(Note("C4"), Note("C4"), Note("E4"))
+        self.assertEqual(Pattern.from_notes_obj(repeated)._tree, ("atom", "chord", repeated._key))
+        with self.assertRaises(TypeError):
+            Pattern.from_notes_obj("C4 Major")
+        with self.assertRaises(TypeError):  # Chords between them are counted differently
+            Pattern.from_notes_obj(ChordProgression(Chord.from_ident("C4 Major"), Chord.from_ident("G4 Major")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import random
+import re
+from unittest import TestCase
+
+from MIDIEvents import Pattern
+from MIDIEvents.PatternMatcher import PatternMatcher
+
+NOTES = (60, 61, 62, 63)
+
+
+def note_events(notes):
+    return [(note, 1 << note, 1 << (note % 12)) for note in notes]
+
+
+def as_regex(source):
+    """The same pattern as a Python regular expression over one letter per note"""
+    source = re.sub(r"\d+", lambda m: "abcd"[int(m.group()) - 60] if len(m.group()) == 2 else m.group(), source)
+    return "(?:" + source.replace(" ", "") + ")$"
+
+
+def random_source(rng, depth=0):
+    if depth > 2 or rng.random() < 0.3:
+        return rng.choice([str(note) for note in NOTES] + ["."])
+    op = rng.choice(["cat", "alt", "star", "plus", "opt", "count"])
+    if op == "cat":
+        return " ".join(random_source(rng, depth + 1) for _ in range(rng.randint(2, 3)))
+    if op == "alt":
+        return "(" + " | ".join(random_source(rng, depth + 1) for _ in range(2)) + ")"
+    child = "(" + random_source(rng, depth + 1) + ")"
+    if op == "count":
+        return child + rng.choice(["{2}", "{1,2}", "{2,}"])
+    return child + {"star": "*", "plus": "+", "opt": "?"}[op]
+
+
+class TestPatternMatcher(TestCase):
+    def advance_all(self, pm, notes):
+        return [pm.advance(*event) for event in note_events(notes)]
+
+    def test_sequence(self):
+        pm = PatternMatcher()
+        pm.add("abc", Pattern("60 61 62")._tree)
+        self.assertEqual(self.advance_all(pm, [60, 60, 61, 62, 61, 62]), [(), (), (), ("abc",), (), ()])
+
+    def test_alternation_repetition(self):
+        pm = PatternMatcher()
+        pm.add("run", Pattern("(60 | 61)+ 62")._tree)
+        pm.add("twice", Pattern("63{2}")._tree)
+        self.assertEqual(self.advance_all(pm, [61, 60, 61, 62, 62, 63, 63, 63]),
+                         [(), (), (), ("run",), (), (), ("twice",), ("twice",)])
+
+    def test_wildcard(self):
+        pm = PatternMatcher()
+        pm.add("gap", Pattern("60 .* 62")._tree)
+        self.assertEqual(self.advance_all(pm, [60, 61, 63, 62, 62]), [(), (), (), ("gap",), ("gap",)])
+
+    def test_chords(self):
+        pm = PatternMatcher()
+        pm.add("C4", Pattern("[C4 E4 G4]")._tree)
+        pm.add("C", Pattern("[C E G]")._tree)
+        pm.add("then", Pattern("[C E G] .* 62")._tree)
+        c4, e4, g4, c5 = 1 << 60, 1 << 64, 1 << 67, 1 << 72
+        c, e, g = 1 << 0, 1 << 4, 1 << 7
+        self.assertEqual(pm.advance(60, c4, c), ())
+        self.assertEqual(pm.advance(64, c4 | e4, c | e), ())
+        self.assertEqual(pm.advance(67, c4 | e4 | g4, c | e | g), ("C4", "C"))
+        self.assertEqual(pm.advance(72, c4 | e4 | g4 | c5, c | e | g), ("C",))
+        self.assertEqual(pm.advance(62, 1 << 62, 1 << 2), ("then",))
+
+    def test_leading_nullable_dropped(self):
+        pm = PatternMatcher()
+        pm.add("gap", Pattern(".* 60? (61 | 62)")._tree)
+        self.assertEqual(self.advance_all(pm, [63, 60, 61, 62]), [(), (), ("gap",), ("gap",)])
+        self.assertEqual(len(pm._atoms), 2)  # Only (61 | 62)
+
+    def test_shared_prefixes(self):
+        pm = PatternMatcher()
+        pm.add("ab", Pattern("60 61")._tree)
+        pm.add("abc", Pattern("60 61 62")._tree)
+        pm.add("ab+", Pattern("60 61 (62 | 63)+")._tree)
+        pm.add("a", Pattern("60")._tree)
+        self.assertEqual(self.advance_all(pm, [60, 61, 62, 63]), [("a",), ("ab",), ("abc", "ab+"), ("ab+",)])
+        self.assertEqual(len(pm._atoms), 5)  # 60, 61, 62 and 62 | 63
+
+    def test_least_recently_used_dropped(self):
+        pm = PatternMatcher(max_states=2)
+        pm.add("ab", Pattern("60 61")._tree)
+        nothing = (frozenset(), ())
+        self.advance_all(pm, [60])
+        self.assertIn(nothing, pm._states)
+        self.assertEqual(self.advance_all(pm, [61]), [("ab",)])
+        self.assertNotIn(nothing, pm._states)  # Used least recently
+        self.assertEqual(self.advance_all(pm, [60, 62, 60, 61]), [(), (), (), ("ab",)])
+        self.assertEqual(len(pm._states), 2)
+
+    def test_compile_replays(self):
+        pm = PatternMatcher()
+        events = note_events([60, 61])
+        pm.add("abc", Pattern("60 61 62")._tree)
+        self.assertTrue(pm.stale)
+        pm.compile(events)
+        self.assertFalse(pm.stale)
+        self.assertEqual(self.advance_all(pm, [62]), [("abc",)])
+        pm.remove("abc")
+        pm.compile(events + note_events([62, 60, 61]))
+        self.assertNotIn("abc", pm)
+        pm.add("abc", Pattern("60 61 62")._tree)
+        pm.compile(events)
+        self.assertEqual(self.advance_all(pm, [62]), [("abc",)])
+        pm.add("ab", Pattern("60 61")._tree)
+        self.assertEqual(self.advance_all(pm, [60, 61]), [(), ("ab",)])  # Not compiled, so starts from nothing
+        with self.assertRaises(KeyError):
+            pm.add("abc", Pattern("60")._tree)
+        pm.clear()
+        self.assertEqual(len(pm), 0)
+        self.assertEqual(self.advance_all(pm, [60, 61, 62]), [(), (), ()])
+
+    def test_max_states(self):
+        pm = PatternMatcher(max_states=4)
+        pm.add("far", Pattern("60 . . 61")._tree)  # Needs 8 states to remember which of the last 3 notes were 60
+        rng = random.Random(1)
+        played = []
+        for _ in range(200):
+            played.append(rng.choice(NOTES))
+            expected = [("far",)] if len(played) >= 4 and played[-4] == 60 and played[-1] == 61 else [()]
+            self.assertEqual(self.advance_all(pm, played[-1:]), expected)
+            self.assertLessEqual(len(pm._states), 4)
+
+    def test_brute_force(self):
+        rng = random.Random(0)
+        for _ in range(30):
+            sources = set()
+            while len(sources) < 4:
+                source = random_source(rng)
+                try:
+                    Pattern(source)
+                except ValueError:  # Matches nothing
+                    continue
+                sources.add(source)
+            pm = PatternMatcher()
+            regexes = dict()
+            for source in sources:
+                pm.add(source, Pattern(source)._tree)
+                regexes[source] = re.compile(as_regex(source))
+            played = ""
+            for note in rng.choices(NOTES, k=60):
+                played += "abcd"[note - 60]
+                expected = {source for source, regex in regexes.items() if regex.search(played)}
+                self.assertEqual(set(pm.advance(*note_events([note])[0])), expected, (sorted(sources), played))
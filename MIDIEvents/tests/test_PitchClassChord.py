@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from MIDIEvents import Chord, PitchClassChord
+
+
+class TestPitchClassChord(TestCase):
+    def test_init(self):
+        pcc1 = PitchClassChord("C", "Major")
+        self.assertEqual(pcc1.root, 0)
+        self.assertEqual(pcc1.name, "Major")
+        self.assertEqual(pcc1.pitch_class_set, (1 << 0) | (1 << 4) | (1 << 7))
+        self.assertEqual(PitchClassChord(9, "Major"), PitchClassChord("A", "Major"))
+        self.assertEqual(PitchClassChord("Db", "Major"), PitchClassChord("C#", "Major"))
+        with self.assertRaises(ValueError):
+            PitchClassChord("H", "Major")
+        with self.assertRaises(ValueError):
+            PitchClassChord("C", "test")
+
+    def test_string(self):
+        self.assertEqual(str(PitchClassChord("C", "Major")), "C Major")
+        self.assertEqual(repr(PitchClassChord("A#", "Minor")), "PitchClassChord(A# Minor)")
+        self.assertEqual(str(PitchClassChord.from_pitch_class_set(0b10010001)), "C E G")
+
+    def test_from_ident(self):
+        self.assertEqual(PitchClassChord.from_ident("C Major"), PitchClassChord("C", "Major"))
+        with self.assertRaises(AssertionError):
+            PitchClassChord.from_ident("C")
+
+    def test_voicing_invariant(self):
+        pcc1 = PitchClassChord.from_ident("C Major")
+        self.assertEqual(PitchClassChord.from_chord(Chord.from_ident("C4 Major")), pcc1)
+        self.assertEqual(PitchClassChord.from_chord(Chord.from_ascii("E3 G3 C5")), pcc1)  # Inversion, open voicing
+        self.assertEqual(PitchClassChord.from_chord(Chord.from_ascii("C2 C3 E4 G4 G5")), pcc1)  # Doubled notes
+        self.assertNotEqual(PitchClassChord.from_chord(Chord.from_ident("C4 Minor")), pcc1)
+
+    def test_hash(self):
+        self.assertEqual(hash(PitchClassChord("C", "Major")), hash(PitchClassChord.from_ident("C Major")))
+        self.assertIn(PitchClassChord.from_chord(Chord.from_ascii("G3 C4 E4")), {PitchClassChord("C", "Major"): None})
+
+    def test_identify(self):
+        self.assertIn("C Major", PitchClassChord("C", "Major").identify())
+        self.assertIn("A Minor seventh", PitchClassChord("C", "Major sixth").identify())
+
+    def test_from_pitch_class_set(self):
+        with self.assertRaises(ValueError):
+            PitchClassChord.from_pitch_class_set(4096)
@@ -0,0 +1,86 @@
+import random
+from unittest import TestCase
+
+from MIDIEvents.SequenceMatcher import SequenceMatcher
+
+
+def brute_force(patterns, history):
+    return {key for key, notes in patterns.items() if notes and tuple(history[-len(notes):]) == notes}
+
+
+class TestSequenceMatcher(TestCase):
+    def test_advance(self):
+        sm = SequenceMatcher()
+        sm.add("abc", (1, 2, 3))
+        sm.add("bc", (2, 3))
+        sm.add("c", (3,))
+        self.assertEqual(sm.advance(1), ())
+        self.assertEqual(sm.advance(2), ())
+        self.assertEqual(set(sm.advance(3)), {"abc", "bc", "c"})
+        self.assertEqual(set(sm.advance(3)), {"c"})
+
+    def test_order_matters(self):
+        sm = SequenceMatcher()
+        sm.add("up", (60, 62, 64))
+        for note in (64, 62, 60):
+            self.assertEqual(sm.advance(note), ())
+
+    def test_overlapping(self):
+        sm = SequenceMatcher()
+        sm.add("aab", (1, 1, 2))
+        for note in (1, 1, 1):
+            sm.advance(note)
+        self.assertEqual(sm.advance(2), ("aab",))
+
+    def test_add_remove(self):
+        sm = SequenceMatcher()
+        sm.add("abc", (1, 2, 3))
+        self.assertIn("abc", sm)
+        self.assertEqual(len(sm), 1)
+        with self.assertRaises(KeyError):
+            sm.add("abc", (1, 2, 3))
+        sm.remove("abc")
+        self.assertNotIn("abc", sm)
+        self.assertEqual(sm.root.children, {})  # Pruned
+        for note in (1, 2, 3):
+            self.assertEqual(sm.advance(note), ())
+        sm.remove("missing")  # Doesn't raise
+
+    def test_add_keeps_state(self):
+        sm = SequenceMatcher()
+        sm.add("x", (9,))
+        recent = [1, 2]
+        for note in recent:
+            sm.advance(note)
+        sm.add("abc", (1, 2, 3), recent)
+        self.assertEqual(sm.advance(3), ("abc",))
+
+    def test_empty_pattern(self):
+        sm = SequenceMatcher()
+        sm.add("empty", ())
+        self.assertEqual(sm.advance(1), ())
+
+    def test_clear(self):
+        sm = SequenceMatcher()
+        sm.add("a", (1,))
+        sm.clear()
+        self.assertFalse(sm)
+        self.assertEqual(sm.advance(1), ())
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(5)
+        sm = SequenceMatcher()
+        patterns = {}
+        history = []
+        for i in range(3000):
+            if rng.random() < 0.02:
+                key = f"p{i}"
+                patterns[key] = tuple(rng.randrange(4) for _ in range(rng.randrange(1, 6)))
+                sm.add(key, patterns[key], history[-16:])
+            elif rng.random() < 0.01 and patterns:
+                key = rng.choice(sorted(patterns))
+                del patterns[key]
+                sm.remove(key, history[-16:])
+            note = rng.randrange(4)
+            history.append(note)
+            self.assertEqual(set(sm.advance(note)), brute_force(patterns, history))
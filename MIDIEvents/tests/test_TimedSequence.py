@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from MIDIEvents import Note, Sequence, TimedSequence
+
+
+class TestTimedSequence(TestCase):
+    def test_init(self):
+        seq = TimedSequence(Note(60), Note(62), max_gap=0.5)
+        self.assertEqual(seq.midi, (60, 62))
+        self.assertEqual(seq.max_gap, 0.5)
+        self.assertIsNone(seq.max_duration)
+        with self.assertRaises(ValueError):
+            TimedSequence(Note(60), Note(62))
+        with self.assertRaises(ValueError):
+            TimedSequence(Note(60), Note(62), max_duration=-1)
+
+    def test_eq_hash(self):
+        seq = TimedSequence(Sequence.from_midi_list([60, 62]), max_gap=0.5)
+        self.assertEqual(seq, TimedSequence(Sequence.from_midi_list([60, 62]), max_gap=0.5))
+        self.assertEqual(hash(seq), hash(TimedSequence(Sequence.from_midi_list([60, 62]), max_gap=0.5)))
+        self.assertNotEqual(seq, TimedSequence(seq, max_gap=0.5, max_duration=1))
+        self.assertNotEqual(seq, Sequence.from_midi_list([60, 62]))
+        self.assertNotEqual(Sequence.from_midi_list([60, 62]), seq)
+
+    def test_repr(self):
+        self.assertEqual(repr(TimedSequence(Note(60), Note(62), max_duration=2)),
+                         "TimedSequence(C4, D4, max_gap=None, max_duration=2)")
@@ -0,0 +1,84 @@
+import random
+from unittest import TestCase
+
+from MIDIEvents.TimedSequenceMatcher import TimedSequenceMatcher
+
+
+def brute_force(patterns, played):
+    """Keys whose notes end ``played``, a list of (note, time), within their limits"""
+    matches = set()
+    for key, (notes, max_gap, max_duration) in patterns.items():
+        recent = played[-len(notes):]
+        if len(recent) < len(notes) or tuple(note for note, _ in recent) != notes:
+            continue
+        times = [time for _, time in recent]
+        if max_gap is not None and any(b - a > max_gap for a, b in zip(times, times[1:])):
+            continue
+        if max_duration is not None and times[-1] - times[0] > max_duration:
+            continue
+        matches.add(key)
+    return matches
+
+
+class TestTimedSequenceMatcher(TestCase):
+    def test_max_gap(self):
+        tm = TimedSequenceMatcher()
+        tm.add("abc", (1, 2, 3), max_gap=0.5)
+        self.assertEqual([tm.advance(note, time) for note, time in ((1, 0), (2, 0.4), (3, 0.8))], [(), (), ("abc",)])
+        self.assertEqual([tm.advance(note, time) for note, time in ((1, 2), (2, 2.6), (3, 2.7))], [(), (), ()])
+
+    def test_max_duration(self):
+        tm = TimedSequenceMatcher()
+        tm.add("abc", (1, 2, 3), max_duration=1)
+        self.assertEqual([tm.advance(note, time) for note, time in ((1, 0), (2, 0.5), (3, 1))], [(), (), ("abc",)])
+        self.assertEqual([tm.advance(note, time) for note, time in ((1, 2), (2, 2.6), (3, 3.1))], [(), (), ()])
+
+    def test_pruned(self):
+        tm = TimedSequenceMatcher()
+        tm.add("slow", (1, 2, 3), max_gap=2)
+        tm.add("fast", (1, 2, 4), max_gap=0.1)
+        tm.advance(1, 0)
+        tm.advance(2, 1)
+        self.assertEqual([node.note for node, _, _ in tm._partials], [2])
+        tm.advance(1, 5)
+        tm.advance(2, 10)  # Too slow for both
+        self.assertEqual(tm._partials, [])
+
+    def test_add_remove(self):
+        tm = TimedSequenceMatcher()
+        tm.add("loose", (1, 2), max_gap=10)
+        tm.add("tight", (1, 2, 3), max_gap=0.1)
+        self.assertIn("loose", tm)
+        with self.assertRaises(KeyError):
+            tm.add("loose", (1, 2))
+        tm.remove("loose")
+        self.assertEqual(tm.root.children[1].max_gap, 0.1)  # Limits shrink back
+        self.assertEqual(len(tm), 1)
+        tm.remove("missing")  # Doesn't raise
+        tm.clear()
+        self.assertEqual(tm.root.children, {})
+
+    def test_add_with_recent(self):
+        tm = TimedSequenceMatcher()
+        tm.add("abc", (1, 2, 3), max_gap=0.5, recent=[(1, 0), (2, 0.4)])
+        self.assertEqual(tm.advance(3, 0.8), ("abc",))
+        tm.add("ab", (1, 2), max_gap=0.5, recent=[(1, 1), (2, 1.1), (1, 2)])
+        self.assertEqual(tm.advance(2, 2.7), ())  # The gap from the recent notes counts too
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(0)
+        patterns = {}
+        tm = TimedSequenceMatcher()
+        for key in range(40):
+            notes = tuple(rng.choice(range(4)) for _ in range(rng.randint(1, 4)))
+            limits = (rng.choice((None, 0.5, 1)), rng.choice((None, 1, 2)))
+            if notes in [n for n, _, _ in patterns.values()]:
+                continue
+            patterns[key] = (notes,) + limits
+            tm.add(key, notes, *limits)
+        played = []
+        time = 0
+        for _ in range(1000):
+            time += rng.choice((0.1, 0.3, 0.6, 1.5))
+            played.append((rng.choice(range(4)), time))
+            self.assertEqual(set(tm.advance(*played[-1])), brute_force(patterns, played))
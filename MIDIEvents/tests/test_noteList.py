@@ -44,3 +44,13 @@ class TestNoteList(TestCase):
         notes = (Note(10), Note(15), Note(20))  # Sorted to emulate NoteList.notes setter method
         nl1 = NoteList(notes)
         self.assertEqual(hash(notes), hash(nl1))
+
+    def test_from_ascii_cached(self):
+        self.assertIs(NoteList.from_ascii("A4 C#5 E5"), NoteList.from_ascii("A4 C#5 E5"))
+        self.assertIsNot(NoteList.from_ascii("A4 C#5 E5"), NoteList.from_ascii("A4, C#5, E5"))
+
+    def test_immutable(self):
+        nl1 = NoteList.from_ascii("A4 C#5 E5")
+        with self.assertRaises(AttributeError):
+            nl1.notes = (Note(1),)
+        self.assertEqual(NoteList.from_ascii("A4 C#5 E5").notes, (Note(69), Note(73), Note(76)))
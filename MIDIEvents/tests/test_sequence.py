@@ -14,6 +14,12 @@ class TestSequence(TestCase):
         seq3 = Sequence(expected)
         self.assertEqual(seq3.notes, expected)
 
+    def test_order_kept(self):
+        seq1 = Sequence.from_midi_list([15, 10, 20])
+        self.assertEqual(seq1.notes, (Note(15), Note(10), Note(20)))
+        self.assertEqual(seq1.midi, (15, 10, 20))
+        self.assertNotEqual(seq1, Sequence.from_midi_list([10, 15, 20]))
+
     def test_sequence_length(self):
         with self.assertRaises(ValueError):
             Sequence.from_midi_list(list(range(Sequence.maxlen + 1)))
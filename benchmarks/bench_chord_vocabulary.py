@@ -0,0 +1,74 @@
+"""
+Cold start benchmark for the chord vocabulary.  Every measurement runs in a fresh interpreter.
+
+    python benchmarks/bench_chord_vocabulary.py [--runs N]
+
+* ``import`` is ``import MIDIEvents``, which no longer touches chords.json.
+* ``first lookup, no cache`` parses chords.json and builds the indexes, then writes the pickled cache.
+* ``first lookup, cached`` loads the indexes from the pickled cache.
+* ``parse chords.json`` is what every import used to pay before the vocabulary was loaded lazily.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+IMPORT = """
+import time
+start = time.perf_counter()
+import MIDIEvents
+print(time.perf_counter() - start)
+"""
+
+FIRST_LOOKUP = """
+import os, time
+import MIDIEvents
+from MIDIEvents.ChordVocabulary import ChordVocabulary
+if {clear_cache}:
+    try:
+        os.remove(ChordVocabulary.cache_path)
+    except FileNotFoundError:
+        pass
+start = time.perf_counter()
+MIDIEvents.Chord.from_ident("C4 Major").identify()
+print(time.perf_counter() - start)
+"""
+
+PARSE_JSON = """
+import json, os, time
+import MIDIEvents
+start = time.perf_counter()
+with open(os.path.join(os.path.dirname(MIDIEvents.__file__), "chords.json")) as f:
+    json.load(f)["chords"]
+print(time.perf_counter() - start)
+"""
+
+
+def run(code, runs):
+    times = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    results = [
+        ("import", run(IMPORT, args.runs)),
+        ("first lookup, no cache", run(FIRST_LOOKUP.format(clear_cache=True), args.runs)),
+        ("first lookup, cached", run(FIRST_LOOKUP.format(clear_cache=False), args.runs)),
+        ("parse chords.json", run(PARSE_JSON, args.runs)),
+    ]
+    for name, seconds in results:
+        print(f"{name:<24} {seconds * 1000:8.3f} ms  (median of {args.runs})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Offline replay throughput.  Builds a random performance and replays it through ``MIDIFileReplay``.
+
+    python benchmarks/bench_replay.py [--notes N] [--handlers N]
+
+Reports messages per second, and how many times faster than real time the performance replays.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import mido
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MIDIEvents import Chord, ChordProgression, MIDIFileReplay, Sequence  # noqa: E402
+
+
+def performance(notes):
+    """Chords of 1-4 notes, 8 per second, as a list of messages with delta times"""
+    rng = random.Random(0)
+    msgs = []
+    for _ in range(notes // 3):
+        chord = rng.sample(range(48, 84), rng.randint(1, 4))
+        for i, note in enumerate(chord):
+            msgs.append(mido.Message("note_on", note=note, time=0.125 if i == 0 else 0))
+        for note in chord:
+            msgs.append(mido.Message("note_off", note=note, time=0))
+    return msgs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=300000)
+    parser.add_argument("--handlers", type=int, default=1000)
+    args = parser.parse_args()
+    rng = random.Random(1)
+    replay = MIDIFileReplay()
+    for _ in range(args.handlers):
+        replay.add_handler(print, Chord.from_midi_list(rng.sample(range(48, 84), 3)))
+        replay.add_handler(print, Sequence.from_midi_list([rng.randrange(48, 84) for _ in range(4)]))
+        replay.add_handler(print, ChordProgression(*(Chord.from_midi_list(rng.sample(range(48, 84), 2)) for _ in range(2))))
+    msgs = performance(args.notes)
+    song_length = sum(msg.time for msg in msgs)
+    start = time.perf_counter()
+    events = sum(1 for _ in replay.replay(msgs))
+    elapsed = time.perf_counter() - start
+    print(f"{len(msgs)} messages, {song_length / 3600:.2f} h of music, {events} matches")
+    print(f"{elapsed:.2f} s, {len(msgs) / elapsed:,.0f} messages/s, {song_length / elapsed:,.0f}x real time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Throughput and latency benchmarks for the matching engine, with results saved as JSON so runs can be compared.
+
+    python benchmarks/bench_suite.py [--quick] [--output results.json] [--compare baseline.json]
+
+* ``callback/<kind>/<n>`` feeds a synthetic note stream to ``MIDIEventLoop._callback`` with ``n`` handlers of one kind
+  registered, and reports messages per second and per message latency.  Handlers aren't run, so this is the matching
+  and dispatch bookkeeping on the thread receiving MIDI.  ``mixed`` is Chords, Sequences and ChordProgressions
+  together, and ``unified`` is the same with ``unified=True`` so the Chords and Sequences are matched as Patterns.
+* ``identify/<n notes>`` is ``Chord.identify()`` on random chords.
+* ``note/<form>`` is ``Note`` construction from a MIDI number, a name string and a note and octave.
+* ``loopback/<batch>`` is ``LoopbackPort.send_many()`` and ``receive_many()`` of ``batch`` messages at a time, with
+  throughput in messages per second and latency per batch.
+
+With ``--compare``, each result is also shown as a ratio of the older run's throughput.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import mido
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import MIDIEvents  # noqa: E402
+from MIDIEvents import Chord, ChordProgression, FuzzySequence, IntervalSequence, TimedSequence, LatencyHistogram, LoopbackPort, MIDIEventLoop, Note, Pattern, Sequence  # noqa: E402
+
+NOTE_RANGE = range(48, 84)
+
+
+class BenchMIDIEventLoop(MIDIEventLoop):
+    """Matches, but doesn't hand handlers to the executor"""
+
+    def _execute_handler(self, func):
+        pass
+
+
+def handler():
+    pass
+
+
+def note_stream(count, rng):
+    """Chords of 1-4 notes, pressed and released, as note_on and note_off messages"""
+    msgs = []
+    while len(msgs) < count:
+        chord = rng.sample(NOTE_RANGE, rng.randint(1, 4))
+        msgs.extend(mido.Message("note_on", note=note) for note in chord)
+        msgs.extend(mido.Message("note_off", note=note) for note in chord)
+    return msgs[:count]
+
+
+def random_key(kind, rng):
+    if kind in ("mixed", "unified"):
+        kind = rng.choice(("chord", "sequence", "progression"))
+    if kind == "chord":
+        return Chord.from_midi_list(rng.sample(NOTE_RANGE, rng.randint(2, 4)))
+    if kind == "sequence":
+        return Sequence.from_midi_list([rng.choice(NOTE_RANGE) for _ in range(rng.randint(2, 6))])
+    if kind == "fuzzy":
+        notes = [rng.choice(NOTE_RANGE) for _ in range(rng.randint(4, 8))]
+        return FuzzySequence(Sequence.from_midi_list(notes), max_errors=rng.randint(1, 2))
+    if kind == "timed":
+        notes = [rng.choice(NOTE_RANGE) for _ in range(rng.randint(2, 6))]
+        return TimedSequence(Sequence.from_midi_list(notes), max_gap=rng.choice((0.25, 0.5, None)), max_duration=2)
+    if kind == "interval":
+        return IntervalSequence.from_intervals([rng.randint(-12, 12) for _ in range(rng.randint(1, 5))])
+    if kind == "pattern":
+        atoms = []
+        for _ in range(rng.randint(2, 4)):
+            atom = rng.choice((f"{rng.choice(NOTE_RANGE)}", f"({rng.choice(NOTE_RANGE)} | {rng.choice(NOTE_RANGE)})+",
+                               "[" + " ".join(str(note) for note in rng.sample(NOTE_RANGE, 3)) + "]", ".?"))
+            atoms.append(atom)
+        return Pattern(" ".join(atoms + [str(rng.choice(NOTE_RANGE))]))
+    return ChordProgression(*(Chord.from_midi_list(rng.sample(NOTE_RANGE, rng.randint(1, 3))) for _ in range(rng.randint(2, 4))))
+
+
+def summarize(histogram, count, elapsed):
+    summary = histogram.summary()
+    return {
+        "ops_per_sec": count / elapsed,
+        "mean_ns": summary["mean"],
+        "p50_ns": summary["p50"],
+        "p99_ns": summary["p99"],
+        "max_ns": summary["max"],
+    }
+
+
+def timed(func, args_list):
+    """Call ``func`` on each of ``args_list``, timing every call"""
+    histogram = LatencyHistogram()
+    now = time.perf_counter_ns
+    record = histogram.record
+    start = time.perf_counter()
+    for args in args_list:
+        before = now()
+        func(*args)
+        record(now() - before)
+    return summarize(histogram, len(args_list), time.perf_counter() - start)
+
+
+def bench_callback(kind, handlers, messages, rng):
+    MEL = BenchMIDIEventLoop(port=LoopbackPort(), unified=kind == "unified")
+    keys = set()
+    while len(keys) < handlers:
+        keys.add(random_key(kind, rng))
+    for key in keys:
+        MEL.add_handler(handler, key)
+    msgs = note_stream(messages, rng)
+    MEL._callback(msgs[0])  # Applies the matcher updates from add_handler
+    return timed(MEL._callback, [(msg,) for msg in msgs[1:]])
+
+
+def bench_identify(notes, count, rng):
+    chords = [Chord.from_midi_list(rng.sample(NOTE_RANGE, notes)) for _ in range(count)]
+    return timed(Chord.identify, [(chord,) for chord in chords])
+
+
+def bench_note(form, count, rng):
+    MIDIEvents.parse_cache_clear()
+    midis = [rng.randrange(128) for _ in range(count)]
+    if form == "midi":
+        return timed(Note, [(midi,) for midi in midis])
+    notes = [Note(midi) for midi in midis]
+    if form == "string":
+        return timed(Note, [(f"{note.note}{note.octave}",) for note in notes])
+    return timed(Note, [(note.note, note.octave) for note in notes])
+
+
+def bench_loopback(batch, messages, rng):
+    port = LoopbackPort()
+    msgs = note_stream(batch, rng)
+
+    def send_receive():
+        port.send_many(msgs)
+        port.receive_many()
+
+    result = timed(send_receive, [()] * (messages // batch))
+    result["ops_per_sec"] *= batch
+    return result
+
+
+def run(quick):
+    rng = random.Random(0)
+    messages = 20000 if quick else 100000
+    counts = (1, 100, 10000) if quick else (1, 10, 100, 1000, 10000)
+    results = {}
+    for kind in ("chord", "sequence", "fuzzy", "interval", "timed", "progression", "pattern", "mixed", "unified"):
+        for n in counts:
+            results[f"callback/{kind}/{n}"] = bench_callback(kind, n, messages, rng)
+    for notes in (2, 3, 4, 6):
+        results[f"identify/{notes}"] = bench_identify(notes, messages // 10, rng)
+    for form in ("midi", "string", "note_octave"):
+        results[f"note/{form}"] = bench_note(form, messages, rng)
+    for batch in (1, 64, 1024):
+        results[f"loopback/{batch}"] = bench_loopback(batch, messages * 10, rng)
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "version": MIDIEvents.__version__,
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="Fewer messages and handler counts")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file from an earlier run")
+    args = parser.parse_args()
+    results = run(args.quick)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print(f"{'benchmark':<28} {'ops/s':>12} {'p50':>9} {'p99':>9}" + ("  vs old" if baseline else ""))
+    for name, result in results.items():
+        line = f"{name:<28} {result['ops_per_sec']:12,.0f} {result['p50_ns']:7} ns {result['p99_ns']:7} ns"
+        if name in baseline:
+            line += f"  {result['ops_per_sec'] / baseline[name]['ops_per_sec']:6.2f}x"
+        print(line)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"metadata": metadata(), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+CPU use against input latency for each ``MIDIEventLoop`` wait strategy on a backend without callbacks.
+
+    python benchmarks/bench_wait_strategies.py [--idle SECONDS] [--messages N] [--rate HZ]
+
+* ``idle CPU`` is the CPU time used by the whole process while no messages arrive, as a percentage of one core.
+* ``busy CPU`` is the same while ``--messages`` notes arrive at ``--rate`` per second.
+* ``latency`` is the time from ``port.send()`` to the loop handling the message, median and 99th percentile.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import mido
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import MIDIEvents  # noqa: E402
+from MIDIEvents import LoopbackPort, MIDIEventLoop  # noqa: E402
+
+
+class TimedMIDIEventLoop(MIDIEventLoop):
+    """Records how long each message waited.  ``msg.time`` holds ``perf_counter()`` from when it was sent."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    def _callback(self, msg):
+        self.latencies.append(time.perf_counter() - msg.time)
+        super()._callback(msg)
+
+
+def cpu_percent(seconds, action=None):
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    if action is None:
+        time.sleep(seconds)
+    else:
+        action()
+    return 100 * (time.process_time() - start_cpu) / (time.perf_counter() - start)
+
+
+def measure(wait, idle, messages, rate):
+    port = LoopbackPort()
+    MEL = TimedMIDIEventLoop(port=port, wait=wait)
+    MEL.start()
+    try:
+        idle_cpu = cpu_percent(idle)
+
+        def send():
+            for i in range(messages):
+                port.send(mido.Message("note_on", note=60 + i % 12, time=time.perf_counter()))
+                time.sleep(1 / rate)
+            while len(MEL.latencies) < messages:
+                time.sleep(0.001)
+
+        busy_cpu = cpu_percent(None, send)
+    finally:
+        MEL.stop()
+        MEL.executor.shutdown()
+    latencies = sorted(MEL.latencies)
+    return idle_cpu, busy_cpu, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--idle", type=float, default=2)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=50)
+    args = parser.parse_args()
+    MIDIEvents.callbacks_supported = lambda: False  # Use the internal loop, like the pygame backend
+    print(f"{'wait':<8} {'idle CPU':>9} {'busy CPU':>9} {'median':>10} {'p99':>10}")
+    for wait in MIDIEventLoop.wait_strategies:
+        idle_cpu, busy_cpu, median, p99 = measure(wait, args.idle, args.messages, args.rate)
+        print(f"{wait:<8} {idle_cpu:8.1f}% {busy_cpu:8.1f}% {median * 1e6:7.0f} us {p99 * 1e6:7.0f} us")
+
+
+if __name__ == "__main__":
+    main()